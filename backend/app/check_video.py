@@ -1,9 +1,15 @@
+import copy
 import cv2
+import glob
 import math
 import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 from uuid import uuid4
 import numpy as np
 from functools import lru_cache
@@ -12,6 +18,17 @@ from urllib.parse import parse_qs, urlparse
 from faster_whisper import WhisperModel
 from yt_dlp import YoutubeDL
 
+from .metrics import (
+    FFT_SECONDS,
+    FRAME_SAMPLING_SECONDS,
+    OPTICAL_FLOW_SECONDS,
+    WHISPER_SECONDS,
+    YTDLP_DOWNLOAD_SECONDS,
+    cache_event,
+)
+from .tracing import set_span_attributes, span, submit_with_context
+from .video_decoder import open_frame_decoder
+
 def safe_float(x):
     if x is None or math.isnan(x) or math.isinf(x):
         return 0.0
@@ -22,7 +39,7 @@ VIDEOS_DIR = BASE_DIR / "videos"
 VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _resolve_cookie_path(cookies_path: Optional[str]) -> Optional[str]:
+def resolve_cookie_path(cookies_path: Optional[str]) -> Optional[str]:
     if not cookies_path:
         return None
 
@@ -35,10 +52,34 @@ def _resolve_cookie_path(cookies_path: Optional[str]) -> Optional[str]:
     return str(Path(cookies_path))
 
 
-def _resolve_cached_path(candidate: Path) -> Path:
-    if candidate.suffix.lower() == ".mp4":
-        return candidate
-    return candidate.with_suffix(".mp4")
+def video_shard_dir(video_id: str) -> Path:
+    """Return the sharded subdirectory (first two ID characters) for a video."""
+    return VIDEOS_DIR / video_id[:2]
+
+
+def mark_media_accessed(path: Path) -> None:
+    """Bump the access time used by the storage janitor's LRU ordering."""
+    try:
+        stat = path.stat()
+        os.utime(path, (time.time(), stat.st_mtime))
+    except OSError:
+        pass
+
+
+def _migrate_legacy_video(video_id: str) -> None:
+    """Move a pre-sharding ``videos/<id>.mp4`` file into its shard directory."""
+    legacy_path = VIDEOS_DIR / f"{video_id}.mp4"
+    if not legacy_path.is_file():
+        return
+    target_dir = video_shard_dir(video_id)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    target_path = target_dir / legacy_path.name
+    if target_path.exists():
+        return
+    try:
+        shutil.move(str(legacy_path), str(target_path))
+    except OSError:
+        pass
 
 
 def extract_youtube_video_id(url: str) -> Optional[str]:
@@ -74,86 +115,280 @@ def canonicalize_youtube_url(url: str) -> tuple[str, Optional[str]]:
     return url.strip(), None
 
 
+VIDEO_DOWNLOAD_MAX_HEIGHT = max(144, int(os.environ.get("VIDEO_DOWNLOAD_MAX_HEIGHT", "360")))
+
+_YDL_HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+_PARTIAL_MEDIA_SUFFIXES = {".part", ".ytdl", ".temp"}
+
+YTDLP_INFO_TTL = max(0.0, float(os.environ.get("YTDLP_INFO_TTL", "1800")))
+YTDLP_INFO_CACHE_SIZE = max(1, int(os.environ.get("YTDLP_INFO_CACHE_SIZE", "256")))
+YTDLP_DOWNLOAD_WORKERS = max(2, int(os.environ.get("YTDLP_DOWNLOAD_WORKERS", "4")))
+
+_info_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+_info_cache_lock = threading.Lock()
+_ydl_local = threading.local()
+# Long-lived pool so each worker thread keeps its warm YoutubeDL instances.
+download_executor = ThreadPoolExecutor(
+    max_workers=YTDLP_DOWNLOAD_WORKERS,
+    thread_name_prefix="yt-dlp",
+)
+
+
+@dataclass(frozen=True)
+class MediaStreamPlan:
+    """One yt-dlp download: a format selector plus the file name suffix it is stored under."""
+    kind: str
+    format: str
+    name_suffix: str
+
+
+# 프레임 분석은 저해상도 흑백으로 충분하므로 높이를 제한한 영상 스트림만 받는다.
+VIDEO_STREAM_PLAN = MediaStreamPlan(
+    kind="video",
+    format=(
+        f"bv*[height<={VIDEO_DOWNLOAD_MAX_HEIGHT}][ext=mp4]"
+        f"/bv*[height<={VIDEO_DOWNLOAD_MAX_HEIGHT}]"
+        f"/b[height<={VIDEO_DOWNLOAD_MAX_HEIGHT}]"
+        "/wv*/b"
+    ),
+    name_suffix="",
+)
+# Whisper는 오디오만 필요하다.
+AUDIO_STREAM_PLAN = MediaStreamPlan(
+    kind="audio",
+    format="ba[ext=m4a]/ba/w",
+    name_suffix=".audio",
+)
+
+
 @dataclass(frozen=True)
 class VideoDownloadResult:
     original_url: str
     url: str
-    path: Path
+    path: Optional[Path]
     video_id: str
     title: Optional[str]
     duration: Optional[float]
+    audio_path: Optional[Path] = None
 
+    @property
+    def transcription_source(self) -> Optional[Path]:
+        """File Whisper should read: the audio-only stream when available."""
+        return self.audio_path or self.path
 
-def download_youtube_video(url: str, cookies_path: str = "cookies.txt") -> VideoDownloadResult:
-    """
-    Download a YouTube video into the project-level videos directory.
 
-    If the video was previously downloaded, reuse the cached file instead of
-    downloading it again. The file name is derived from the YouTube video ID to
-    ensure stability across repeated requests.
-    """
-    normalized_url, parsed_video_id = canonicalize_youtube_url(url)
-    target_url = normalized_url or url
-
-    cookie_file = _resolve_cookie_path(cookies_path)
-    out_template = str(VIDEOS_DIR / "%(id)s.%(ext)s")
-
-    ydl_opts = {
-        "format": "b[ext=mp4]/b",  # 단일 MP4 스트림 우선 (기존 동작 유지)
-        "outtmpl": out_template,
+def _base_ydl_opts(cookie_file: Optional[str]) -> dict:
+    opts = {
         "force_ipv4": True,
         "noplaylist": True,
         "quiet": False,
-        "http_headers": {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        },
+        "http_headers": dict(_YDL_HTTP_HEADERS),
     }
-
     if cookie_file:
-        ydl_opts["cookiefile"] = cookie_file
-
-    with YoutubeDL(ydl_opts) as ydl:
-        # Fetch metadata without downloading to determine the cache path.
-        info = ydl.extract_info(target_url, download=False) or {}
-        if "id" not in info or not info["id"]:
-            info["id"] = parsed_video_id or str(uuid4())
-        if "ext" not in info or not info["ext"]:
-            info["ext"] = "mp4"
-
-        prepared_path = Path(ydl.prepare_filename(info))
-        cached_path = _resolve_cached_path(prepared_path)
-
-        if cached_path.exists():
-            return VideoDownloadResult(
-                original_url=url,
-                url=normalized_url or url,
-                path=cached_path,
-                video_id=info["id"],
-                title=info.get("title"),
-                duration=info.get("duration"),
-            )
-
-        # Perform the actual download since it is not cached.
-        info = ydl.extract_info(target_url, download=True)
-        if "id" not in info or not info["id"]:
-            info["id"] = parsed_video_id or str(uuid4())
-        if "ext" not in info or not info["ext"]:
-            info["ext"] = "mp4"
-
-        actual_path = _resolve_cached_path(Path(ydl.prepare_filename(info)))
-
-        return VideoDownloadResult(
-            original_url=url,
-            url=normalized_url or url,
-            path=actual_path,
-            video_id=info["id"],
-            title=info.get("title"),
-            duration=info.get("duration"),
-        )
+        opts["cookiefile"] = cookie_file
+    return opts
+
+
+def _get_ydl(plan: Optional[MediaStreamPlan], cookie_file: Optional[str]) -> YoutubeDL:
+    """Return this thread's warm YoutubeDL for the given stream plan (None = metadata)."""
+    instances = getattr(_ydl_local, "instances", None)
+    if instances is None:
+        instances = _ydl_local.instances = {}
+
+    key = (plan.kind if plan else "metadata", cookie_file)
+    ydl = instances.get(key)
+    if ydl is None:
+        opts = _base_ydl_opts(cookie_file)
+        if plan is not None:
+            opts["format"] = plan.format
+            # videos/<id 앞 2글자>/<id>[.audio].<ext> 형태로 샤딩해 디렉터리 하나가 비대해지지 않도록 한다.
+            opts["outtmpl"] = str(VIDEOS_DIR / "%(id).2s" / f"%(id)s{plan.name_suffix}.%(ext)s")
+        ydl = YoutubeDL(opts)
+        instances[key] = ydl
+    return ydl
+
+
+def _cached_info(cache_key: str) -> Optional[dict[str, Any]]:
+    with _info_cache_lock:
+        entry = _info_cache.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, info = entry
+        if time.monotonic() - stored_at > YTDLP_INFO_TTL:
+            _info_cache.pop(cache_key, None)
+            return None
+        return info
+
+
+def _store_info(cache_key: str, info: dict[str, Any]) -> None:
+    with _info_cache_lock:
+        _info_cache[cache_key] = (time.monotonic(), info)
+        while len(_info_cache) > YTDLP_INFO_CACHE_SIZE:
+            oldest = min(_info_cache, key=lambda key: _info_cache[key][0])
+            _info_cache.pop(oldest, None)
+
+
+def fetch_video_info(
+    target_url: str,
+    video_id: Optional[str],
+    cookie_file: Optional[str],
+) -> dict[str, Any]:
+    """
+    Extract raw (unprocessed) yt-dlp metadata once and cache it by video ID for
+    ``YTDLP_INFO_TTL`` seconds. Format selection is deferred to each stream's
+    download so one extraction serves every stream.
+    """
+    cache_key = video_id or target_url
+    info = _cached_info(cache_key)
+    cache_event("ytdlp_info", info is not None)
+    if info is not None:
+        return info
+
+    info = _get_ydl(None, cookie_file).extract_info(target_url, download=False, process=False) or {}
+    _store_info(cache_key, info)
+    if info.get("id") and info["id"] != cache_key:
+        _store_info(info["id"], info)
+    return info
+
+
+def find_cached_media(video_id: str, plan: MediaStreamPlan) -> Optional[Path]:
+    """Return a fully downloaded file for the given stream, ignoring partial downloads."""
+    shard = video_shard_dir(video_id)
+    if not shard.is_dir():
+        return None
+    expected_stem = f"{video_id}{plan.name_suffix}"
+    for candidate in sorted(shard.glob(f"{glob.escape(expected_stem)}.*")):
+        if candidate.stem != expected_stem or candidate.suffix.lower() in _PARTIAL_MEDIA_SUFFIXES:
+            continue
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def select_stream_format(
+    info: dict[str, Any],
+    plan: MediaStreamPlan,
+    cookie_file: Optional[str],
+) -> tuple[dict[str, Any], Path]:
+    """Resolve the format a plan would download and the final file path it would use."""
+    ydl = _get_ydl(plan, cookie_file)
+    selected = ydl.process_ie_result(copy.deepcopy(info), download=False) or {}
+    return selected, Path(ydl.prepare_filename(selected))
+
+
+def download_stream(
+    info: dict[str, Any],
+    video_id: str,
+    plan: MediaStreamPlan,
+    cookie_file: Optional[str],
+) -> Path:
+    ydl = _get_ydl(plan, cookie_file)
+    # Reuse the already-extracted metadata: process_ie_result selects the
+    # stream's format and hands it to process_info without re-extracting.
+    with YTDLP_DOWNLOAD_SECONDS.labels(plan.kind).time(), span(
+        "ytdlp.download", **{"video.id": video_id, "media.stream": plan.kind}
+    ):
+        processed = ydl.process_ie_result(copy.deepcopy(info), download=True) or {}
+
+    for requested in processed.get("requested_downloads") or []:
+        filepath = requested.get("filepath")
+        if filepath and Path(filepath).is_file():
+            return Path(filepath)
+
+    found = find_cached_media(processed.get("id") or video_id, plan)
+    if found is None:
+        raise RuntimeError(f"yt-dlp did not produce a {plan.kind} file for video {video_id}")
+    return found
+
+
+def _collect_cached_streams(
+    video_id: str,
+    plans: list[MediaStreamPlan],
+    paths: dict[str, Path],
+) -> list[MediaStreamPlan]:
+    """Fill ``paths`` with already-downloaded streams and return the plans still missing."""
+    _migrate_legacy_video(video_id)
+    pending: list[MediaStreamPlan] = []
+    for plan in plans:
+        cached = find_cached_media(video_id, plan)
+        if cached is not None:
+            mark_media_accessed(cached)
+            paths[plan.kind] = cached
+        else:
+            pending.append(plan)
+    return pending
+
+
+def download_youtube_video(
+    url: str,
+    cookies_path: str = "cookies.txt",
+    *,
+    include_video: bool = True,
+    include_audio: bool = True,
+) -> VideoDownloadResult:
+    """
+    Download the streams needed for analysis into the project-level videos directory.
+
+    Instead of one best combined stream, the planner fetches a height-capped
+    video stream for frame sampling and a separate audio-only stream for
+    Whisper, downloading both in parallel from a single cached metadata
+    extraction. Pass ``include_video=False`` when only a transcript is needed.
+    Previously downloaded streams are reused; file
+    names are derived from the YouTube video ID and sharded into
+    subdirectories by the first two characters of that ID.
+    """
+    normalized_url, parsed_video_id = canonicalize_youtube_url(url)
+    target_url = normalized_url or url
+    cookie_file = resolve_cookie_path(cookies_path)
+
+    plans: list[MediaStreamPlan] = []
+    if include_video:
+        plans.append(VIDEO_STREAM_PLAN)
+    if include_audio:
+        plans.append(AUDIO_STREAM_PLAN)
+
+    paths: dict[str, Path] = {}
+    pending: list[MediaStreamPlan] = list(plans)
+    info: Optional[dict[str, Any]] = None
+
+    if parsed_video_id:
+        # Known ID: fully cached streams are served without touching YouTube at all.
+        pending = _collect_cached_streams(parsed_video_id, plans, paths)
+        info = _cached_info(parsed_video_id)
+
+    if pending:
+        info = fetch_video_info(target_url, parsed_video_id, cookie_file)
+    info = info or {}
+    video_id = info.get("id") or parsed_video_id or str(uuid4())
+
+    if not parsed_video_id:
+        pending = _collect_cached_streams(video_id, plans, paths)
+
+    if len(pending) == 1:
+        paths[pending[0].kind] = download_stream(info, video_id, pending[0], cookie_file)
+    elif pending:
+        futures = {
+            plan.kind: submit_with_context(download_executor, download_stream, info, video_id, plan, cookie_file)
+            for plan in pending
+        }
+        for kind, future in futures.items():
+            paths[kind] = future.result()
+
+    return VideoDownloadResult(
+        original_url=url,
+        url=normalized_url or url,
+        path=paths.get("video"),
+        video_id=video_id,
+        title=info.get("title"),
+        duration=info.get("duration"),
+        audio_path=paths.get("audio"),
+    )
 
 
 WHISPER_MODEL_NAME = "base"
@@ -182,13 +417,31 @@ def _get_whisper_model() -> WhisperModel:
 
 def transcribe_video_audio(video_path: str) -> TranscriptionResult:
     """
-    Transcribe the given video file to text using faster-whisper with the
-    predefined CPU-friendly configuration. Returns both the raw transcript and
-    SRT-formatted caption text.
+    Transcribe the given video (or audio-only) file to text using faster-whisper
+    with the predefined CPU-friendly configuration. Returns both the raw
+    transcript and SRT-formatted caption text.
     """
+    return _transcribe(video_path)
+
+
+def transcribe_audio_samples(samples: np.ndarray) -> TranscriptionResult:
+    """Transcribe 16 kHz mono float32 PCM that was decoded elsewhere (e.g. from a pipe)."""
+    return _transcribe(samples)
+
+
+def _transcribe(audio) -> TranscriptionResult:
+    with WHISPER_SECONDS.time(), span("whisper.transcribe", **{"whisper.model": WHISPER_MODEL_NAME}):
+        result = _run_whisper(audio)
+        set_span_attributes(
+            **{"transcript.chars": len(result.text), "transcript.duration": result.duration}
+        )
+        return result
+
+
+def _run_whisper(audio) -> TranscriptionResult:
     model = _get_whisper_model()
     segments, info = model.transcribe(
-        video_path,
+        audio,
         vad_filter=True,
         vad_parameters=dict(min_silence_duration_ms=400),
         beam_size=1,
@@ -233,6 +486,13 @@ def to_srt_time(seconds: float) -> str:
 # -----------------------------
 # 2️⃣ 프레임 샘플링
 # -----------------------------
+VIDEO_FRAME_BUDGET = max(2, int(os.environ.get("VIDEO_FRAME_BUDGET", "64")))
+VIDEO_SAMPLE_WINDOW = max(2, int(os.environ.get("VIDEO_SAMPLE_WINDOW", "4")))
+VIDEO_EARLY_EXIT_MIN_WINDOWS = max(2, int(os.environ.get("VIDEO_EARLY_EXIT_MIN_WINDOWS", "4")))
+VIDEO_EARLY_EXIT_TOLERANCE = max(0.0, float(os.environ.get("VIDEO_EARLY_EXIT_TOLERANCE", "0.03")))
+_CONFIDENCE_Z = 1.96
+
+
 def sample_frames(video_path, sample_rate=30):
     cap = cv2.VideoCapture(video_path)
     frames = []
@@ -247,6 +507,180 @@ def sample_frames(video_path, sample_rate=30):
     return frames
 
 
+def _coarse_to_fine_order(count: int) -> list[int]:
+    """Order 0..count-1 so any prefix is spread across the whole range (van der Corput)."""
+    if count <= 2:
+        return list(range(count))
+    bits = max(1, (count - 1).bit_length())
+    order = []
+    for i in range(1 << bits):
+        reversed_i = int(f"{i:0{bits}b}"[::-1], 2)
+        if reversed_i < count:
+            order.append(reversed_i)
+    return order
+
+
+def plan_frame_windows(
+    total_frames: int,
+    sample_rate: int = 30,
+    *,
+    frame_budget: int = VIDEO_FRAME_BUDGET,
+    window_size: int = VIDEO_SAMPLE_WINDOW,
+) -> list[list[int]]:
+    """
+    Plan which frame indices to decode, bounded by ``frame_budget``.
+
+    Short videos keep the original fixed stride as a single window. Longer ones
+    get ``frame_budget // window_size`` short windows spread evenly over the
+    timeline; frames inside a window stay ``sample_rate`` apart so optical flow
+    compares the same frame spacing the motion thresholds were tuned on.
+    Windows are returned in coarse-to-fine order for early exit.
+    """
+    if total_frames <= 0:
+        return []
+
+    sample_rate = max(1, sample_rate)
+    stride_indices = list(range(0, total_frames, sample_rate))
+    if len(stride_indices) <= frame_budget:
+        return [stride_indices]
+
+    window_size = max(2, min(window_size, frame_budget))
+    window_count = max(1, frame_budget // window_size)
+    span = (window_size - 1) * sample_rate
+    last_start = max(0, total_frames - 1 - span)
+
+    windows = []
+    for position in range(window_count):
+        start = int(round(last_start * (position + 0.5) / window_count))
+        windows.append([start + offset * sample_rate for offset in range(window_size)])
+
+    return [windows[i] for i in _coarse_to_fine_order(len(windows))]
+
+
+@dataclass(frozen=True)
+class FrameAnalysis:
+    fft_score: float
+    motion_score: float
+    frames_analyzed: int
+    windows_analyzed: int
+    converged: bool
+
+
+class _RunningMean:
+    """Welford accumulator used for the early-exit confidence interval."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def half_width(self) -> float:
+        if self.count < 2:
+            return math.inf
+        variance = self._m2 / (self.count - 1)
+        return _CONFIDENCE_Z * math.sqrt(variance / self.count)
+
+    def converged(self, tolerance: float) -> bool:
+        return self.half_width() <= tolerance * max(abs(self.mean), 1e-6)
+
+
+class FrameScoreAccumulator:
+    """
+    Collect per-window FFT and motion scores and decide when to stop early:
+    after ``VIDEO_EARLY_EXIT_MIN_WINDOWS`` windows, once both per-window means
+    have a 95% confidence half-width within ``VIDEO_EARLY_EXIT_TOLERANCE``.
+    """
+
+    def __init__(self, *, source_width: Optional[int], early_exit: bool) -> None:
+        self._source_width = source_width
+        self._early_exit = early_exit
+        self._fft_scores: list[float] = []
+        self._flow_scores: list[float] = []
+        self._fft_windows = _RunningMean()
+        self._motion_windows = _RunningMean()
+        self.frames_analyzed = 0
+        self.windows_analyzed = 0
+        self.converged = False
+
+    def add_window(self, frames) -> bool:
+        """Score one window of gray frames; returns True once the estimates have converged."""
+        if not frames:
+            return self.converged
+
+        with FFT_SECONDS.time():
+            window_fft = [float(fft_artifact_score(frame)) for frame in frames]
+        with OPTICAL_FLOW_SECONDS.labels(VIDEO_MOTION_MODE).time():
+            window_flow = _flow_magnitudes(frames, source_width=self._source_width)
+        self._fft_scores.extend(window_fft)
+        self._flow_scores.extend(window_flow)
+        self.frames_analyzed += len(frames)
+        self.windows_analyzed += 1
+
+        self._fft_windows.add(float(np.mean(window_fft)))
+        if window_flow:
+            self._motion_windows.add(float(np.mean(window_flow)))
+
+        if (
+            self._early_exit
+            and self.windows_analyzed >= VIDEO_EARLY_EXIT_MIN_WINDOWS
+            and self._fft_windows.converged(VIDEO_EARLY_EXIT_TOLERANCE)
+            and self._motion_windows.converged(VIDEO_EARLY_EXIT_TOLERANCE)
+        ):
+            self.converged = True
+        return self.converged
+
+    def result(self) -> FrameAnalysis:
+        if not self._fft_scores:
+            raise ValueError("영상 프레임을 추출하지 못했습니다.")
+        return FrameAnalysis(
+            fft_score=float(np.mean(self._fft_scores)),
+            motion_score=float(np.mean(self._flow_scores)) if self._flow_scores else float("nan"),
+            frames_analyzed=self.frames_analyzed,
+            windows_analyzed=self.windows_analyzed,
+            converged=self.converged,
+        )
+
+
+def analyze_video_frames(
+    video_path,
+    sample_rate=30,
+    *,
+    frame_budget: int = VIDEO_FRAME_BUDGET,
+    window_size: int = VIDEO_SAMPLE_WINDOW,
+    early_exit: bool = True,
+) -> FrameAnalysis:
+    """
+    Compute FFT and motion scores from a duration-independent frame budget.
+
+    Windows are analysed coarse-to-fine so an early exit (see
+    ``FrameScoreAccumulator``) still reflects the whole timeline.
+    """
+    with open_frame_decoder(str(video_path)) as decoder:
+        windows = plan_frame_windows(
+            decoder.probe.total_frames,
+            sample_rate,
+            frame_budget=frame_budget,
+            window_size=window_size,
+        )
+        accumulator = FrameScoreAccumulator(
+            source_width=decoder.probe.width or None,
+            early_exit=early_exit and len(windows) > 1,
+        )
+        for indices in windows:
+            with FRAME_SAMPLING_SECONDS.time():
+                frames = decoder.read(indices)
+            if accumulator.add_window(frames):
+                break
+
+    return accumulator.result()
+
+
 # -----------------------------
 # 3️⃣ FFT 기반 아티팩트 점수
 # -----------------------------
@@ -278,15 +712,89 @@ def analyze_fft(frames):
 # -----------------------------
 # 4️⃣ Optical Flow 기반 동작 점수
 # -----------------------------
+VIDEO_MOTION_WIDTH = max(0, int(os.environ.get("VIDEO_MOTION_WIDTH", "320")))
+VIDEO_MOTION_MODE = os.environ.get("VIDEO_MOTION_MODE", "dense").lower()
+VIDEO_MOTION_WORKERS = max(
+    1, int(os.environ.get("VIDEO_MOTION_WORKERS", str(min(4, max(1, (os.cpu_count() or 2) // 4)))))
+)
+# OpenCV's own thread pool is process-wide; keep it small so the flow workers
+# and Whisper's CPU threads don't oversubscribe the cores.
+VIDEO_CV_THREADS = max(1, int(os.environ.get("VIDEO_CV_THREADS", "1")))
+cv2.setNumThreads(VIDEO_CV_THREADS)
+
+_motion_executor = ThreadPoolExecutor(
+    max_workers=VIDEO_MOTION_WORKERS,
+    thread_name_prefix="motion",
+)
+
+_LK_FEATURE_PARAMS = dict(maxCorners=200, qualityLevel=0.01, minDistance=7, blockSize=7)
+_LK_PARAMS = dict(
+    winSize=(15, 15),
+    maxLevel=3,
+    criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+)
+
+
+def _resize_for_motion(frame, source_width: Optional[int] = None):
+    """
+    Shrink a frame to the motion analysis width and return it with the factor
+    that maps its flow magnitudes back to source-resolution pixels.
+    """
+    height, width = frame.shape[:2]
+    native_width = source_width or width
+    if VIDEO_MOTION_WIDTH and width > VIDEO_MOTION_WIDTH:
+        target_height = max(1, int(round(height * VIDEO_MOTION_WIDTH / width)))
+        frame = cv2.resize(frame, (VIDEO_MOTION_WIDTH, target_height), interpolation=cv2.INTER_AREA)
+        width = VIDEO_MOTION_WIDTH
+    return frame, native_width / width
+
+
+def _dense_pair_motion(prev, curr) -> float:
+    flow = cv2.calcOpticalFlowFarneback(prev, curr, None, 0.5, 3, 15, 3, 5, 1.2, 0)
+    # 각도는 쓰지 않으므로 cartToPolar 대신 크기만 계산한다.
+    return float(np.mean(cv2.magnitude(flow[..., 0], flow[..., 1])))
+
+
+def _sparse_pair_motion(prev, curr) -> float:
+    corners = cv2.goodFeaturesToTrack(prev, mask=None, **_LK_FEATURE_PARAMS)
+    if corners is None or len(corners) == 0:
+        return _dense_pair_motion(prev, curr)
+    tracked, found, _ = cv2.calcOpticalFlowPyrLK(prev, curr, corners, None, **_LK_PARAMS)
+    valid = found.reshape(-1) == 1
+    if not np.any(valid):
+        return _dense_pair_motion(prev, curr)
+    displacement = (tracked - corners).reshape(-1, 2)[valid]
+    return float(np.mean(np.hypot(displacement[:, 0], displacement[:, 1])))
+
+
+def _flow_magnitudes(frames, *, mode: Optional[str] = None, source_width: Optional[int] = None) -> list[float]:
+    """
+    Mean optical-flow magnitude for each consecutive frame pair, in source pixels.
+
+    ``dense`` (default) runs Farneback on frames normalised to
+    ``VIDEO_MOTION_WIDTH`` and rescales magnitudes so scores stay on the scale
+    ``predict_ai_video`` was tuned on. ``sparse`` tracks corners with
+    pyramidal Lucas-Kanade, which is much cheaper but measures moving
+    features only, so it reads higher on mostly static footage.
+    """
+    if len(frames) < 2:
+        return []
+
+    pair_motion = _sparse_pair_motion if (mode or VIDEO_MOTION_MODE) == "sparse" else _dense_pair_motion
+    prepared = [_resize_for_motion(frame, source_width) for frame in frames]
+
+    def _score(index: int) -> float:
+        (prev, scale), (curr, _) = prepared[index - 1], prepared[index]
+        return pair_motion(prev, curr) * scale
+
+    indices = range(1, len(prepared))
+    if VIDEO_MOTION_WORKERS > 1 and len(prepared) > 2:
+        return list(_motion_executor.map(_score, indices))
+    return [_score(index) for index in indices]
+
+
 def analyze_motion(frames):
-    flow_scores = []
-    for i in range(1, len(frames)):
-        prev = frames[i - 1]
-        curr = frames[i]
-        flow = cv2.calcOpticalFlowFarneback(prev, curr, None, 0.5, 3, 15, 3, 5, 1.2, 0)
-        mag, ang = cv2.cartToPolar(flow[..., 0], flow[..., 1])
-        flow_scores.append(np.mean(mag))
-    return float(np.mean(flow_scores))
+    return float(np.mean(_flow_magnitudes(frames)))
 
 
 # -----------------------------
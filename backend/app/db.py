@@ -1,16 +1,43 @@
 import json
 import logging
 import os
-from typing import Optional, Any, Dict
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Optional, Any, AsyncIterator, Dict, Tuple
 from uuid import UUID, uuid4
 
 import asyncpg
 from asyncpg import Pool
 
+from .metrics import DB_ACQUIRE_SECONDS, DB_QUERY_SECONDS
+
 logger = logging.getLogger(__name__)
 
 _pool: Optional[Pool] = None
 
+# Accuracy values are stored as strings such as "82%"; this expression extracts
+# the leading integer so it can be indexed and filtered by band.
+_ACCURACY_PCT_SQL = "(substring({column} from '^\\s*(\\d{{1,3}})'))::int"
+VERIFICATION_ACCURACY_SQL = _ACCURACY_PCT_SQL.format(column="accuracy")
+VIDEO_FACT_ACCURACY_SQL = _ACCURACY_PCT_SQL.format(column="fact_accuracy")
+
+# Rows fetched per round-trip (one keyset page) when listing history.
+HISTORY_CURSOR_PREFETCH = max(1, int(os.environ.get("HISTORY_CURSOR_PREFETCH", "50")))
+
+
+@asynccontextmanager
+async def _acquire(operation: str) -> AsyncIterator[asyncpg.Connection]:
+    """Pool acquire that records connection wait and hold time per operation."""
+    started = time.perf_counter()
+    async with _pool.acquire() as conn:
+        acquired = time.perf_counter()
+        DB_ACQUIRE_SECONDS.labels(operation).observe(acquired - started)
+        try:
+            yield conn
+        finally:
+            DB_QUERY_SECONDS.labels(operation).observe(time.perf_counter() - acquired)
+
 
 def _build_db_url() -> str:
     """Construct the PostgreSQL DSN from environment variables."""
@@ -73,6 +100,32 @@ async def init_db_pool() -> None:
             )
             """
         )
+        await conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS ix_verification_records_created
+            ON verification_records (created_at DESC, id DESC)
+            """
+        )
+        await conn.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS ix_verification_records_accuracy_created
+            ON verification_records (({VERIFICATION_ACCURACY_SQL}), created_at DESC, id DESC)
+            """
+        )
+        await conn.execute(
+            """
+            ALTER TABLE verification_records
+            ADD COLUMN IF NOT EXISTS gemini_usage JSONB
+            """
+        )
+        # Set on rows answered by reusing another record's verdict (pre-screen
+        # duplicate or semantic cache) so they are never indexed as Gemini-verified.
+        await conn.execute(
+            """
+            ALTER TABLE verification_records
+            ADD COLUMN IF NOT EXISTS cached_from UUID
+            """
+        )
         logger.debug("Ensured verification_records table exists")
 
         await conn.execute(
@@ -111,8 +164,70 @@ async def init_db_pool() -> None:
             WHERE video_id IS NOT NULL
             """
         )
+        await conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS ix_video_analysis_created
+            ON video_analysis_records (created_at DESC, id DESC)
+            """
+        )
+        await conn.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS ix_video_analysis_fact_accuracy_created
+            ON video_analysis_records (({VIDEO_FACT_ACCURACY_SQL}), created_at DESC, id DESC)
+            """
+        )
+        await conn.execute(
+            """
+            ALTER TABLE video_analysis_records
+            ADD COLUMN IF NOT EXISTS fact_segments JSONB
+            """
+        )
+        await conn.execute(
+            """
+            ALTER TABLE video_analysis_records
+            ADD COLUMN IF NOT EXISTS gemini_usage JSONB
+            """
+        )
         logger.debug("Ensured video_analysis_records table exists")
 
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS video_stage_results (
+                video_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                version TEXT NOT NULL,
+                result JSONB NOT NULL,
+                seconds DOUBLE PRECISION,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (video_id, stage, version)
+            )
+            """
+        )
+        logger.debug("Ensured video_stage_results table exists")
+
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                route TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                status_code INTEGER,
+                media_type TEXT,
+                body BYTEA,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                expires_at TIMESTAMPTZ NOT NULL,
+                PRIMARY KEY (route, idempotency_key)
+            )
+            """
+        )
+        await conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires
+            ON idempotency_keys (expires_at)
+            """
+        )
+        logger.debug("Ensured idempotency_keys table exists")
+
 
 async def close_db_pool() -> None:
     """Close the global connection pool."""
@@ -132,6 +247,8 @@ async def insert_verification_record(
     reason: str,
     urls: list[str],
     raw_response: Optional[str],
+    gemini_usage: Optional[Dict[str, Any]] = None,
+    cached_from: Optional[UUID] = None,
 ) -> UUID:
     """Persist a verification result and return its primary key."""
     if _pool is None:
@@ -139,7 +256,7 @@ async def insert_verification_record(
 
     record_id = uuid4()
 
-    async with _pool.acquire() as conn:
+    async with _acquire("insert_verification_record") as conn:
         await conn.execute(
             """
             INSERT INTO verification_records (
@@ -149,8 +266,10 @@ async def insert_verification_record(
                 accuracy_reason,
                 reason,
                 urls,
-                raw_model_response
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7)
+                raw_model_response,
+                gemini_usage,
+                cached_from
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
             """,
             record_id,
             input_text,
@@ -159,6 +278,8 @@ async def insert_verification_record(
             reason,
             json.dumps(urls),
             raw_response,
+            json.dumps(gemini_usage) if gemini_usage else None,
+            cached_from,
         )
         logger.debug("Persisted verification record with id=%s", record_id)
 
@@ -170,7 +291,7 @@ async def fetch_verification_record(record_id: UUID) -> Optional[Dict[str, Any]]
     if _pool is None:
         raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
 
-    async with _pool.acquire() as conn:
+    async with _acquire("fetch_verification_record") as conn:
         record = await conn.fetchrow(
             """
             SELECT
@@ -198,7 +319,7 @@ async def fetch_verification_record(record_id: UUID) -> Optional[Dict[str, Any]]
         try:
             urls_value = json.loads(urls_value)
         except json.JSONDecodeError:
-            logger.warning("Stored URLs for record %s are not valid JSON; defaulting to [].", record_id)
+            logger.warning("Stored JSON list for record %s is not valid JSON; defaulting to [].", record_id)
             urls_value = []
     if not isinstance(urls_value, list):
         logger.warning("Stored URLs for record %s are not a list; coerced to [].", record_id)
@@ -216,6 +337,44 @@ async def fetch_verification_record(record_id: UUID) -> Optional[Dict[str, Any]]
     }
 
 
+async def fetch_recent_verification_records(limit: int) -> list[Dict[str, Any]]:
+    """Newest Gemini-verified records (own model response, not reused), for warming in-process indexes."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("fetch_recent_verification_records") as conn:
+        rows = await conn.fetch(
+            """
+            SELECT
+                id,
+                input_text,
+                accuracy,
+                accuracy_reason,
+                reason,
+                urls,
+                raw_model_response
+            FROM verification_records
+            WHERE raw_model_response IS NOT NULL
+              AND cached_from IS NULL
+            ORDER BY created_at DESC, id DESC
+            LIMIT $1
+            """,
+            limit,
+        )
+    return [
+        {
+            "id": row["id"],
+            "input_text": row["input_text"],
+            "accuracy": row["accuracy"],
+            "accuracy_reason": row["accuracy_reason"],
+            "reason": row["reason"],
+            "urls": _decode_url_list(row["urls"], row["id"]),
+            "raw_model_response": row["raw_model_response"],
+        }
+        for row in rows
+    ]
+
+
 async def fetch_video_analysis_record(
     video_url: str,
     video_id: Optional[str] = None,
@@ -226,7 +385,7 @@ async def fetch_video_analysis_record(
 
     normalized_url = video_url.strip()
 
-    async with _pool.acquire() as conn:
+    async with _acquire("fetch_video_analysis_record") as conn:
         record = await conn.fetchrow(
             """
             SELECT
@@ -244,6 +403,7 @@ async def fetch_video_analysis_record(
                 fact_accuracy_reason,
                 fact_reason,
                 fact_urls,
+                fact_segments,
                 raw_fact_response,
                 created_at,
                 updated_at
@@ -271,6 +431,7 @@ async def fetch_video_analysis_record(
                     fact_accuracy_reason,
                     fact_reason,
                     fact_urls,
+                    fact_segments,
                     raw_fact_response,
                     created_at,
                     updated_at
@@ -314,6 +475,7 @@ async def fetch_video_analysis_record(
         "fact_accuracy_reason": record["fact_accuracy_reason"],
         "fact_reason": record["fact_reason"],
         "fact_urls": urls_value,
+        "fact_segments": _decode_url_list(record["fact_segments"], record["id"]),
         "raw_fact_response": record["raw_fact_response"],
         "created_at": record["created_at"],
         "updated_at": record["updated_at"],
@@ -336,15 +498,21 @@ async def upsert_video_analysis_record(
     fact_reason: Optional[str],
     fact_urls: Optional[list[str]],
     raw_fact_response: Optional[str],
+    fact_segments: Optional[list[dict[str, Any]]] = None,
+    gemini_usage: Optional[Dict[str, Any]] = None,
 ) -> UUID:
-    """Insert or update a video analysis record and return its identifier."""
+    """
+    Insert or update a video analysis record and return its identifier.
+    A re-analysis served entirely from stage caches keeps the stored usage.
+    """
     if _pool is None:
         raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
 
     record_id = uuid4()
     urls_json = json.dumps(fact_urls or [])
+    segments_json = json.dumps(fact_segments) if fact_segments else None
 
-    async with _pool.acquire() as conn:
+    async with _acquire("upsert_video_analysis_record") as conn:
         row = await conn.fetchrow(
             """
             INSERT INTO video_analysis_records (
@@ -362,10 +530,12 @@ async def upsert_video_analysis_record(
                 fact_accuracy_reason,
                 fact_reason,
                 fact_urls,
-                raw_fact_response
+                raw_fact_response,
+                fact_segments,
+                gemini_usage
             ) VALUES (
                 $1, $2, $3, $4, $5, $6, $7,
-                $8, $9, $10, $11, $12, $13, $14, $15
+                $8, $9, $10, $11, $12, $13, $14, $15, $16, $17
             )
             ON CONFLICT (video_url)
             DO UPDATE SET
@@ -382,6 +552,8 @@ async def upsert_video_analysis_record(
                 fact_reason = EXCLUDED.fact_reason,
                 fact_urls = EXCLUDED.fact_urls,
                 raw_fact_response = EXCLUDED.raw_fact_response,
+                fact_segments = EXCLUDED.fact_segments,
+                gemini_usage = COALESCE(EXCLUDED.gemini_usage, video_analysis_records.gemini_usage),
                 updated_at = NOW()
             RETURNING id
             """,
@@ -400,6 +572,481 @@ async def upsert_video_analysis_record(
             fact_reason,
             urls_json,
             raw_fact_response,
+            segments_json,
+            json.dumps(gemini_usage) if gemini_usage else None,
         )
 
     return row["id"]
+
+
+def _decode_url_list(value: Any, record_id: Any) -> list:
+    """Normalize a JSONB list column (URLs, fact segments) that asyncpg may hand back as a string."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            logger.warning("Stored JSON list for record %s is not valid JSON; defaulting to [].", record_id)
+            return []
+    if not isinstance(value, list):
+        return []
+    return value
+
+
+def _build_history_filters(
+    *,
+    accuracy_sql: str,
+    before: Optional[Tuple[datetime, UUID]],
+    min_accuracy: Optional[int],
+    max_accuracy: Optional[int],
+    since: Optional[datetime] = None,
+) -> Tuple[str, list[Any]]:
+    """Build the WHERE clause shared by keyset listings and aggregate queries."""
+    clauses: list[str] = []
+    args: list[Any] = []
+
+    if before is not None:
+        args.extend(before)
+        clauses.append(f"(created_at, id) < (${len(args) - 1}, ${len(args)})")
+    if min_accuracy is not None:
+        args.append(min_accuracy)
+        clauses.append(f"{accuracy_sql} >= ${len(args)}")
+    if max_accuracy is not None:
+        args.append(max_accuracy)
+        clauses.append(f"{accuracy_sql} <= ${len(args)}")
+    if since is not None:
+        args.append(since)
+        clauses.append(f"created_at >= ${len(args)}")
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, args
+
+
+async def _iter_history_rows(
+    operation: str,
+    *,
+    table: str,
+    columns: str,
+    accuracy_sql: str,
+    limit: int,
+    before: Optional[Tuple[datetime, UUID]],
+    min_accuracy: Optional[int],
+    max_accuracy: Optional[int],
+) -> AsyncIterator[asyncpg.Record]:
+    """
+    Yield up to ``limit`` rows newest-first, one keyset page of
+    ``HISTORY_CURSOR_PREFETCH`` rows per query. The pooled connection is
+    released before each page is yielded, so a consumer that stops early
+    (e.g. a client disconnecting mid-stream) never holds one.
+    """
+    remaining = limit
+    while remaining > 0:
+        where, args = _build_history_filters(
+            accuracy_sql=accuracy_sql,
+            before=before,
+            min_accuracy=min_accuracy,
+            max_accuracy=max_accuracy,
+        )
+        page_size = min(remaining, HISTORY_CURSOR_PREFETCH)
+        args.append(page_size)
+        query = f"""
+            SELECT {columns}
+            FROM {table}
+            {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ${len(args)}
+        """
+        async with _acquire(operation) as conn:
+            rows = await conn.fetch(query, *args)
+
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            return
+        remaining -= len(rows)
+        before = (rows[-1]["created_at"], rows[-1]["id"])
+
+
+async def iter_verification_records(
+    *,
+    limit: int,
+    before: Optional[Tuple[datetime, UUID]] = None,
+    min_accuracy: Optional[int] = None,
+    max_accuracy: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield recent verification records newest-first using keyset pagination on
+    ``(created_at, id)``. Rows arrive page by page so callers can forward them
+    before the whole listing has been read.
+    """
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async for record in _iter_history_rows(
+        "iter_verification_records",
+        table="verification_records",
+        columns="id, input_text, accuracy, accuracy_reason, reason, urls, created_at",
+        accuracy_sql=VERIFICATION_ACCURACY_SQL,
+        limit=limit,
+        before=before,
+        min_accuracy=min_accuracy,
+        max_accuracy=max_accuracy,
+    ):
+        yield {
+            "id": record["id"],
+            "input_text": record["input_text"],
+            "accuracy": record["accuracy"],
+            "accuracy_reason": record["accuracy_reason"],
+            "reason": record["reason"],
+            "urls": _decode_url_list(record["urls"], record["id"]),
+            "created_at": record["created_at"],
+        }
+
+
+async def iter_video_analysis_records(
+    *,
+    limit: int,
+    before: Optional[Tuple[datetime, UUID]] = None,
+    min_accuracy: Optional[int] = None,
+    max_accuracy: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield recent video analyses newest-first; accuracy filters apply to the fact-check score."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async for record in _iter_history_rows(
+        "iter_video_analysis_records",
+        table="video_analysis_records",
+        columns=(
+            "id, video_url, video_id, fft_score, motion_score, ai_result, duration, "
+            "fact_accuracy, fact_reason, created_at, updated_at"
+        ),
+        accuracy_sql=VIDEO_FACT_ACCURACY_SQL,
+        limit=limit,
+        before=before,
+        min_accuracy=min_accuracy,
+        max_accuracy=max_accuracy,
+    ):
+        yield dict(record)
+
+
+async def fetch_verification_stats(*, since: Optional[datetime] = None) -> Dict[str, Any]:
+    """Aggregate verification counts overall and per 20-point accuracy band."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    where, args = _build_history_filters(
+        accuracy_sql=VERIFICATION_ACCURACY_SQL,
+        before=None,
+        min_accuracy=None,
+        max_accuracy=None,
+        since=since,
+    )
+
+    async with _acquire("fetch_verification_stats") as conn:
+        rows = await conn.fetch(
+            f"""
+            SELECT
+                LEAST({VERIFICATION_ACCURACY_SQL}, 99) / 20 AS band,
+                COUNT(*) AS total,
+                MAX(created_at) AS latest
+            FROM verification_records
+            {where}
+            GROUP BY band
+            """,
+            *args,
+        )
+
+    return _summarize_band_rows(rows)
+
+
+async def fetch_video_analysis_stats(*, since: Optional[datetime] = None) -> Dict[str, Any]:
+    """Aggregate video analysis counts per fact-check accuracy band and AI verdict."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    where, args = _build_history_filters(
+        accuracy_sql=VIDEO_FACT_ACCURACY_SQL,
+        before=None,
+        min_accuracy=None,
+        max_accuracy=None,
+        since=since,
+    )
+
+    async with _acquire("fetch_video_analysis_stats") as conn:
+        band_rows = await conn.fetch(
+            f"""
+            SELECT
+                LEAST({VIDEO_FACT_ACCURACY_SQL}, 99) / 20 AS band,
+                COUNT(*) AS total,
+                MAX(created_at) AS latest
+            FROM video_analysis_records
+            {where}
+            GROUP BY band
+            """,
+            *args,
+        )
+        verdict_rows = await conn.fetch(
+            f"""
+            SELECT ai_result, COUNT(*) AS total
+            FROM video_analysis_records
+            {where}
+            GROUP BY ai_result
+            """,
+            *args,
+        )
+
+    summary = _summarize_band_rows(band_rows)
+    summary["by_ai_result"] = {
+        (row["ai_result"] or "unknown"): row["total"] for row in verdict_rows
+    }
+    return summary
+
+
+def _summarize_band_rows(rows: list) -> Dict[str, Any]:
+    bands: Dict[str, int] = {}
+    total = 0
+    latest: Optional[datetime] = None
+
+    for row in rows:
+        count = row["total"]
+        total += count
+        if row["latest"] is not None and (latest is None or row["latest"] > latest):
+            latest = row["latest"]
+        band = row["band"]
+        if band is None:
+            label = "unknown"
+        else:
+            low = int(band) * 20
+            label = f"{low}-{low + 19 if low < 80 else 100}"
+        bands[label] = bands.get(label, 0) + count
+
+    return {"total": total, "by_accuracy_band": bands, "latest_created_at": latest}
+
+
+async def fetch_video_paths(*, after_id: Optional[UUID], limit: int) -> list[Dict[str, Any]]:
+    """Return (id, video_id, video_path) for rows that still reference a media file."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("fetch_video_paths") as conn:
+        rows = await conn.fetch(
+            """
+            SELECT id, video_id, video_path
+            FROM video_analysis_records
+            WHERE video_path IS NOT NULL
+              AND ($1::uuid IS NULL OR id > $1)
+            ORDER BY id
+            LIMIT $2
+            """,
+            after_id,
+            limit,
+        )
+    return [dict(row) for row in rows]
+
+
+async def clear_video_paths(video_paths: list[str]) -> int:
+    """Null out video_path for rows whose media file has been removed."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+    if not video_paths:
+        return 0
+
+    async with _acquire("clear_video_paths") as conn:
+        result = await conn.execute(
+            """
+            UPDATE video_analysis_records
+            SET video_path = NULL
+            WHERE video_path = ANY($1::text[])
+            """,
+            video_paths,
+        )
+    cleared = int(result.split()[-1]) if result else 0
+    logger.debug("Cleared video_path on %d video analysis records", cleared)
+    return cleared
+
+
+async def update_video_path(old_path: str, new_path: str) -> None:
+    """Point rows at a media file's new location (e.g. after sharding)."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("update_video_path") as conn:
+        await conn.execute(
+            """
+            UPDATE video_analysis_records
+            SET video_path = $2
+            WHERE video_path = $1
+            """,
+            old_path,
+            new_path,
+        )
+
+
+async def fetch_stage_result(video_id: str, stage: str, version: str) -> Optional[Any]:
+    """Return the cached output of one analyzer version for a video, if any."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("fetch_stage_result") as conn:
+        value = await conn.fetchval(
+            """
+            SELECT result
+            FROM video_stage_results
+            WHERE video_id = $1 AND stage = $2 AND version = $3
+            """,
+            video_id,
+            stage,
+            version,
+        )
+    if value is None:
+        return None
+    return json.loads(value) if isinstance(value, str) else value
+
+
+async def upsert_stage_result(
+    *,
+    video_id: str,
+    stage: str,
+    version: str,
+    result: Any,
+    seconds: Optional[float],
+) -> None:
+    """Store an analyzer's JSON output keyed by (video_id, stage, version)."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("upsert_stage_result") as conn:
+        await conn.execute(
+            """
+            INSERT INTO video_stage_results (video_id, stage, version, result, seconds)
+            VALUES ($1, $2, $3, $4, $5)
+            ON CONFLICT (video_id, stage, version)
+            DO UPDATE SET
+                result = EXCLUDED.result,
+                seconds = EXCLUDED.seconds,
+                created_at = NOW()
+            """,
+            video_id,
+            stage,
+            version,
+            json.dumps(result, ensure_ascii=False),
+            seconds,
+        )
+
+
+async def claim_idempotency_key(
+    *,
+    route: str,
+    key: str,
+    fingerprint: str,
+    lock_seconds: float,
+) -> Optional[Dict[str, Any]]:
+    """
+    Claim ``(route, key)`` for ``lock_seconds`` unless a live row exists.
+
+    Returns None when the caller now owns the key, otherwise the existing row:
+    ``status_code`` is None while another worker is still processing it.
+    """
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("claim_idempotency_key") as conn:
+        # Retry once if the live row expired between the insert and the select.
+        for _ in range(2):
+            claimed = await conn.fetchval(
+                """
+                INSERT INTO idempotency_keys (route, idempotency_key, fingerprint, expires_at)
+                VALUES ($1, $2, $3, NOW() + make_interval(secs => $4))
+                ON CONFLICT (route, idempotency_key)
+                DO UPDATE SET
+                    fingerprint = EXCLUDED.fingerprint,
+                    status_code = NULL,
+                    media_type = NULL,
+                    body = NULL,
+                    created_at = NOW(),
+                    expires_at = EXCLUDED.expires_at
+                WHERE idempotency_keys.expires_at <= NOW()
+                RETURNING TRUE
+                """,
+                route,
+                key,
+                fingerprint,
+                float(lock_seconds),
+            )
+            if claimed:
+                return None
+            row = await conn.fetchrow(
+                """
+                SELECT fingerprint, status_code, media_type, body,
+                       EXTRACT(EPOCH FROM expires_at)::double precision AS expires_at
+                FROM idempotency_keys
+                WHERE route = $1 AND idempotency_key = $2 AND expires_at > NOW()
+                """,
+                route,
+                key,
+            )
+            if row is not None:
+                return dict(row)
+    return None
+
+
+async def complete_idempotency_key(
+    *,
+    route: str,
+    key: str,
+    status_code: int,
+    media_type: str,
+    body: bytes,
+    ttl_seconds: float,
+) -> None:
+    """Store the response for a claimed key and keep it for ``ttl_seconds``."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("complete_idempotency_key") as conn:
+        await conn.execute(
+            """
+            UPDATE idempotency_keys
+            SET status_code = $3,
+                media_type = $4,
+                body = $5,
+                expires_at = NOW() + make_interval(secs => $6)
+            WHERE route = $1 AND idempotency_key = $2
+            """,
+            route,
+            key,
+            status_code,
+            media_type,
+            body,
+            float(ttl_seconds),
+        )
+
+
+async def release_idempotency_key(route: str, key: str) -> None:
+    """Drop a claimed key whose request did not produce a replayable response."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("release_idempotency_key") as conn:
+        await conn.execute(
+            """
+            DELETE FROM idempotency_keys
+            WHERE route = $1 AND idempotency_key = $2 AND status_code IS NULL
+            """,
+            route,
+            key,
+        )
+
+
+async def purge_expired_idempotency_keys() -> int:
+    """Delete expired idempotency rows; returns how many were removed."""
+    if _pool is None:
+        raise RuntimeError("Database pool has not been initialized. Call init_db_pool first.")
+
+    async with _acquire("purge_idempotency_keys") as conn:
+        result = await conn.execute("DELETE FROM idempotency_keys WHERE expires_at <= NOW()")
+    purged = int(result.split()[-1]) if result else 0
+    logger.debug("Purged %d expired idempotency keys", purged)
+    return purged
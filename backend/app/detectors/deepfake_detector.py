@@ -1,16 +1,167 @@
 from transformers import AutoImageProcessor, SiglipForImageClassification
 from PIL import Image, UnidentifiedImageError
 from io import BytesIO
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+import numpy as np
+import threading
 import torch
 import logging
+import os
+
+from ..metrics import DEEPFAKE_INFERENCE_SECONDS
+from ..tracing import span
 
 logger = logging.getLogger(__name__)
 
 MODEL_NAME = "prithivMLmods/deepfake-detector-model-v1"
+
+# eager: fp32 PyTorch; int8: dynamic int8 quantization of Linear layers;
+# onnx: exported graph on ONNX Runtime CPU (needs the optional onnxruntime package).
+DEEPFAKE_BACKEND = os.environ.get("DEEPFAKE_BACKEND", "eager").lower()
+# Intra-op threads for inference; 0 keeps the framework default (all cores).
+DEEPFAKE_NUM_THREADS = max(0, int(os.environ.get("DEEPFAKE_NUM_THREADS", "0")))
+DEEPFAKE_ONNX_PATH = Path(
+    os.environ.get(
+        "DEEPFAKE_ONNX_PATH",
+        str(Path(__file__).resolve().parents[2] / "models" / "deepfake-detector.onnx"),
+    )
+)
+
+# Decode JPEGs at reduced size (PIL draft) and normalise with NumPy instead of
+# running the full-resolution image through the Hugging Face processor.
+DEEPFAKE_FAST_PREPROCESS = os.environ.get("DEEPFAKE_FAST_PREPROCESS", "true").lower() == "true"
+# Draft decoding keeps at least this multiple of the model input size so the
+# final resize still has enough pixels to antialias from.
+DEEPFAKE_DRAFT_FACTOR = max(1, int(os.environ.get("DEEPFAKE_DRAFT_FACTOR", "2")))
+# Images per forward pass for batch requests.
+DEEPFAKE_BATCH_SIZE = max(1, int(os.environ.get("DEEPFAKE_BATCH_SIZE", "16")))
+
+# (pixel_values [N, 3, H, W]) -> logits [N, 2]
+LogitsFn = Callable[[torch.Tensor], torch.Tensor]
+
 _processor = AutoImageProcessor.from_pretrained(MODEL_NAME, use_fast=True)
 _model = SiglipForImageClassification.from_pretrained(MODEL_NAME)
 _model.eval()
 
+if DEEPFAKE_NUM_THREADS:
+    torch.set_num_threads(DEEPFAKE_NUM_THREADS)
+
+_input_size = (
+    int(_processor.size.get("width", 224)),
+    int(_processor.size.get("height", 224)),
+)
+_resample = Image.Resampling(int(getattr(_processor, "resample", Image.Resampling.BICUBIC)))
+_mean = np.asarray(_processor.image_mean, dtype=np.float32).reshape(3, 1, 1)
+_std = np.asarray(_processor.image_std, dtype=np.float32).reshape(3, 1, 1)
+# pixel * scale - offset == (pixel / 255 - mean) / std
+_scale = (1.0 / (255.0 * _std)).astype(np.float32)
+_offset = (_mean / _std).astype(np.float32)
+_buffers = threading.local()
+
+
+def _pixel_buffer(rows: int = 1) -> np.ndarray:
+    """Per-thread [rows, 3, H, W] float32 input buffer, reused across requests."""
+    buffer = getattr(_buffers, "pixels", None)
+    if buffer is None or buffer.shape[0] < rows:
+        width, height = _input_size
+        buffer = _buffers.pixels = np.empty((rows, 3, height, width), dtype=np.float32)
+    return buffer[:rows]
+
+
+def draft_image(image: Image.Image) -> Image.Image:
+    """Ask the JPEG decoder for a 1/2-1/8 scale decode that is still larger than needed."""
+    width, height = _input_size
+    image.draft("RGB", (width * DEEPFAKE_DRAFT_FACTOR, height * DEEPFAKE_DRAFT_FACTOR))
+    return image
+
+
+def fast_pixel_values(image: Image.Image, out: Optional[np.ndarray] = None) -> torch.Tensor:
+    """
+    Resize an RGB image straight to the model input and normalise it into
+    ``out`` ([3, H, W]) or the thread's reusable buffer. The returned
+    [1, 3, H, W] tensor shares that memory, so with the default buffer it is
+    only valid until the next call on the same thread.
+    """
+    resized = image.resize(_input_size, _resample, reducing_gap=3.0)
+    try:
+        pixels = np.asarray(resized, dtype=np.uint8).transpose(2, 0, 1)
+    finally:
+        if resized is not image:
+            resized.close()
+    target = _pixel_buffer()[0] if out is None else out
+    np.multiply(pixels, _scale, out=target, casting="unsafe")
+    np.subtract(target, _offset, out=target)
+    return torch.from_numpy(target).unsqueeze(0)
+
+
+def hf_pixel_values(image: Image.Image) -> torch.Tensor:
+    return _processor(images=image, return_tensors="pt")["pixel_values"]
+
+
+def _eager_logits(model: torch.nn.Module) -> LogitsFn:
+    def run(pixel_values: torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode():
+            return model(pixel_values=pixel_values).logits
+
+    return run
+
+
+def _export_onnx(path: Path) -> None:
+    size = _processor.size
+    height, width = size.get("height", 224), size.get("width", 224)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info("Exporting %s to ONNX at %s", MODEL_NAME, path)
+    torch.onnx.export(
+        _model,
+        (torch.zeros(1, 3, height, width),),
+        str(path),
+        input_names=["pixel_values"],
+        output_names=["logits"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=17,
+    )
+
+
+def _onnx_logits(path: Path) -> LogitsFn:
+    import onnxruntime as ort
+
+    if not path.exists():
+        _export_onnx(path)
+    options = ort.SessionOptions()
+    if DEEPFAKE_NUM_THREADS:
+        options.intra_op_num_threads = DEEPFAKE_NUM_THREADS
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+
+    def run(pixel_values: torch.Tensor) -> torch.Tensor:
+        (logits,) = session.run(["logits"], {"pixel_values": pixel_values.numpy()})
+        return torch.from_numpy(logits)
+
+    return run
+
+
+def load_backend(name: str) -> LogitsFn:
+    """Build the logits function for ``name``; unknown or unavailable backends fall back to eager."""
+    if name == "int8":
+        quantized = torch.ao.quantization.quantize_dynamic(_model, {torch.nn.Linear}, dtype=torch.qint8)
+        quantized.eval()
+        return _eager_logits(quantized)
+    if name == "onnx":
+        try:
+            return _onnx_logits(DEEPFAKE_ONNX_PATH)
+        except Exception:
+            logger.exception("ONNX backend unavailable for %s; using eager PyTorch", MODEL_NAME)
+            return _eager_logits(_model)
+    if name != "eager":
+        logger.warning("Unknown DEEPFAKE_BACKEND='%s'; using eager PyTorch", name)
+    return _eager_logits(_model)
+
+
+_logits = load_backend(DEEPFAKE_BACKEND)
+logger.info("Deepfake detector backend: %s (threads=%s)", DEEPFAKE_BACKEND, DEEPFAKE_NUM_THREADS or "default")
+
+
 def _error_result(message: str) -> dict:
     return {
         "success": False,
@@ -22,8 +173,31 @@ def _error_result(message: str) -> dict:
         "model_name": MODEL_NAME,
     }
 
-def detect_deepfake_image_bytes(file_bytes: bytes) -> dict:
-    """업로드된 이미지 바이트로 딥페이크 여부 판별"""
+
+def _score_result(probs: list[float]) -> dict:
+    fake_prob_raw = float(probs[0])
+    real_prob_raw = float(probs[1])
+    confidence_raw = max(fake_prob_raw, real_prob_raw)
+
+    verdict = (
+        "Fake"
+        if fake_prob_raw >= real_prob_raw
+        else "Real"
+    )
+
+    return {
+        "success": True,
+        "verdict": verdict,
+        "confidence": round(confidence_raw * 100, 1),
+        "fake_prob": round(fake_prob_raw * 100, 1),
+        "real_prob": round(real_prob_raw * 100, 1),
+        "error": None,
+        "model_name": MODEL_NAME,
+    }
+
+
+def _decode_into(file_bytes: bytes, out: np.ndarray) -> Optional[dict]:
+    """Decode and preprocess one image into ``out`` ([3, H, W]); returns an error result on failure."""
     if not file_bytes:
         return _error_result("이미지 데이터가 비어 있습니다.")
 
@@ -39,52 +213,74 @@ def detect_deepfake_image_bytes(file_bytes: bytes) -> dict:
             "이미지를 열 수 없습니다. 파일이 손상되었거나 지원하지 않는 형식일 수 있습니다."
         )
 
+    processed_image = image
     try:
         if getattr(image, "is_animated", False) and getattr(image, "n_frames", 1) > 1:
             return _error_result(
                 "정적 이미지만 지원합니다. GIF, APNG 등 애니메이션 이미지는 판별할 수 없습니다."
             )
 
+        if DEEPFAKE_FAST_PREPROCESS:
+            draft_image(image)
+
         if image.mode != "RGB":
             processed_image = image.convert("RGB")
-        else:
-            processed_image = image
-
-        inputs = _processor(images=processed_image, return_tensors="pt")
-        with torch.no_grad():
-            outputs = _model(**inputs)
-            probs = torch.nn.functional.softmax(outputs.logits, dim=1).squeeze().tolist()
-
-        fake_prob_raw = float(probs[0])
-        real_prob_raw = float(probs[1])
-        confidence_raw = max(fake_prob_raw, real_prob_raw)
 
-        verdict = (
-            "Fake"
-            if fake_prob_raw >= real_prob_raw
-            else "Real"
-        )
-
-        fake_prob = round(fake_prob_raw * 100, 1)
-        real_prob = round(real_prob_raw * 100, 1)
-        confidence = round(confidence_raw * 100, 1)
-
-        return {
-            "success": True,
-            "verdict": verdict,
-            "confidence": confidence,
-            "fake_prob": fake_prob,
-            "real_prob": real_prob,
-            "error": None,
-            "model_name": MODEL_NAME,
-        }
-
-    except Exception as exc:  # noqa: BLE001 - want the traceback in logs
-        logger.exception("deepfake detector failure")
+        if DEEPFAKE_FAST_PREPROCESS:
+            fast_pixel_values(processed_image, out=out)
+        else:
+            np.copyto(out, hf_pixel_values(processed_image)[0].numpy())
+        return None
+    except Exception:  # noqa: BLE001 - want the traceback in logs
+        logger.exception("deepfake detector preprocessing failure")
         return _error_result(
             "이미지 판별 중 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
         )
     finally:
-        if "processed_image" in locals() and processed_image is not image:
+        if processed_image is not image:
             processed_image.close()
         image.close()
+
+
+def detect_deepfake_images(payloads: Sequence[bytes]) -> list[dict]:
+    """
+    Score several images with batched forward passes of up to
+    ``DEEPFAKE_BATCH_SIZE``. Each entry is the same dict as
+    ``detect_deepfake_image_bytes``; undecodable images get an error entry
+    without failing the rest.
+    """
+    results: list[Optional[dict]] = [None] * len(payloads)
+    for start in range(0, len(payloads), DEEPFAKE_BATCH_SIZE):
+        chunk = payloads[start:start + DEEPFAKE_BATCH_SIZE]
+        with DEEPFAKE_INFERENCE_SECONDS.time(), span(
+            "siglip.inference",
+            **{"model.name": MODEL_NAME, "model.backend": DEEPFAKE_BACKEND, "batch.size": len(chunk)},
+        ):
+            buffer = _pixel_buffer(len(chunk))
+            rows: list[int] = []
+            for offset, file_bytes in enumerate(chunk):
+                error = _decode_into(file_bytes, buffer[len(rows)])
+                if error is not None:
+                    results[start + offset] = error
+                else:
+                    rows.append(start + offset)
+            if not rows:
+                continue
+            try:
+                logits = _logits(torch.from_numpy(buffer[:len(rows)]))
+                probs = torch.nn.functional.softmax(logits, dim=1).tolist()
+            except Exception:  # noqa: BLE001 - want the traceback in logs
+                logger.exception("deepfake detector failure")
+                for index in rows:
+                    results[index] = _error_result(
+                        "이미지 판별 중 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
+                    )
+                continue
+        for index, row in zip(rows, probs):
+            results[index] = _score_result(row)
+    return results
+
+
+def detect_deepfake_image_bytes(file_bytes: bytes) -> dict:
+    """업로드된 이미지 바이트로 딥페이크 여부 판별"""
+    return detect_deepfake_images([file_bytes])[0]
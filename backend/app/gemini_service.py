@@ -2,15 +2,22 @@ import json
 import logging
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import lru_cache
 from threading import Lock
-from typing import Any, Optional, Tuple
+from typing import Any, Optional, Sequence, Tuple
 
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 from pydantic import ValidationError
 
+from .gemini_usage import get_budget_policy, record_gemini_usage
+from .logging_config import log_payload
+from .metrics import GEMINI_IMAGE_BATCHES, GEMINI_REQUEST_SECONDS, cache_event
 from .schemas import GeminiImageVerdict, VerificationResult
+from .tracing import record_usage, span
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +94,33 @@ Return **only one JSON object**:
 If any panel/부분이 AI로 보이면 **생성형**으로 판단하고 해당 영역을 이유에 명시.
 """
 
+# Appended to IMAGE_SYSTEM_INSTRUCTION when several images share one request.
+IMAGE_BATCH_INSTRUCTION = """
+**Batch mode (overrides the single-object output above)**
+The request contains several independent images, each preceded by a text label `Image N`. They are **not** panels of one collage: judge every image on its own and return **only a JSON array** with exactly one object per image, in label order:
+`[{"index":1,"fake":"NN%","reason":"..."},{"index":2,"fake":"NN%","reason":"..."}]`
+"""
+
+# Limits for packing several images into one generate_content call. Inline
+# requests are capped at 20MB after base64 (+33%), so the byte budget stays
+# well below that.
+GEMINI_IMAGE_BATCH_MAX_IMAGES = max(1, int(os.environ.get("GEMINI_IMAGE_BATCH_MAX_IMAGES", "8")))
+GEMINI_IMAGE_BATCH_MAX_BYTES = max(1, int(os.environ.get("GEMINI_IMAGE_BATCH_MAX_BYTES", str(12 * 1024 * 1024))))
+
+# Send Gemini traffic to another endpoint, e.g. the offline stand-in in
+# benchmarks/fake_gemini.py for load tests. Unset uses the public API.
+GEMINI_BASE_URL = os.environ.get("GEMINI_BASE_URL") or None
+
+# Explicit context caching of the system instruction (and tools) per API key.
+# Models reject caches below their minimum size, so a prefix whose system
+# instruction counts fewer than GEMINI_CONTEXT_CACHE_MIN_TOKENS is always sent
+# inline (raise the minimum for models that require more, e.g. Pro).
+GEMINI_CONTEXT_CACHE = os.environ.get("GEMINI_CONTEXT_CACHE", "true").lower() == "true"
+GEMINI_CONTEXT_CACHE_MIN_TOKENS = max(0, int(os.environ.get("GEMINI_CONTEXT_CACHE_MIN_TOKENS", "1024")))
+GEMINI_CONTEXT_CACHE_TTL_SECONDS = max(300, int(os.environ.get("GEMINI_CONTEXT_CACHE_TTL_SECONDS", "3600")))
+# After a failed create, wait this long before trying again for that key.
+GEMINI_CONTEXT_CACHE_RETRY_SECONDS = max(0, int(os.environ.get("GEMINI_CONTEXT_CACHE_RETRY_SECONDS", "1800")))
+
 
 class GeminiConfigurationError(RuntimeError):
     """Raised when the Gemini client is misconfigured."""
@@ -96,6 +130,10 @@ class GeminiVerificationError(RuntimeError):
     """Raised when the Gemini API response cannot be parsed."""
 
 
+class GeminiBatchValidationError(GeminiVerificationError):
+    """Raised when a packed image batch response cannot be mapped back to its images."""
+
+
 class GeminiContentBlockedError(GeminiVerificationError):
     """Raised when Gemini refuses to evaluate due to prohibited content."""
 
@@ -137,6 +175,28 @@ def _discover_gemini_api_keys() -> list[str]:
     return unique_keys
 
 
+@dataclass(frozen=True)
+class CachedPrefix:
+    """Static request prefix that can live in an explicit context cache."""
+
+    name: str
+    model: str
+    system_instruction: str
+    tools: Optional[tuple[types.Tool, ...]] = None
+
+
+@dataclass
+class _CacheHandle:
+    name: Optional[str] = None
+    refresh_at: float = 0.0
+    expires_at: float = 0.0
+    retry_at: float = 0.0
+
+
+# Creates and refreshes context caches so requests never wait on the caches API.
+_cache_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini-cache")
+
+
 class GeminiClientPool:
     """Round-robin pool of Gemini clients backed by multiple API keys."""
 
@@ -151,23 +211,222 @@ class GeminiClientPool:
         self._clients: dict[str, genai.Client] = {}
         self._lock = Lock()
         self._index = 0
+        # Cached contents are scoped to the key's project, so handles are per slot.
+        self._cache_handles: dict[Tuple[str, str], _CacheHandle] = {}
+        self._cache_locks: dict[Tuple[str, str], Lock] = {}
+        # System instruction token counts by prefix name (the same for every key).
+        self._prefix_tokens: dict[str, int] = {}
 
     def acquire_client(self) -> genai.Client:
+        return self.acquire()[1]
+
+    def acquire(self) -> Tuple[str, genai.Client]:
+        """Return the next client plus a non-secret slot label (``key0``, ``key1``, ...)."""
         with self._lock:
-            key = self._keys[self._index]
+            slot = self._index
+            key = self._keys[slot]
             self._index = (self._index + 1) % len(self._keys)
 
             client = self._clients.get(key)
             if client is None:
-                client = genai.Client(api_key=key)
+                http_options = types.HttpOptions(base_url=GEMINI_BASE_URL) if GEMINI_BASE_URL else None
+                client = genai.Client(api_key=key, http_options=http_options)
                 self._clients[key] = client
 
-        return client
+        return f"key{slot}", client
 
     @property
     def size(self) -> int:
         return len(self._keys)
 
+    def cached_content(self, slot: str, client: genai.Client, prefix: CachedPrefix) -> Optional[str]:
+        """
+        Name of a live cached content holding ``prefix`` for this key, or None
+        when caching is disabled, the prefix is too small, or the cache is not
+        ready yet; callers then send the prefix inline. Creating the cache and
+        extending its TTL are scheduled on a background thread when due.
+        """
+        if not GEMINI_CONTEXT_CACHE:
+            return None
+        if self._prefix_tokens.get(prefix.name, GEMINI_CONTEXT_CACHE_MIN_TOKENS) < GEMINI_CONTEXT_CACHE_MIN_TOKENS:
+            return None
+        handle_key = (slot, prefix.name)
+        with self._lock:
+            handle = self._cache_handles.setdefault(handle_key, _CacheHandle())
+            lock = self._cache_locks.setdefault(handle_key, Lock())
+
+        now = time.monotonic()
+        name = handle.name if handle.name and now < handle.expires_at else None
+        due = now >= handle.refresh_at if name else now >= handle.retry_at
+        # The lock is held until the background refresh finishes, so at most one is queued.
+        if due and lock.acquire(blocking=False):
+            try:
+                _cache_executor.submit(self._refresh_cached_content, slot, client, prefix, handle, lock)
+            except Exception:  # noqa: BLE001 - executor shut down; stay inline
+                lock.release()
+
+        cache_event("gemini_context", name is not None)
+        return name
+
+    def _prefix_token_count(self, client: genai.Client, prefix: CachedPrefix) -> Optional[int]:
+        """Token count of the prefix's system instruction, counted once per prefix; None if unknown."""
+        counted = self._prefix_tokens.get(prefix.name)
+        if counted is not None:
+            return counted
+        try:
+            counted = client.models.count_tokens(model=prefix.model, contents=prefix.system_instruction).total_tokens
+        except Exception as exc:  # noqa: BLE001 - let create decide
+            logger.debug("Could not count tokens for Gemini prefix %s: %s", prefix.name, exc)
+            return None
+        if counted is None:
+            return None
+        self._prefix_tokens[prefix.name] = counted
+        if counted < GEMINI_CONTEXT_CACHE_MIN_TOKENS:
+            logger.info(
+                "Not caching Gemini prefix %s: %d tokens is below the %d-token minimum; sending it inline",
+                prefix.name,
+                counted,
+                GEMINI_CONTEXT_CACHE_MIN_TOKENS,
+            )
+        return counted
+
+    def _refresh_cached_content(
+        self,
+        slot: str,
+        client: genai.Client,
+        prefix: CachedPrefix,
+        handle: _CacheHandle,
+        lock: Lock,
+    ) -> None:
+        """Create the cached content or extend its TTL; runs on ``_cache_executor`` holding ``lock``."""
+        now = time.monotonic()
+        try:
+            counted = self._prefix_token_count(client, prefix)
+            if counted is not None and counted < GEMINI_CONTEXT_CACHE_MIN_TOKENS:
+                return
+            ttl = f"{GEMINI_CONTEXT_CACHE_TTL_SECONDS}s"
+            if handle.name and now < handle.expires_at:
+                client.caches.update(name=handle.name, config=types.UpdateCachedContentConfig(ttl=ttl))
+                logger.debug("Extended Gemini context cache %s for %s", handle.name, slot)
+                name = handle.name
+            else:
+                cached = client.caches.create(
+                    model=prefix.model,
+                    config=types.CreateCachedContentConfig(
+                        display_name=f"hacktruth-{prefix.name}",
+                        system_instruction=prefix.system_instruction,
+                        tools=list(prefix.tools) if prefix.tools else None,
+                        ttl=ttl,
+                    ),
+                )
+                name = cached.name
+                logger.info("Created Gemini context cache %s for %s (%s)", name, prefix.name, slot)
+            handle.expires_at = now + GEMINI_CONTEXT_CACHE_TTL_SECONDS
+            handle.refresh_at = now + GEMINI_CONTEXT_CACHE_TTL_SECONDS * 0.8
+            handle.name = name
+        except Exception as exc:  # noqa: BLE001 - caching is an optimisation only
+            logger.warning("Gemini context cache unavailable for %s (%s); sending it inline: %s", prefix.name, slot, exc)
+            handle.name = None
+            handle.retry_at = now + GEMINI_CONTEXT_CACHE_RETRY_SECONDS
+        finally:
+            lock.release()
+
+    def invalidate_cached_content(self, slot: str, prefix: CachedPrefix) -> None:
+        """Forget a handle the API no longer accepts so the next call recreates it."""
+        with self._lock:
+            handle = self._cache_handles.get((slot, prefix.name))
+        if handle is not None:
+            handle.name = None
+            handle.retry_at = 0.0
+
+
+def _is_cache_rejection(exc: Exception) -> bool:
+    """Expired or deleted cached content surfaces as a 403/404 client error."""
+    return isinstance(exc, errors.ClientError) and exc.code in (403, 404)
+
+
+def _config_with_budget(
+    base: types.GenerateContentConfig,
+    cache: dict[Tuple[Optional[int], Optional[str]], types.GenerateContentConfig],
+    budget: Optional[int],
+    cached_content: Optional[str] = None,
+) -> types.GenerateContentConfig:
+    """
+    Return ``base`` with its thinking budget replaced and, when
+    ``cached_content`` is given, the system instruction and tools swapped for
+    that cache reference (the API rejects both together). Memoised per pair.
+    """
+    config = cache.get((budget, cached_content))
+    if config is None:
+        update: dict[str, Any] = {
+            "thinking_config": types.ThinkingConfig(thinking_budget=budget) if budget is not None else None
+        }
+        if cached_content:
+            update.update(system_instruction=None, tools=None, cached_content=cached_content)
+        config = base.model_copy(update=update)
+        cache[(budget, cached_content)] = config
+    return config
+
+
+def _generate_content(
+    pool: GeminiClientPool,
+    model: str,
+    prefix: CachedPrefix,
+    contents: list[types.Content],
+    base_config: types.GenerateContentConfig,
+    budget_configs: dict[Tuple[Optional[int], Optional[str]], types.GenerateContentConfig],
+    default_budget: Optional[int],
+    endpoint: str,
+    **span_attributes: Any,
+) -> Any:
+    """
+    One ``generate_content`` call with the adaptive thinking budget, usage
+    accounting and the key's context cache. A cache the API rejects is
+    dropped and the call is repeated with the prefix inline.
+    """
+    policy = get_budget_policy()
+    decision = policy.decide(endpoint, default_budget)
+
+    try:
+        slot, client = pool.acquire()
+        cached_content = pool.cached_content(slot, client, prefix)
+        with policy.track(endpoint), GEMINI_REQUEST_SECONDS.labels(model, slot).time(), span(
+            "gemini.generate_content",
+            **{
+                "gemini.model": model,
+                "gemini.key_index": slot,
+                "gemini.thinking_budget": decision.budget,
+                "gemini.budget_level": decision.level,
+                "gemini.context_cache": cached_content is not None,
+                **span_attributes,
+            },
+        ):
+            config = _config_with_budget(base_config, budget_configs, decision.budget, cached_content)
+            try:
+                response = client.models.generate_content(model=model, contents=contents, config=config)
+            except Exception as exc:  # noqa: BLE001 - only cache rejections are retried
+                if cached_content is None or not _is_cache_rejection(exc):
+                    raise
+                logger.warning("Gemini rejected context cache %s; retrying inline: %s", cached_content, exc)
+                pool.invalidate_cached_content(slot, prefix)
+                config = _config_with_budget(base_config, budget_configs, decision.budget)
+                response = client.models.generate_content(model=model, contents=contents, config=config)
+            usage = getattr(response, "usage_metadata", None)
+            record_usage(usage)
+            record_gemini_usage(usage, endpoint=endpoint, thinking_budget=decision.budget)
+    except Exception as exc:  # noqa: BLE001 - expose raw error to caller with context
+        logger.exception("Gemini API call failed (%s)", endpoint)
+        raise GeminiVerificationError(f"Gemini API call failed: {exc}") from exc
+
+    prompt_feedback = getattr(response, "prompt_feedback", None)
+    block_reason = getattr(prompt_feedback, "block_reason", None) if prompt_feedback else None
+    if block_reason:
+        normalized_reason = (
+            block_reason.name if hasattr(block_reason, "name") else str(block_reason)
+        )
+        logger.warning("Gemini blocked %s request: %s", endpoint, normalized_reason)
+        raise GeminiContentBlockedError(normalized_reason)
+    return response
 
 class GeminiVerifier:
     """Thin wrapper around the google-genai client for news verification."""
@@ -216,10 +475,21 @@ class GeminiVerifier:
                 thinking_budget=thinking_budget
             )
 
+        self._thinking_budget = thinking_budget
         self._generate_config = types.GenerateContentConfig(**config_kwargs)
+        self._budget_configs = {(thinking_budget, None): self._generate_config}
+        self._prefix = CachedPrefix(
+            name="text",
+            model=model,
+            system_instruction=config_kwargs["system_instruction"],
+            tools=tuple(tools) or None,
+        )
 
-    def verify(self, news_text: str) -> Tuple[VerificationResult, str]:
-        """Send the text to Gemini and return the parsed result plus raw JSON."""
+    def verify(self, news_text: str, *, endpoint: str = "text") -> Tuple[VerificationResult, str]:
+        """
+        Send the text to Gemini and return the parsed result plus raw JSON.
+        ``endpoint`` selects the thinking budget and labels token usage.
+        """
         if not news_text.strip():
             raise GeminiVerificationError("News text is empty after trimming whitespace.")
 
@@ -236,46 +506,31 @@ class GeminiVerifier:
             )
         ]
 
-        try:
-            client = self._client_pool.acquire_client()
-            response = client.models.generate_content(
-                model=self._model,
-                contents=contents,
-                config=self._generate_config,
-            )
-            print("Gemini raw response:", response)
-        except Exception as exc:  # noqa: BLE001 - expose raw error to caller with context
-            logger.exception("Gemini API call failed")
-            raise GeminiVerificationError(f"Gemini API call failed: {exc}") from exc
-
-        prompt_feedback = getattr(response, "prompt_feedback", None)
-        block_reason = getattr(prompt_feedback, "block_reason", None) if prompt_feedback else None
-        if block_reason:
-            normalized_reason = (
-                block_reason.name if hasattr(block_reason, "name") else str(block_reason)
-            )
-            logger.warning("Gemini blocked content for verification request: %s", normalized_reason)
-            raise GeminiContentBlockedError(normalized_reason)
+        response = _generate_content(
+            self._client_pool,
+            self._model,
+            self._prefix,
+            contents,
+            self._generate_config,
+            self._budget_configs,
+            self._thinking_budget,
+            endpoint,
+        )
 
         raw_text = getattr(response, "text", None)
-        print("Gemini response text:", raw_text)
-        logger.debug("Gemini usage metadata: %s", getattr(response, "usage_metadata", None))
 
         parsed = getattr(response, "parsed", None)
         if parsed:
-            print("Gemini parsed response:", parsed)
             logger.debug("Received structured response from Gemini")
             return self._coerce_verification_result(parsed), raw_text or json.dumps(parsed)
 
         if not raw_text:
             raise GeminiVerificationError("Gemini response did not include any text payload.")
 
-        logger.debug("Parsing raw Gemini response text: %s", raw_text)
+        log_payload(logger, "Parsing raw Gemini response text", raw_text)
 
         parsed_json = self._extract_json_from_code_block(raw_text)
-        if parsed_json is not None:
-            print("Gemini JSON extracted from code block:", parsed_json)
-        else:
+        if parsed_json is None:
             try:
                 parsed_json = json.loads(raw_text)
             except json.JSONDecodeError as exc:
@@ -309,7 +564,7 @@ class GeminiVerifier:
             try:
                 return json.loads(candidate)
             except json.JSONDecodeError:
-                logger.debug("Failed to parse JSON code block candidate: %s", candidate)
+                log_payload(logger, "Failed to parse JSON code block candidate", candidate)
                 continue
         return None
 
@@ -345,6 +600,31 @@ def get_verifier() -> GeminiVerifier:
     )
 
 
+@dataclass(frozen=True)
+class GeminiImageBatchResult:
+    """Outcome for one image of ``GeminiImageVerifier.verify_batch``; ``error`` is set on failure."""
+
+    verdict: Optional[GeminiImageVerdict] = None
+    raw_response: Optional[str] = None
+    error: Optional[GeminiVerificationError] = None
+
+
+def pack_image_batches(sizes: Sequence[int], max_images: int, max_bytes: int) -> list[list[int]]:
+    """Greedily group image indices, in order, under both per-call limits."""
+    groups: list[list[int]] = []
+    current: list[int] = []
+    current_bytes = 0
+    for index, size in enumerate(sizes):
+        if current and (len(current) >= max_images or current_bytes + size > max_bytes):
+            groups.append(current)
+            current, current_bytes = [], 0
+        current.append(index)
+        current_bytes += size
+    if current:
+        groups.append(current)
+    return groups
+
+
 class GeminiImageVerifier:
     """Gemini client wrapper for image-based AI detection."""
 
@@ -384,9 +664,43 @@ class GeminiImageVerifier:
                 thinking_budget=thinking_budget
             )
 
+        self._thinking_budget = thinking_budget
         self._generate_config = types.GenerateContentConfig(**config_kwargs)
+        self._budget_configs = {(thinking_budget, None): self._generate_config}
+        self._prefix = CachedPrefix(name="image", model=model, system_instruction=IMAGE_SYSTEM_INSTRUCTION)
+
+        batch_schema = types.Schema(
+            type=types.Type.ARRAY,
+            items=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "index": types.Schema(type=types.Type.INTEGER),
+                    "fake": types.Schema(type=types.Type.STRING),
+                    "reason": types.Schema(type=types.Type.STRING),
+                },
+                required=["index", "fake", "reason"],
+            ),
+        )
+        self._batch_config = self._generate_config.model_copy(
+            update={
+                "system_instruction": IMAGE_SYSTEM_INSTRUCTION + IMAGE_BATCH_INSTRUCTION,
+                "response_schema": batch_schema,
+            }
+        )
+        self._batch_budget_configs = {(thinking_budget, None): self._batch_config}
+        self._batch_prefix = CachedPrefix(
+            name="image_batch",
+            model=model,
+            system_instruction=IMAGE_SYSTEM_INSTRUCTION + IMAGE_BATCH_INSTRUCTION,
+        )
 
-    def verify(self, image_bytes: bytes, mime_type: Optional[str]) -> Tuple[GeminiImageVerdict, str]:
+    def verify(
+        self,
+        image_bytes: bytes,
+        mime_type: Optional[str],
+        *,
+        endpoint: str = "image",
+    ) -> Tuple[GeminiImageVerdict, str]:
         if not image_bytes:
             raise GeminiVerificationError("Image bytes payload is empty.")
 
@@ -401,28 +715,19 @@ class GeminiImageVerifier:
             )
         ]
 
-        try:
-            client = self._client_pool.acquire_client()
-            response = client.models.generate_content(
-                model=self._model,
-                contents=contents,
-                config=self._generate_config,
-            )
-        except Exception as exc:  # noqa: BLE001 - expose raw error to caller with context
-            logger.exception("Gemini image API call failed")
-            raise GeminiVerificationError(f"Gemini API call failed: {exc}") from exc
-
-        prompt_feedback = getattr(response, "prompt_feedback", None)
-        block_reason = getattr(prompt_feedback, "block_reason", None) if prompt_feedback else None
-        if block_reason:
-            normalized_reason = (
-                block_reason.name if hasattr(block_reason, "name") else str(block_reason)
-            )
-            logger.warning("Gemini blocked image verification request: %s", normalized_reason)
-            raise GeminiContentBlockedError(normalized_reason)
+        response = _generate_content(
+            self._client_pool,
+            self._model,
+            self._prefix,
+            contents,
+            self._generate_config,
+            self._budget_configs,
+            self._thinking_budget,
+            endpoint,
+            **{"gemini.image_count": 1},
+        )
 
         raw_text = getattr(response, "text", None)
-        logger.debug("Gemini image usage metadata: %s", getattr(response, "usage_metadata", None))
 
         parsed = getattr(response, "parsed", None)
         if parsed is not None:
@@ -442,6 +747,124 @@ class GeminiImageVerifier:
         result = self._coerce_result(parsed_json)
         return result, raw_text
 
+    def verify_batch(
+        self,
+        images: Sequence[Tuple[bytes, Optional[str]]],
+        *,
+        endpoint: str = "image_batch",
+        max_images: int = GEMINI_IMAGE_BATCH_MAX_IMAGES,
+        max_bytes: int = GEMINI_IMAGE_BATCH_MAX_BYTES,
+    ) -> list[GeminiImageBatchResult]:
+        """
+        Verify several ``(bytes, mime_type)`` images, packing up to
+        ``max_images``/``max_bytes`` into each call so the system instruction
+        and request overhead are paid once per group. A group whose response
+        is blocked or fails validation is retried one image per call, so a
+        single bad image cannot sink its neighbours. API errors (quota, 5xx,
+        network) are not fanned out: every image of the group gets the error
+        and the caller decides whether to retry. Results keep input order.
+        """
+        results: list[Optional[GeminiImageBatchResult]] = [None] * len(images)
+        pending: list[int] = []
+        for index, (image_bytes, _) in enumerate(images):
+            if image_bytes:
+                pending.append(index)
+            else:
+                results[index] = GeminiImageBatchResult(
+                    error=GeminiVerificationError("Image bytes payload is empty.")
+                )
+
+        for group in pack_image_batches([len(images[i][0]) for i in pending], max_images, max_bytes):
+            indices = [pending[i] for i in group]
+            if len(indices) > 1:
+                try:
+                    verdicts = self._verify_packed([images[i] for i in indices], endpoint)
+                except (GeminiBatchValidationError, GeminiContentBlockedError) as exc:
+                    GEMINI_IMAGE_BATCHES.labels("fallback").inc()
+                    logger.warning(
+                        "Packed Gemini image call for %d images failed; retrying one by one: %s",
+                        len(indices),
+                        exc,
+                    )
+                except GeminiVerificationError as exc:
+                    GEMINI_IMAGE_BATCHES.labels("failed").inc()
+                    logger.warning("Packed Gemini image call for %d images failed: %s", len(indices), exc)
+                    for index in indices:
+                        results[index] = GeminiImageBatchResult(error=exc)
+                    continue
+                else:
+                    GEMINI_IMAGE_BATCHES.labels("packed").inc()
+                    for index, (verdict, raw_response) in zip(indices, verdicts):
+                        results[index] = GeminiImageBatchResult(verdict, raw_response)
+                    continue
+
+            for index in indices:
+                image_bytes, mime_type = images[index]
+                try:
+                    verdict, raw_response = self.verify(image_bytes, mime_type, endpoint=endpoint)
+                except GeminiVerificationError as exc:
+                    results[index] = GeminiImageBatchResult(error=exc)
+                else:
+                    results[index] = GeminiImageBatchResult(verdict, raw_response)
+        return results
+
+    def _verify_packed(
+        self,
+        images: Sequence[Tuple[bytes, Optional[str]]],
+        endpoint: str,
+    ) -> list[Tuple[GeminiImageVerdict, str]]:
+        parts: list[types.Part] = []
+        for number, (image_bytes, mime_type) in enumerate(images, start=1):
+            parts.append(types.Part.from_text(text=f"Image {number}"))
+            parts.append(types.Part.from_bytes(data=image_bytes, mime_type=(mime_type or "image/jpeg").lower()))
+        contents = [types.Content(role="user", parts=parts)]
+
+        response = _generate_content(
+            self._client_pool,
+            self._model,
+            self._batch_prefix,
+            contents,
+            self._batch_config,
+            self._batch_budget_configs,
+            self._thinking_budget,
+            endpoint,
+            **{"gemini.image_count": len(images)},
+        )
+
+        payload = getattr(response, "parsed", None)
+        if payload is None:
+            raw_text = getattr(response, "text", None)
+            if not raw_text:
+                raise GeminiBatchValidationError("Gemini image batch response did not include any text payload.")
+            try:
+                payload = json.loads(raw_text)
+            except json.JSONDecodeError as exc:
+                raise GeminiBatchValidationError("Gemini image batch response was not valid JSON.") from exc
+
+        if not isinstance(payload, list) or len(payload) != len(images):
+            raise GeminiBatchValidationError(
+                f"Gemini image batch response must be an array of {len(images)} verdicts."
+            )
+
+        by_index: dict[int, dict[str, Any]] = {}
+        for item in payload:
+            if hasattr(item, "model_dump"):
+                item = item.model_dump()
+            index = item.get("index") if isinstance(item, dict) else None
+            if not isinstance(index, int) or not 1 <= index <= len(images) or index in by_index:
+                raise GeminiBatchValidationError("Gemini image batch response has missing or duplicate indices.")
+            by_index[index] = item
+
+        verdicts: list[Tuple[GeminiImageVerdict, str]] = []
+        for number in range(1, len(images) + 1):
+            item = by_index[number]
+            try:
+                verdict = self._coerce_result({"fake": item.get("fake"), "reason": item.get("reason")})
+            except GeminiVerificationError as exc:
+                raise GeminiBatchValidationError(f"Gemini image batch verdict {number} is invalid: {exc}") from exc
+            verdicts.append((verdict, json.dumps(verdict.model_dump(), ensure_ascii=False)))
+        return verdicts
+
     @staticmethod
     def _coerce_result(candidate: object) -> GeminiImageVerdict:
         try:
@@ -0,0 +1,247 @@
+"""
+Gemini token accounting and thinking-budget policy.
+
+``track_usage()`` opens a per-request accumulator in a ``ContextVar``; every
+``generate_content`` call made while it is active (including from worker
+threads, which inherit the context) adds its ``usage_metadata`` to it, so
+handlers can persist one total per request.
+
+``ThinkingBudgetPolicy`` picks the thinking budget per endpoint. Each endpoint
+has a configured base budget; when in-flight Gemini calls or the smoothed call
+latency exceed their limits, the budget drops to a degraded value, and to the
+floor when either is more than twice its limit.
+"""
+import contextvars
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional
+
+from .metrics import GEMINI_THINKING_DEGRADED, GEMINI_TOKENS
+
+logger = logging.getLogger(__name__)
+
+
+def _env_budget(name: str, fallback: Optional[int]) -> Optional[int]:
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return fallback
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Invalid %s='%s'. Falling back to %s.", name, value, fallback)
+        return fallback
+
+
+def _env_price(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logger.warning("Invalid %s='%s'. Cost estimates disabled.", name, value)
+        return None
+
+
+# USD per million tokens; thinking tokens are billed as output. Unset = no cost estimate.
+GEMINI_PRICE_INPUT_PER_M = _env_price("GEMINI_PRICE_INPUT_PER_M")
+GEMINI_PRICE_OUTPUT_PER_M = _env_price("GEMINI_PRICE_OUTPUT_PER_M")
+# Price of prompt tokens served from a context cache; unset bills them as input.
+GEMINI_PRICE_CACHED_PER_M = _env_price("GEMINI_PRICE_CACHED_PER_M")
+
+# Text and video share one verifier; these override its GEMINI_THINKING_BUDGET per
+# endpoint. The image verifier already has GEMINI_IMAGE_THINKING_BUDGET.
+ENDPOINT_THINKING_BUDGETS: Dict[str, Optional[int]] = {
+    "text": _env_budget("GEMINI_TEXT_THINKING_BUDGET", None),
+    "video": _env_budget("GEMINI_VIDEO_THINKING_BUDGET", None),
+}
+GEMINI_LATENCY_SLO_SECONDS = max(1.0, float(os.environ.get("GEMINI_LATENCY_SLO_SECONDS", "20")))
+GEMINI_MAX_INFLIGHT = max(1, int(os.environ.get("GEMINI_MAX_INFLIGHT", "8")))
+GEMINI_DEGRADED_THINKING_BUDGET = max(0, int(os.environ.get("GEMINI_DEGRADED_THINKING_BUDGET", "512")))
+GEMINI_MIN_THINKING_BUDGET = max(0, int(os.environ.get("GEMINI_MIN_THINKING_BUDGET", "0")))
+# Weight of the newest sample in the per-endpoint latency average.
+GEMINI_LATENCY_EWMA_ALPHA = min(1.0, max(0.01, float(os.environ.get("GEMINI_LATENCY_EWMA_ALPHA", "0.2"))))
+
+_USAGE_FIELDS = (
+    ("prompt", "prompt_token_count"),
+    ("cached", "cached_content_token_count"),
+    ("candidates", "candidates_token_count"),
+    ("thoughts", "thoughts_token_count"),
+    ("tool_use_prompt", "tool_use_prompt_token_count"),
+    ("total", "total_token_count"),
+)
+
+
+class GeminiUsage:
+    """Token totals for every Gemini call made on behalf of one request."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.calls = 0
+        self.tokens: Dict[str, int] = {field: 0 for field, _ in _USAGE_FIELDS}
+        self.thinking_budgets: set[Optional[int]] = set()
+
+    def add(self, counts: Dict[str, int], thinking_budget: Optional[int]) -> None:
+        with self._lock:
+            self.calls += 1
+            for field, value in counts.items():
+                self.tokens[field] += value
+            self.thinking_budgets.add(thinking_budget)
+
+    def cost_usd(self) -> Optional[float]:
+        if GEMINI_PRICE_INPUT_PER_M is None or GEMINI_PRICE_OUTPUT_PER_M is None:
+            return None
+        # prompt_token_count includes the cached part.
+        cached = self.tokens["cached"]
+        prompt = self.tokens["prompt"] + self.tokens["tool_use_prompt"] - cached
+        output = self.tokens["candidates"] + self.tokens["thoughts"]
+        cached_price = GEMINI_PRICE_INPUT_PER_M if GEMINI_PRICE_CACHED_PER_M is None else GEMINI_PRICE_CACHED_PER_M
+        return round(
+            (prompt * GEMINI_PRICE_INPUT_PER_M + cached * cached_price + output * GEMINI_PRICE_OUTPUT_PER_M)
+            / 1_000_000,
+            6,
+        )
+
+    def as_dict(self) -> Optional[Dict[str, Any]]:
+        """JSON-ready summary, or None when no Gemini call was made."""
+        with self._lock:
+            if not self.calls:
+                return None
+            budgets = sorted(self.thinking_budgets, key=lambda b: -2 if b is None else b)
+            summary: Dict[str, Any] = {
+                "calls": self.calls,
+                **{f"{field}_tokens": value for field, value in self.tokens.items()},
+                "thinking_budgets": budgets,
+            }
+        summary["cost_usd"] = self.cost_usd()
+        return summary
+
+
+_current_usage: contextvars.ContextVar[Optional[GeminiUsage]] = contextvars.ContextVar(
+    "gemini_usage", default=None
+)
+
+
+@contextmanager
+def track_usage() -> Iterator[GeminiUsage]:
+    """Collect usage for Gemini calls made in this context; nests by reusing the outer tracker."""
+    existing = _current_usage.get()
+    if existing is not None:
+        yield existing
+        return
+    usage = GeminiUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def current_usage() -> Optional[Dict[str, Any]]:
+    usage = _current_usage.get()
+    return usage.as_dict() if usage is not None else None
+
+
+def record_gemini_usage(usage_metadata: Any, *, endpoint: str, thinking_budget: Optional[int]) -> None:
+    """Add one response's ``usage_metadata`` to the metrics and the active tracker."""
+    if usage_metadata is None:
+        return
+    counts = {
+        field: int(getattr(usage_metadata, attribute, None) or 0)
+        for field, attribute in _USAGE_FIELDS
+    }
+    for field, value in counts.items():
+        if field != "total" and value:
+            GEMINI_TOKENS.labels(endpoint, field).inc(value)
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add(counts, thinking_budget)
+
+
+@dataclass(frozen=True)
+class BudgetDecision:
+    budget: Optional[int]
+    level: str
+
+
+class ThinkingBudgetPolicy:
+    """Choose per-endpoint thinking budgets from in-flight load and recent latency."""
+
+    def __init__(
+        self,
+        *,
+        latency_slo: float = GEMINI_LATENCY_SLO_SECONDS,
+        max_inflight: int = GEMINI_MAX_INFLIGHT,
+        degraded_budget: int = GEMINI_DEGRADED_THINKING_BUDGET,
+        min_budget: int = GEMINI_MIN_THINKING_BUDGET,
+        alpha: float = GEMINI_LATENCY_EWMA_ALPHA,
+    ) -> None:
+        self._latency_slo = latency_slo
+        self._max_inflight = max_inflight
+        self._degraded_budget = degraded_budget
+        self._min_budget = min(min_budget, degraded_budget)
+        self._alpha = alpha
+        self._lock = Lock()
+        self._inflight = 0
+        self._latency: Dict[str, float] = {}
+        self._levels: Dict[str, str] = {}
+
+    def decide(self, endpoint: str, default_budget: Optional[int]) -> BudgetDecision:
+        base = ENDPOINT_THINKING_BUDGETS.get(endpoint)
+        if base is None:
+            base = default_budget
+        with self._lock:
+            pressure = max(
+                self._inflight / self._max_inflight,
+                self._latency.get(endpoint, 0.0) / self._latency_slo,
+            )
+            if pressure <= 1.0:
+                level = "normal"
+            elif pressure <= 2.0:
+                level = "degraded"
+            else:
+                level = "minimal"
+            previous = self._levels.get(endpoint, "normal")
+            self._levels[endpoint] = level
+
+        if level != previous:
+            logger.info(
+                "Gemini thinking budget for %s: %s -> %s (pressure %.2f)", endpoint, previous, level, pressure
+            )
+        if level == "normal":
+            return BudgetDecision(base, level)
+
+        GEMINI_THINKING_DEGRADED.labels(endpoint, level).inc()
+        cap = self._degraded_budget if level == "degraded" else self._min_budget
+        # -1 (dynamic) and None (model default) are unbounded, so any cap is lower.
+        if base is None or base < 0:
+            return BudgetDecision(cap, level)
+        return BudgetDecision(min(base, cap), level)
+
+    @contextmanager
+    def track(self, endpoint: str) -> Iterator[None]:
+        """Count the call as in flight and fold its latency into the endpoint average."""
+        with self._lock:
+            self._inflight += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._inflight -= 1
+                previous = self._latency.get(endpoint)
+                self._latency[endpoint] = (
+                    elapsed if previous is None else previous + self._alpha * (elapsed - previous)
+                )
+
+
+_policy = ThinkingBudgetPolicy()
+
+
+def get_budget_policy() -> ThinkingBudgetPolicy:
+    return _policy
@@ -0,0 +1,283 @@
+"""
+Idempotency-Key support for the POST verify endpoints.
+
+The browser extension retries on network errors, and each retry used to
+cost another Gemini call (and, for text, another verification record). When
+a request carries an ``Idempotency-Key`` header, repeats of that key on the
+same route within ``IDEMPOTENCY_TTL_SECONDS`` do not run the handler again:
+while the first request is still running they join it (single-flight), and
+afterwards the stored response is replayed with ``Idempotent-Replayed: true``.
+Reusing a key with a different body or query is rejected with 422.
+
+Completed responses are kept in a small in-process LRU and in the
+``idempotency_keys`` table, so other workers and restarts replay them too. A
+pending row means another worker owns the key; it is answered with 409 until
+that worker finishes or its lease (``IDEMPOTENCY_LOCK_SECONDS``) lapses.
+Only deterministic outcomes are stored (2xx, and 4xx other than 408/409/429);
+server errors release the key so a retry runs again. Streaming (NDJSON)
+responses pass through and are not stored. If the database is unavailable
+the in-process path still applies.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+
+from .db import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    purge_expired_idempotency_keys,
+    release_idempotency_key,
+)
+from .metrics import IDEMPOTENCY_REQUESTS, cache_event
+from .tracing import set_span_attributes
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_ENABLED = os.environ.get("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+IDEMPOTENCY_TTL_SECONDS = max(1.0, float(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400")))
+# Lease on a pending key; must outlast the slowest request (video analysis).
+IDEMPOTENCY_LOCK_SECONDS = max(1.0, float(os.environ.get("IDEMPOTENCY_LOCK_SECONDS", "900")))
+IDEMPOTENCY_CACHE_SIZE = max(1, int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", "1024")))
+IDEMPOTENCY_PURGE_INTERVAL = max(60.0, float(os.environ.get("IDEMPOTENCY_PURGE_INTERVAL", "3600")))
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+_NON_REPLAYABLE_STATUSES = {
+    status.HTTP_408_REQUEST_TIMEOUT,
+    status.HTTP_409_CONFLICT,
+    status.HTTP_429_TOO_MANY_REQUESTS,
+}
+
+CallNext = Callable[[Request], Awaitable[Response]]
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    media_type: str
+    body: bytes
+    expires_at: float  # epoch seconds
+
+    def replay(self) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type=self.media_type,
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+
+@dataclass(frozen=True)
+class _InFlight:
+    fingerprint: str
+    # Resolves to the leader's response, or None if it produced nothing to share.
+    future: "asyncio.Future[Optional[StoredResponse]]"
+
+
+def request_fingerprint(query: str, body: bytes) -> str:
+    digest = hashlib.sha256(query.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def is_replayable(status_code: int) -> bool:
+    if 200 <= status_code < 300:
+        return True
+    return 400 <= status_code < 500 and status_code not in _NON_REPLAYABLE_STATUSES
+
+
+def _error(status_code: int, detail: str, **headers: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers or None)
+
+
+def _mismatch() -> JSONResponse:
+    IDEMPOTENCY_REQUESTS.labels("mismatch").inc()
+    return _error(
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        "같은 Idempotency-Key가 다른 요청 내용과 함께 사용되었습니다. 새 키를 사용해주세요.",
+    )
+
+
+class IdempotencyStore:
+    """Single-flight and response replay keyed by (route, Idempotency-Key)."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = IDEMPOTENCY_TTL_SECONDS,
+        lock_seconds: float = IDEMPOTENCY_LOCK_SECONDS,
+        max_entries: int = IDEMPOTENCY_CACHE_SIZE,
+    ) -> None:
+        self._ttl = ttl
+        self._lock_seconds = lock_seconds
+        self._max_entries = max_entries
+        self._completed: "OrderedDict[tuple[str, str], StoredResponse]" = OrderedDict()
+        self._in_flight: dict[tuple[str, str], _InFlight] = {}
+
+    def _remembered(self, scope: tuple[str, str]) -> Optional[StoredResponse]:
+        stored = self._completed.get(scope)
+        if stored is not None and stored.expires_at <= time.time():
+            del self._completed[scope]
+            stored = None
+        cache_event("idempotency", stored is not None)
+        if stored is not None:
+            self._completed.move_to_end(scope)
+        return stored
+
+    def _remember(self, scope: tuple[str, str], stored: StoredResponse) -> None:
+        self._completed[scope] = stored
+        self._completed.move_to_end(scope)
+        while len(self._completed) > self._max_entries:
+            self._completed.popitem(last=False)
+
+    def _replay(self, stored: StoredResponse, fingerprint: str, outcome: str) -> Response:
+        if stored.fingerprint != fingerprint:
+            return _mismatch()
+        IDEMPOTENCY_REQUESTS.labels(outcome).inc()
+        set_span_attributes(**{"idempotency.outcome": outcome})
+        return stored.replay()
+
+    async def handle(self, request: Request, key: str, call_next: CallNext) -> Response:
+        """Run, join or replay ``request`` for ``key``; called from the HTTP middleware."""
+        key = key.strip()
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH or not key.isprintable():
+            return _error(
+                status.HTTP_400_BAD_REQUEST,
+                f"Idempotency-Key 헤더는 1~{IDEMPOTENCY_KEY_MAX_LENGTH}자의 출력 가능한 문자여야 합니다.",
+            )
+        scope = (request.url.path, key)
+        fingerprint = request_fingerprint(request.url.query, await request.body())
+
+        while True:
+            stored = self._remembered(scope)
+            if stored is not None:
+                return self._replay(stored, fingerprint, "replayed")
+
+            pending = self._in_flight.get(scope)
+            if pending is None:
+                break
+            if pending.fingerprint != fingerprint:
+                return _mismatch()
+            shared = await asyncio.shield(pending.future)
+            if shared is not None:
+                return self._replay(shared, fingerprint, "joined")
+            # The leader failed before answering; try again (possibly as the new leader).
+
+        return await self._lead(request, scope, fingerprint, call_next)
+
+    async def _lead(
+        self,
+        request: Request,
+        scope: tuple[str, str],
+        fingerprint: str,
+        call_next: CallNext,
+    ) -> Response:
+        route, key = scope
+        future: "asyncio.Future[Optional[StoredResponse]]" = asyncio.get_running_loop().create_future()
+        self._in_flight[scope] = _InFlight(fingerprint, future)
+        shared: Optional[StoredResponse] = None
+        claimed = False
+        try:
+            try:
+                existing = await claim_idempotency_key(
+                    route=route, key=key, fingerprint=fingerprint, lock_seconds=self._lock_seconds
+                )
+                claimed = existing is None
+            except Exception:  # noqa: BLE001 - degrade to the in-process path
+                logger.warning("Idempotency table unavailable; using in-process single-flight only", exc_info=True)
+                existing = None
+
+            if existing is not None:
+                if existing["status_code"] is None:
+                    IDEMPOTENCY_REQUESTS.labels("in_progress").inc()
+                    return _error(
+                        status.HTTP_409_CONFLICT,
+                        "같은 Idempotency-Key 요청이 아직 처리 중입니다. 잠시 후 다시 시도해주세요.",
+                        **{"Retry-After": "5"},
+                    )
+                shared = StoredResponse(
+                    fingerprint=existing["fingerprint"],
+                    status_code=existing["status_code"],
+                    media_type=existing["media_type"],
+                    body=bytes(existing["body"]),
+                    expires_at=existing["expires_at"],
+                )
+                self._remember(scope, shared)
+                return self._replay(shared, fingerprint, "replayed")
+
+            response = await call_next(request)
+            media_type = response.headers.get("content-type", "")
+            if not media_type.startswith("application/json"):
+                # Streaming batch responses are passed through as they are produced.
+                return response
+
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            shared = StoredResponse(
+                fingerprint=fingerprint,
+                status_code=response.status_code,
+                media_type=media_type,
+                body=body,
+                expires_at=time.time() + self._ttl,
+            )
+            IDEMPOTENCY_REQUESTS.labels("executed").inc()
+            if is_replayable(response.status_code):
+                self._remember(scope, shared)
+                if claimed:
+                    try:
+                        await complete_idempotency_key(
+                            route=route,
+                            key=key,
+                            status_code=shared.status_code,
+                            media_type=shared.media_type,
+                            body=shared.body,
+                            ttl_seconds=self._ttl,
+                        )
+                        claimed = False
+                    except Exception:  # noqa: BLE001 - the response itself succeeded
+                        logger.warning("Failed to store idempotent response for %s", route, exc_info=True)
+            return Response(
+                content=body,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+            )
+        finally:
+            if not future.done():
+                future.set_result(shared)
+            self._in_flight.pop(scope, None)
+            if claimed:
+                # Claimed but nothing was stored: let the next retry run the request.
+                try:
+                    await release_idempotency_key(route, key)
+                except Exception:  # noqa: BLE001
+                    logger.warning("Failed to release idempotency key for %s", route, exc_info=True)
+
+
+async def idempotency_purge_loop(interval: float = IDEMPOTENCY_PURGE_INTERVAL) -> None:
+    """Background task that deletes expired rows from the idempotency table."""
+    while True:
+        try:
+            await purge_expired_idempotency_keys()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Idempotency key purge failed")
+        await asyncio.sleep(interval)
+
+
+_store = IdempotencyStore()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    return _store
@@ -0,0 +1,132 @@
+"""
+Downscale and re-encode images before they are uploaded to Gemini.
+
+Gemini bills image input by tiles of the decoded image, and phone photos are
+often several megabytes. Capping the longest side and re-encoding as WebP or
+JPEG shrinks both the upload and the image-token count. EXIF/XMP metadata is
+not carried over; the ICC profile is kept so colours render the same.
+
+The original bytes are sent unchanged when the image is animated, cannot be
+decoded, or when re-encoding would not make it smaller. Callers can skip the
+stage entirely for forensic checks where the untouched file matters.
+"""
+import logging
+import os
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+from .metrics import GEMINI_IMAGE_BYTES, IMAGE_NORMALIZE_SECONDS
+from .tracing import set_span_attributes, span
+
+logger = logging.getLogger(__name__)
+
+GEMINI_IMAGE_NORMALIZE = os.environ.get("GEMINI_IMAGE_NORMALIZE", "true").lower() == "true"
+GEMINI_IMAGE_MAX_SIDE = max(64, int(os.environ.get("GEMINI_IMAGE_MAX_SIDE", "1536")))
+GEMINI_IMAGE_FORMAT = os.environ.get("GEMINI_IMAGE_FORMAT", "webp").lower()
+GEMINI_IMAGE_QUALITY = min(100, max(1, int(os.environ.get("GEMINI_IMAGE_QUALITY", "85"))))
+
+_FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+
+
+@dataclass(frozen=True)
+class NormalizedImage:
+    data: bytes
+    mime_type: str
+    original_bytes: int
+    original_size: Optional[tuple[int, int]]
+    size: Optional[tuple[int, int]]
+    seconds: float
+    applied: bool
+
+    def summary(self) -> dict:
+        return {
+            "applied": self.applied,
+            "original_bytes": self.original_bytes,
+            "sent_bytes": len(self.data),
+            "original_size": list(self.original_size) if self.original_size else None,
+            "sent_size": list(self.size) if self.size else None,
+            "duration_ms": round(self.seconds * 1000, 2),
+        }
+
+
+def _encode(image: Image.Image, icc_profile: Optional[bytes]) -> tuple[bytes, str]:
+    pil_format, mime_type = _FORMATS.get(GEMINI_IMAGE_FORMAT, _FORMATS["webp"])
+    if pil_format == "JPEG" and image.mode != "RGB":
+        if image.mode in ("RGBA", "LA", "P"):
+            rgba = image.convert("RGBA")
+            flattened = Image.new("RGB", image.size, (255, 255, 255))
+            flattened.paste(rgba, mask=rgba.getchannel("A"))
+            image = flattened
+        else:
+            image = image.convert("RGB")
+    elif pil_format == "WEBP" and image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() or image.mode == "P" else "RGB")
+
+    options: dict = {"quality": GEMINI_IMAGE_QUALITY}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    if pil_format == "JPEG":
+        options["optimize"] = True
+    else:
+        # method 2 is ~3x faster than the default 4 for a few percent more bytes.
+        options["method"] = 2
+    buffer = BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue(), mime_type
+
+
+def _downscale(image: Image.Image) -> Image.Image:
+    scale = min(1.0, GEMINI_IMAGE_MAX_SIDE / max(image.size))
+    # JPEG: decode at the smallest 1/2-1/8 scale that still covers the target.
+    image.draft("RGB", (round(image.width * scale), round(image.height * scale)))
+    oriented = ImageOps.exif_transpose(image)
+    oriented.thumbnail((GEMINI_IMAGE_MAX_SIDE, GEMINI_IMAGE_MAX_SIDE), Image.Resampling.LANCZOS)
+    return oriented
+
+
+def normalize_image(data: bytes, mime_type: Optional[str]) -> NormalizedImage:
+    """Cap the longest side at ``GEMINI_IMAGE_MAX_SIDE`` and re-encode without metadata."""
+    started = time.perf_counter()
+    original_size: Optional[tuple[int, int]] = None
+    encoded: Optional[tuple[bytes, str]] = None
+    size: Optional[tuple[int, int]] = None
+
+    with IMAGE_NORMALIZE_SECONDS.time(), span("image.normalize"):
+        try:
+            with Image.open(BytesIO(data)) as image:
+                original_size = image.size
+                if not getattr(image, "is_animated", False):
+                    icc_profile = image.info.get("icc_profile")
+                    resized = _downscale(image)
+                    size = resized.size
+                    encoded = _encode(resized, icc_profile)
+        except (OSError, ValueError) as exc:
+            logger.debug("Image normalization skipped, could not decode: %s", exc)
+        except Exception:  # noqa: BLE001 - never fail a request over an optimisation
+            logger.exception("Image normalization failed; sending the original bytes")
+        set_span_attributes(
+            **{"image.bytes": len(data), "image.sent_bytes": len(encoded[0]) if encoded else len(data)}
+        )
+
+    if encoded is not None and (len(encoded[0]) < len(data) or size != original_size):
+        result = NormalizedImage(
+            encoded[0], encoded[1], len(data), original_size, size, time.perf_counter() - started, applied=True
+        )
+    else:
+        result = NormalizedImage(
+            data,
+            (mime_type or "image/jpeg").lower(),
+            len(data),
+            original_size,
+            original_size,
+            time.perf_counter() - started,
+            applied=False,
+        )
+
+    GEMINI_IMAGE_BYTES.labels("original").inc(result.original_bytes)
+    GEMINI_IMAGE_BYTES.labels("sent").inc(len(result.data))
+    return result
@@ -0,0 +1,112 @@
+"""
+Non-blocking logging setup.
+
+Request handlers only enqueue records; a ``QueueListener`` thread formats them
+and writes to stdout, so slow terminals or log shippers never
+stall the event loop. Each record carries the current request's correlation
+id (``request_id``), which follows the request across tasks and thread hops
+because it lives in a ``contextvars.ContextVar``.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+from .metrics import LOG_RECORDS_DROPPED
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# "text" keeps the human-readable layout; "json" emits one object per line.
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").lower()
+LOG_QUEUE_SIZE = max(100, int(os.environ.get("LOG_QUEUE_SIZE", "10000")))
+# Fraction of DEBUG payload logs (model responses, request bodies) actually emitted.
+LOG_PAYLOAD_SAMPLE_RATE = min(1.0, max(0.0, float(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", "0.05"))))
+LOG_PAYLOAD_MAX_CHARS = max(64, int(os.environ.get("LOG_PAYLOAD_MAX_CHARS", "2000")))
+
+_TEXT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(request_id)s | %(message)s"
+
+request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the correlation id of the request that produced them."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def configure_logging() -> None:
+    """Route the root logger through a bounded queue drained by a background writer."""
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        # Avoid duplicate handlers when running via reloaders.
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(_TEXT_FORMAT))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def truncate_payload(value: Any, limit: int = LOG_PAYLOAD_MAX_CHARS) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(+{len(text) - limit} chars)"
+
+
+def log_payload(logger: logging.Logger, label: str, value: Any) -> None:
+    """DEBUG-log a large payload for a sampled fraction of calls, capped in size."""
+    if not logger.isEnabledFor(logging.DEBUG) or random.random() >= LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    logger.debug("%s: %s", label, truncate_payload(value))
@@ -1,47 +1,77 @@
 import asyncio
+import base64
+import binascii
+import dataclasses
+import functools
+import json
 import logging
 import os
-import sys
+import uuid
+from collections import defaultdict
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 from uuid import UUID
 from urllib.parse import ParseResult, urlparse
 
 import httpx
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from .detectors.deepfake_detector import detect_deepfake_image_bytes, MODEL_NAME
+from .detectors.deepfake_detector import (
+    DEEPFAKE_BATCH_SIZE,
+    MODEL_NAME,
+    detect_deepfake_image_bytes,
+    detect_deepfake_images,
+)
 
 from .schemas import (
+    GeminiImageBatchItem,
+    GeminiImageBatchVerificationResponse,
     GeminiImageVerdict,
     GeminiImageVerificationResponse,
+    HistoryStats,
+    ImageNormalizationSummary,
+    ImageBatchItem,
+    ImageBatchVerificationRequest,
+    ImageBatchVerificationResponse,
     ImageVerificationRequest,
     ImageVerificationResponse,
     ImageVerificationResult,
     VerificationRecordDetail,
+    VerificationRecordPage,
+    VerificationRecordSummary,
     VerificationRequest,
     VerificationResponse,
     VerificationResult,
+    VideoAnalysisPage,
+    VideoAnalysisSummary,
     VideoRequest,
     VideoFactCheckResult,
+    VideoFactCheckSegment,
     VideoResponse,
 )
 from .check_video import (
-    analyze_fft,
-    analyze_motion,
+    VIDEO_FRAME_BUDGET,
+    VIDEO_MOTION_MODE,
+    WHISPER_MODEL_NAME,
+    FrameAnalysis,
+    TranscriptionResult,
+    analyze_video_frames,
     download_youtube_video,
     predict_ai_video,
-    sample_frames,
     safe_float,
     transcribe_video_audio,
     canonicalize_youtube_url,
+    VideoDownloadResult,
 )
 from .gemini_service import (
     GeminiConfigurationError,
     GeminiContentBlockedError,
+    GeminiImageBatchResult,
     GeminiImageVerifier,
     GeminiVerificationError,
     GeminiVerifier,
@@ -54,8 +84,46 @@ from .db import (
     insert_verification_record,
     fetch_verification_record,
     fetch_video_analysis_record,
+    fetch_verification_stats,
+    fetch_video_analysis_stats,
+    iter_verification_records,
+    iter_video_analysis_records,
     upsert_video_analysis_record,
 )
+from .metrics import (
+    GEMINI_BLOCKS,
+    GEMINI_RETRIES,
+    IMAGE_DOWNLOAD_SECONDS,
+    SINGLE_FLIGHT_JOINS,
+    cache_event,
+    render_metrics,
+)
+from .pipeline import PipelineRun, StageRegistry, VideoStageStore, run_pipeline
+from .progressive import (
+    ProgressiveAnalysis,
+    progressive_pipeline_available,
+    run_progressive_analysis,
+)
+from .gemini_usage import current_usage, track_usage
+from .idempotency import (
+    IDEMPOTENCY_ENABLED,
+    IDEMPOTENCY_HEADER,
+    get_idempotency_store,
+    idempotency_purge_loop,
+)
+from .image_normalize import GEMINI_IMAGE_NORMALIZE, normalize_image
+from .prescreen import PRESCREEN_ENABLED, PrescreenDecision, get_prescreener
+from .semantic_cache import SEMANTIC_CACHE_ENABLED, get_semantic_cache
+from .text_cache import get_text_cache, text_cache_key
+from .logging_config import configure_logging, log_payload, request_id_var
+from .tracing import init_tracing, set_span_attributes, shutdown_tracing, span
+from .transcript_chunks import chunk_transcript, merge_chunk_verdicts, parse_srt
+from .video_storage import (
+    get_eviction_stats,
+    janitor_loop,
+    pin_media,
+    release_analyzed_media,
+)
 
 
 def _load_env() -> bool:
@@ -65,22 +133,8 @@ def _load_env() -> bool:
     return load_dotenv(env_path, override=False)
 
 
-def _configure_logging() -> None:
-    """Configure verbose logging for hackathon-friendly debugging."""
-    log_level = os.environ.get("LOG_LEVEL", "DEBUG").upper()
-    if logging.getLogger().handlers:
-        # Avoid duplicate handlers when running via reloaders.
-        return
-
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-        stream=sys.stdout,
-    )
-
-
 _env_loaded = _load_env()
-_configure_logging()
+configure_logging()
 logger = logging.getLogger(__name__)
 if _env_loaded:
     logger.debug("Loaded environment variables from .env file")
@@ -90,9 +144,17 @@ else:
 GEMINI_MAX_ATTEMPTS = max(1, int(os.environ.get("GEMINI_VERIFICATION_ATTEMPTS", "2")))
 YOUTUBE_COOKIES_PATH = os.environ.get("YOUTUBE_COOKIES_PATH", "cookies.txt")
 VIDEO_FRAME_SAMPLE_RATE = max(1, int(os.environ.get("VIDEO_FRAME_SAMPLE_RATE", "30")))
+HISTORY_PAGE_MAX = max(1, int(os.environ.get("HISTORY_PAGE_MAX", "200")))
+# Concurrent Gemini calls per video when fact-checking transcript chunks.
+FACT_CHECK_CONCURRENCY = max(1, int(os.environ.get("FACT_CHECK_CONCURRENCY", "4")))
 
 _video_tasks: Dict[str, asyncio.Task] = {}
+# Fire-and-forget work (pre-screen audits, semantic index updates); referenced so it isn't GC'd.
+_background_tasks: set[asyncio.Task] = set()
 _video_tasks_lock = asyncio.Lock()
+_janitor_task: Optional[asyncio.Task] = None
+_idempotency_purge_task: Optional[asyncio.Task] = None
+_semantic_warm_task: Optional[asyncio.Task] = None
 
 app = FastAPI(
     title="HackTruth Backend",
@@ -103,16 +165,90 @@ app = FastAPI(
 
 @app.on_event("startup")
 async def startup_event() -> None:
+    global _janitor_task, _semantic_warm_task, _idempotency_purge_task
     try:
         await init_db_pool()
     except Exception as exc:
         logger.exception("Failed to initialize database connection pool")
         raise
+    _janitor_task = asyncio.create_task(janitor_loop())
+    if IDEMPOTENCY_ENABLED:
+        _idempotency_purge_task = asyncio.create_task(idempotency_purge_loop())
+    if SEMANTIC_CACHE_ENABLED:
+        # Model load and index build run in the background; lookups miss until it's ready.
+        _semantic_warm_task = asyncio.create_task(get_semantic_cache().warm())
+    init_tracing()
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
+    global _janitor_task, _semantic_warm_task, _idempotency_purge_task, _image_client
+    for task in (_janitor_task, _semantic_warm_task, _idempotency_purge_task):
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    _janitor_task = None
+    _semantic_warm_task = None
+    _idempotency_purge_task = None
+    if _image_client is not None:
+        await _image_client.aclose()
+        _image_client = None
     await close_db_pool()
+    shutdown_tracing()
+
+
+@app.middleware("http")
+async def idempotent_verify_requests(request: Request, call_next):
+    """Join or replay retried ``POST /verify/*`` requests that carry an Idempotency-Key."""
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None or not IDEMPOTENCY_ENABLED or request.method != "POST" or not request.url.path.startswith("/verify/"):
+        return await call_next(request)
+    return await get_idempotency_store().handle(request, key, call_next)
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Root span per request; child spans from tasks and thread hops attach to it."""
+    with span(
+        f"{request.method} {request.url.path}",
+        **{
+            "http.method": request.method,
+            "http.target": request.url.path,
+            "request.id": request_id_var.get(),
+        },
+    ) as current:
+        response = await call_next(request)
+        if current is not None:
+            route = request.scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                current.update_name(f"{request.method} {route.path}")
+                current.set_attribute("http.route", route.path)
+            current.set_attribute("http.status_code", response.status_code)
+        return response
+
+
+@app.middleware("http")
+async def track_gemini_usage(request: Request, call_next):
+    """Sum Gemini token usage for the request; handlers read it via ``current_usage()``."""
+    with track_usage():
+        return await call_next(request)
+
+
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    """Correlation id for every log line of a request; echoed back as X-Request-ID."""
+    request_id = (request.headers.get("x-request-id") or "").strip()[:64] or uuid.uuid4().hex[:16]
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
 
 # Allow all origins to simplify hackathon integration; tighten later if needed.
 app.add_middleware(
@@ -148,6 +284,31 @@ DEFAULT_IMAGE_REQUEST_HEADERS = {
 
 DEFAULT_IMAGE_TIMEOUT = httpx.Timeout(15.0, connect=10.0)
 DEFAULT_IMAGE_RETRIES = 2
+IMAGE_CLIENT_MAX_CONNECTIONS = max(1, int(os.environ.get("IMAGE_CLIENT_MAX_CONNECTIONS", "64")))
+IMAGE_BATCH_MAX = max(1, int(os.environ.get("IMAGE_BATCH_MAX", "64")))
+# Concurrent downloads per batch request, overall and per origin host.
+IMAGE_BATCH_CONCURRENCY = max(1, int(os.environ.get("IMAGE_BATCH_CONCURRENCY", "16")))
+IMAGE_BATCH_PER_HOST = max(1, int(os.environ.get("IMAGE_BATCH_PER_HOST", "4")))
+NORMALIZE_QUERY_DESCRIPTION = (
+    "false이면 축소·재인코딩 없이 원본 이미지를 그대로 Gemini에 보낸다 (메타데이터·원본 화질이 중요한 포렌식 판별용)."
+)
+
+# Shared across requests so image downloads reuse pooled connections.
+_image_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_image_client() -> httpx.AsyncClient:
+    global _image_client
+    if _image_client is None:
+        _image_client = httpx.AsyncClient(
+            timeout=DEFAULT_IMAGE_TIMEOUT,
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(
+                retries=DEFAULT_IMAGE_RETRIES,
+                limits=httpx.Limits(max_connections=IMAGE_CLIENT_MAX_CONNECTIONS),
+            ),
+        )
+    return _image_client
 
 
 def verifier_dependency() -> GeminiVerifier:
@@ -166,6 +327,13 @@ def _build_image_request_headers(parsed_url: ParseResult) -> dict[str, str]:
 
 
 async def _download_image_bytes(image_url: str) -> tuple[bytes, str]:
+    with IMAGE_DOWNLOAD_SECONDS.time(), span("image.download"):
+        content, content_type = await _fetch_image_bytes(image_url)
+        set_span_attributes(**{"image.bytes": len(content), "image.content_type": content_type})
+        return content, content_type
+
+
+async def _fetch_image_bytes(image_url: str) -> tuple[bytes, str]:
     parsed_url = urlparse(image_url)
     raw_path = parsed_url.path
     normalized_path = raw_path.split("!")[0]
@@ -188,14 +356,7 @@ async def _download_image_bytes(image_url: str) -> tuple[bytes, str]:
     request_headers = _build_image_request_headers(parsed_url)
 
     try:
-        transport = httpx.AsyncHTTPTransport(retries=DEFAULT_IMAGE_RETRIES)
-        async with httpx.AsyncClient(
-            timeout=DEFAULT_IMAGE_TIMEOUT,
-            follow_redirects=True,
-            headers=request_headers,
-            transport=transport,
-        ) as client:
-            response = await client.get(image_url)
+        response = await _get_image_client().get(image_url, headers=request_headers)
     except httpx.InvalidURL:
         logger.warning("Invalid image URL provided: %s", image_url)
         raise HTTPException(
@@ -259,7 +420,10 @@ def _format_score(value: Optional[float]) -> str:
     return f"{normalized:.4f}"
 
 
-def _build_fact_check_payload(result: Optional[VerificationResult]) -> Optional[VideoFactCheckResult]:
+def _build_fact_check_payload(
+    result: Optional[VerificationResult],
+    segments: Optional[list[dict[str, Any]]] = None,
+) -> Optional[VideoFactCheckResult]:
     if result is None:
         return None
     urls = result.urls if result.urls is not None else []
@@ -268,6 +432,7 @@ def _build_fact_check_payload(result: Optional[VerificationResult]) -> Optional[
         accuracy_reason=result.accuracy_reason,
         reason=result.reason,
         urls=urls,
+        segments=[VideoFactCheckSegment.model_validate(segment) for segment in segments or []],
     )
 
 
@@ -283,6 +448,9 @@ def _build_video_response(
     video_id: Optional[str],
     duration: Optional[float],
     cached: bool,
+    fact_segments: Optional[list[dict[str, Any]]] = None,
+    stage_timings: Optional[Dict[str, float]] = None,
+    gemini_usage: Optional[Dict[str, Any]] = None,
 ) -> VideoResponse:
     return VideoResponse(
         fft_artifact_score=_format_score(fft_score),
@@ -290,7 +458,9 @@ def _build_video_response(
         result=ai_result or "분석 결과를 생성하지 못했습니다.",
         transcript=transcript,
         transcript_srt=transcript_srt,
-        fact_check=_build_fact_check_payload(fact_result),
+        fact_check=_build_fact_check_payload(fact_result, fact_segments),
+        stage_timings=stage_timings,
+        gemini_usage=gemini_usage,
         cached=cached,
         record_id=record_id,
         video_id=video_id,
@@ -306,6 +476,10 @@ def _record_to_video_response(record: Dict[str, Any]) -> VideoResponse:
             accuracy_reason=record.get("fact_accuracy_reason") or "",
             reason=record.get("fact_reason") or "",
             urls=record.get("fact_urls") or [],
+            segments=[
+                VideoFactCheckSegment.model_validate(segment)
+                for segment in record.get("fact_segments") or []
+            ],
         )
 
     return VideoResponse(
@@ -322,49 +496,21 @@ def _record_to_video_response(record: Dict[str, Any]) -> VideoResponse:
     )
 
 
-async def _compute_video_metrics(video_path: str) -> Tuple[float, float, str]:
-    def _worker() -> Tuple[float, float, str]:
-        frames = sample_frames(video_path, sample_rate=VIDEO_FRAME_SAMPLE_RATE)
-        if not frames:
-            raise ValueError("영상 프레임을 추출하지 못했습니다.")
-        fft_score = safe_float(analyze_fft(frames))
-        motion_score = safe_float(analyze_motion(frames))
-        verdict = predict_ai_video(fft_score, motion_score)
-        return fft_score, motion_score, verdict
-
-    return await asyncio.to_thread(_worker)
-
-
-async def _run_fact_check(transcript_text: Optional[str]) -> Tuple[Optional[VerificationResult], Optional[str]]:
-    if not transcript_text or not transcript_text.strip():
-        return None, None
-
-    try:
-        verifier = get_verifier()
-    except GeminiConfigurationError as exc:
-        logger.exception("Gemini configuration error while initializing verifier")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Gemini 구성 오류로 팩트체크를 수행할 수 없습니다.",
-        ) from exc
-
+async def _verify_with_retries(
+    verifier: GeminiVerifier,
+    text: str,
+) -> Tuple[Optional[VerificationResult], Optional[str]]:
+    """Run ``verifier.verify`` with the configured retries; blocked content is re-raised."""
     last_error: Optional[Exception] = None
     for attempt in range(1, GEMINI_MAX_ATTEMPTS + 1):
         try:
-            return await run_in_threadpool(verifier.verify, transcript_text)
-        except GeminiContentBlockedError as exc:
-            logger.warning(
-                "Gemini blocked fact-check attempt %d/%d: %s",
-                attempt,
-                GEMINI_MAX_ATTEMPTS,
-                exc.block_reason,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="요청하신 컨텐츠는 금지된 컨텐츠로 분류되어 분석할 수 없습니다.",
-            ) from exc
+            return await run_in_threadpool(verifier.verify, text, endpoint="video")
+        except GeminiContentBlockedError:
+            GEMINI_BLOCKS.labels("video").inc()
+            raise
         except GeminiVerificationError as exc:
             last_error = exc
+            GEMINI_RETRIES.labels("video").inc()
             logger.warning(
                 "Gemini fact-check attempt %d/%d failed: %s",
                 attempt,
@@ -386,19 +532,250 @@ async def _run_fact_check(transcript_text: Optional[str]) -> Tuple[Optional[Veri
     return None, None
 
 
+def _fact_check_verifier() -> GeminiVerifier:
+    try:
+        return get_verifier()
+    except GeminiConfigurationError as exc:
+        logger.exception("Gemini configuration error while initializing verifier")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Gemini 구성 오류로 팩트체크를 수행할 수 없습니다.",
+        ) from exc
+
+
+async def _run_fact_check(transcript_text: Optional[str]) -> Tuple[Optional[VerificationResult], Optional[str]]:
+    if not transcript_text or not transcript_text.strip():
+        return None, None
+
+    verifier = _fact_check_verifier()
+    cache = get_text_cache()
+    cached = cache.get(transcript_text)
+    if cached is not None:
+        return cached
+
+    try:
+        result, raw_response = await _verify_with_retries(verifier, transcript_text)
+    except GeminiContentBlockedError as exc:
+        logger.warning("Gemini blocked fact-check request: %s", exc.block_reason)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="요청하신 컨텐츠는 금지된 컨텐츠로 분류되어 분석할 수 없습니다.",
+        ) from exc
+    if result is not None:
+        cache.put(transcript_text, result, raw_response)
+    return result, raw_response
+
+
+async def _run_transcript_fact_check(
+    transcription: TranscriptionResult,
+) -> Tuple[Optional[VerificationResult], Optional[str], list[dict[str, Any]]]:
+    """
+    Fact-check a transcript in time-aligned chunks taken from its SRT segments.
+
+    Short transcripts (a single chunk) keep the original single-request path.
+    Otherwise each distinct chunk text is verified once, concurrently under
+    ``FACT_CHECK_CONCURRENCY``, reusing the text cache for chunks seen before,
+    and the per-chunk verdicts are merged into one video-level result.
+    """
+    chunks = chunk_transcript(parse_srt(transcription.srt))
+    if len(chunks) <= 1:
+        result, raw_response = await _run_fact_check(transcription.text)
+        return result, raw_response, []
+
+    verifier = _fact_check_verifier()
+    cache = get_text_cache()
+    semaphore = asyncio.Semaphore(FACT_CHECK_CONCURRENCY)
+
+    async def _check(text: str) -> Tuple[Optional[VerificationResult], Optional[str], bool]:
+        cached = cache.get(text)
+        if cached is not None:
+            return cached[0], cached[1], True
+        async with semaphore, span("fact_check.chunk", **{"transcript.chars": len(text)}):
+            try:
+                result, raw_response = await _verify_with_retries(verifier, text)
+            except GeminiContentBlockedError as exc:
+                # One blocked chunk should not sink the rest of the video.
+                logger.warning("Gemini blocked a transcript chunk: %s", exc.block_reason)
+                return None, None, False
+        if result is not None:
+            cache.put(text, result, raw_response)
+        return result, raw_response, False
+
+    unique: Dict[str, str] = {}
+    for chunk in chunks:
+        unique.setdefault(text_cache_key(chunk.text), chunk.text)
+    keys = list(unique)
+    outcomes = dict(zip(keys, await asyncio.gather(*(_check(unique[key]) for key in keys))))
+
+    per_chunk = [outcomes[text_cache_key(chunk.text)] for chunk in chunks]
+    result, segments = merge_chunk_verdicts(
+        chunks,
+        [outcome[0] for outcome in per_chunk],
+        [outcome[2] for outcome in per_chunk],
+    )
+    logger.debug(
+        "Chunked fact-check: %d chunks, %d unique, %d verdicts, %d from cache",
+        len(chunks),
+        len(keys),
+        len(segments),
+        sum(1 for outcome in per_chunk if outcome[2]),
+    )
+    if result is None:
+        return None, None, []
+
+    raw_response = json.dumps(
+        [
+            {"start": chunk.start, "end": chunk.end, "raw": outcome[1]}
+            for chunk, outcome in zip(chunks, per_chunk)
+            if outcome[0] is not None
+        ],
+        ensure_ascii=False,
+    )
+    return result, raw_response, segments
+
+
+VIDEO_ANALYZERS = StageRegistry("video")
+
+
+@VIDEO_ANALYZERS.stage(
+    "frames",
+    inputs=("video_path", "canonical_url"),
+    version=f"1/rate={VIDEO_FRAME_SAMPLE_RATE}/budget={VIDEO_FRAME_BUDGET}/motion={VIDEO_MOTION_MODE}",
+    blocking=True,
+    cache=True,
+    encode=dataclasses.asdict,
+    decode=lambda payload: FrameAnalysis(**payload),
+)
+def _frames_stage(video_path: str, canonical_url: str) -> FrameAnalysis:
+    try:
+        analysis = analyze_video_frames(video_path, sample_rate=VIDEO_FRAME_SAMPLE_RATE)
+    except Exception as exc:
+        logger.exception("Video frame analysis failed for %s", canonical_url)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"영상 프레임 분석 중 오류가 발생했습니다: {exc}",
+        ) from exc
+    logger.debug(
+        "Frame analysis used %d frames in %d windows (converged=%s)",
+        analysis.frames_analyzed,
+        analysis.windows_analyzed,
+        analysis.converged,
+    )
+    set_span_attributes(
+        **{
+            "video.frames_analyzed": analysis.frames_analyzed,
+            "video.windows_analyzed": analysis.windows_analyzed,
+            "video.frames_converged": analysis.converged,
+        }
+    )
+    return analysis
+
+
+@VIDEO_ANALYZERS.stage("ai_verdict", inputs=("frames",))
+async def _ai_verdict_stage(frames: FrameAnalysis) -> Tuple[float, float, str]:
+    fft_score = safe_float(frames.fft_score)
+    motion_score = safe_float(frames.motion_score)
+    return fft_score, motion_score, predict_ai_video(fft_score, motion_score)
+
+
+@VIDEO_ANALYZERS.stage(
+    "transcription",
+    inputs=("download", "canonical_url"),
+    version=f"1/whisper={WHISPER_MODEL_NAME}",
+    cache=True,
+    encode=dataclasses.asdict,
+    decode=lambda payload: TranscriptionResult(**payload),
+)
+async def _transcription_stage(download: VideoDownloadResult, canonical_url: str) -> TranscriptionResult:
+    transcription = await _transcribe_media(download, canonical_url)
+    set_span_attributes(**{"transcript.chars": len(transcription.text)})
+    return transcription
+
+
+@VIDEO_ANALYZERS.stage("fact_check", inputs=("transcription",))
+async def _fact_check_stage(
+    transcription: TranscriptionResult,
+) -> Tuple[Optional[VerificationResult], Optional[str], list[dict[str, Any]]]:
+    return await _run_transcript_fact_check(transcription)
+
+
+async def _run_video_analyzers(
+    targets: list[str],
+    *,
+    download_result: VideoDownloadResult,
+    canonical_url: str,
+    video_id: Optional[str],
+    video_path: Optional[str] = None,
+    precomputed: Optional[Dict[str, Any]] = None,
+) -> PipelineRun:
+    inputs: Dict[str, Any] = {
+        "download": download_result,
+        "canonical_url": canonical_url,
+        "video_path": video_path,
+    }
+    inputs.update({name: value for name, value in (precomputed or {}).items() if value is not None})
+    return await run_pipeline(
+        VIDEO_ANALYZERS,
+        targets,
+        inputs,
+        store=VideoStageStore(download_result.video_id or video_id),
+    )
+
+
+def _stage_timings(run: PipelineRun) -> Dict[str, float]:
+    return {name: round(timing.seconds, 4) for name, timing in run.timings.items()}
+
+
 async def _process_video_analysis(
     *,
     requested_url: str,
     canonical_url: str,
     video_id: Optional[str],
+    transcript_only: bool = False,
 ) -> VideoResponse:
-    logger.debug("Starting video analysis: requested_url=%s canonical_url=%s", requested_url, canonical_url)
-    try:
-        download_result = await run_in_threadpool(
-            download_youtube_video,
-            canonical_url,
-            YOUTUBE_COOKIES_PATH,
+    logger.debug(
+        "Starting video analysis: requested_url=%s canonical_url=%s transcript_only=%s",
+        requested_url,
+        canonical_url,
+        transcript_only,
+    )
+    with span(
+        "video.analysis",
+        **{"video.url": canonical_url, "video.id": video_id, "video.transcript_only": transcript_only},
+    ):
+        return await _download_and_analyze_video(
+            canonical_url=canonical_url,
+            video_id=video_id,
+            transcript_only=transcript_only,
         )
+
+
+async def _download_and_analyze_video(
+    *,
+    canonical_url: str,
+    video_id: Optional[str],
+    transcript_only: bool,
+) -> VideoResponse:
+    progressive: Optional[ProgressiveAnalysis] = None
+    try:
+        if not transcript_only and progressive_pipeline_available():
+            progressive = await run_in_threadpool(
+                run_progressive_analysis,
+                canonical_url,
+                YOUTUBE_COOKIES_PATH,
+                VIDEO_FRAME_SAMPLE_RATE,
+            )
+        if progressive is not None:
+            download_result = progressive.download
+        else:
+            download_result = await run_in_threadpool(
+                functools.partial(
+                    download_youtube_video,
+                    canonical_url,
+                    YOUTUBE_COOKIES_PATH,
+                    include_video=not transcript_only,
+                )
+            )
     except Exception as exc:
         logger.exception("Failed to download video: %s", canonical_url)
         raise HTTPException(
@@ -406,26 +783,48 @@ async def _process_video_analysis(
             detail=f"영상 다운로드 중 오류가 발생했습니다: {exc}",
         ) from exc
 
-    video_path = str(download_result.path)
-    metrics_task = asyncio.create_task(_compute_video_metrics(video_path))
-    transcription_task = asyncio.create_task(asyncio.to_thread(transcribe_video_audio, video_path))
+    video_path = str(download_result.path) if download_result.path else None
+    audio_path = str(download_result.audio_path) if download_result.audio_path else None
+    set_span_attributes(
+        **{
+            "video.id": download_result.video_id or video_id,
+            "video.duration": download_result.duration,
+            "video.progressive": progressive is not None,
+        }
+    )
+
+    with pin_media(video_path, audio_path):
+        if transcript_only:
+            response = await _transcribe_downloaded_audio(
+                download_result=download_result,
+                canonical_url=canonical_url,
+                video_id=video_id,
+            )
+        else:
+            response = await _analyze_downloaded_video(
+                download_result=download_result,
+                video_path=video_path,
+                canonical_url=canonical_url,
+                video_id=video_id,
+                precomputed={
+                    "frames": progressive.frames,
+                    "transcription": progressive.transcription,
+                } if progressive else None,
+            )
+    # Both flows have stored their results by now (record or stage cache).
+    await release_analyzed_media(video_path, audio_path)
+    return response
 
-    try:
-        fft_score, motion_score, ai_result = await metrics_task
-    except Exception as exc:
-        transcription_task.cancel()
-        try:
-            await transcription_task
-        except asyncio.CancelledError:
-            pass
-        logger.exception("Video frame analysis failed for %s", canonical_url)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"영상 프레임 분석 중 오류가 발생했습니다: {exc}",
-        ) from exc
 
+async def _transcribe_media(
+    download_result: VideoDownloadResult,
+    canonical_url: str,
+) -> TranscriptionResult:
+    source = download_result.transcription_source
     try:
-        transcription = await transcription_task
+        if source is None:
+            raise ValueError("전사할 오디오 파일이 없습니다.")
+        return await asyncio.to_thread(transcribe_video_audio, str(source))
     except Exception as exc:
         logger.exception("Whisper transcription failed for %s", canonical_url)
         raise HTTPException(
@@ -433,11 +832,71 @@ async def _process_video_analysis(
             detail=f"Whisper 전사 중 오류가 발생했습니다: {exc}",
         ) from exc
 
-    fact_result, raw_fact_response = await _run_fact_check(transcription.text)
 
+async def _transcribe_downloaded_audio(
+    *,
+    download_result: VideoDownloadResult,
+    canonical_url: str,
+    video_id: Optional[str],
+) -> VideoResponse:
+    """Transcript-only flow: audio stream only, no frame metrics and no analysis record."""
+    run = await _run_video_analyzers(
+        ["fact_check"],
+        download_result=download_result,
+        canonical_url=canonical_url,
+        video_id=video_id,
+    )
+    transcription: TranscriptionResult = run.results["transcription"]
+    fact_result, _, fact_segments = run.results["fact_check"]
     duration = transcription.duration or (
         float(download_result.duration) if download_result.duration is not None else None
     )
+    return _build_video_response(
+        fft_score=None,
+        motion_score=None,
+        ai_result="전사 전용 요청으로 영상 프레임 분석을 생략했습니다.",
+        transcript=transcription.text,
+        transcript_srt=transcription.srt,
+        fact_result=fact_result,
+        record_id=None,
+        video_id=download_result.video_id or video_id,
+        duration=duration,
+        cached=False,
+        fact_segments=fact_segments,
+        stage_timings=_stage_timings(run),
+        gemini_usage=current_usage(),
+    )
+
+
+async def _analyze_downloaded_video(
+    *,
+    download_result: VideoDownloadResult,
+    video_path: str,
+    canonical_url: str,
+    video_id: Optional[str],
+    precomputed: Optional[Dict[str, Any]] = None,
+) -> VideoResponse:
+    """
+    Run every registered video analyzer; independent stages (frame scoring,
+    transcription, added detectors) run concurrently and anything the
+    progressive pipeline already produced is reused.
+    """
+    run = await _run_video_analyzers(
+        VIDEO_ANALYZERS.names(),
+        download_result=download_result,
+        canonical_url=canonical_url,
+        video_id=video_id,
+        video_path=video_path,
+        precomputed=precomputed,
+    )
+    fft_score, motion_score, ai_result = run.results["ai_verdict"]
+    transcription: TranscriptionResult = run.results["transcription"]
+    fact_result, raw_fact_response, fact_segments = run.results["fact_check"]
+
+    duration = transcription.duration or (
+        float(download_result.duration) if download_result.duration is not None else None
+    )
+    gemini_usage = current_usage()
 
     try:
         record_id = await upsert_video_analysis_record(
@@ -455,6 +914,8 @@ async def _process_video_analysis(
             fact_reason=fact_result.reason if fact_result else None,
             fact_urls=fact_result.urls if fact_result else None,
             raw_fact_response=raw_fact_response,
+            fact_segments=fact_segments,
+            gemini_usage=gemini_usage,
         )
     except Exception as exc:
         logger.exception("Failed to persist video analysis result")
@@ -482,15 +943,140 @@ async def _process_video_analysis(
         video_id=download_result.video_id or video_id,
         duration=duration,
         cached=False,
+        fact_segments=fact_segments,
+        stage_timings=_stage_timings(run),
+        gemini_usage=gemini_usage,
     )
 
 
+async def _audit_prescreen(decision: PrescreenDecision, text: str, verifier: GeminiVerifier) -> None:
+    """Verify a pre-screened text with Gemini anyway and record whether the skip was wrong."""
+    try:
+        result, _ = await run_in_threadpool(verifier.verify, text, endpoint="prescreen_audit")
+    except GeminiVerificationError as exc:
+        logger.debug("Pre-screen audit could not be verified: %s", exc)
+        return
+    except Exception:
+        logger.exception("Unexpected error during pre-screen audit")
+        return
+    if get_prescreener().record_audit(decision, result):
+        logger.info(
+            "Pre-screen false skip (%s): local=%s gemini=%s",
+            decision.reason,
+            decision.result.accuracy,
+            result.accuracy,
+        )
+
+
+def _spawn_background(coro: Any) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _persist_reused_verdict(
+    text: str,
+    result: VerificationResult,
+    raw_response: Optional[str],
+    cached_from: Optional[UUID],
+) -> UUID:
+    """
+    Store a verdict answered without Gemini so it still appears in history.
+    ``cached_from`` marks reused rows so they are not indexed as Gemini-verified.
+    """
+    try:
+        return await insert_verification_record(
+            input_text=text,
+            accuracy=result.accuracy,
+            accuracy_reason=result.accuracy_reason,
+            reason=result.reason,
+            urls=result.urls,
+            raw_response=raw_response,
+            cached_from=cached_from,
+        )
+    except Exception as exc:
+        logger.exception("Failed to persist reused verification result")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to persist verification result.",
+        ) from exc
+
+
+async def _respond_prescreened(
+    text: str,
+    decision: PrescreenDecision,
+    verifier: GeminiVerifier,
+) -> VerificationResponse:
+    logger.debug(
+        "Pre-screen answered text request: reason=%s source=%s similarity=%s",
+        decision.reason,
+        decision.source_record_id,
+        decision.similarity,
+    )
+    record_id = await _persist_reused_verdict(
+        text, decision.result, decision.raw_response, decision.source_record_id
+    )
+    if get_prescreener().should_audit():
+        _spawn_background(_audit_prescreen(decision, text, verifier))
+
+    return VerificationResponse(
+        result=decision.result,
+        record_id=record_id,
+        raw_model_response=decision.raw_response,
+        prescreen=decision.reason,
+        cached_from=decision.source_record_id,
+    )
+
+
+async def _respond_semantic_hit(text: str) -> Optional[VerificationResponse]:
+    """Answer from the nearest verified neighbour when it is similar enough."""
+    try:
+        hit = await get_semantic_cache().lookup(text)
+    except Exception:
+        logger.exception("Semantic cache lookup failed; falling back to Gemini")
+        return None
+    if hit is None:
+        return None
+    logger.debug("Semantic cache hit: source=%s similarity=%.4f", hit.record_id, hit.similarity)
+    record_id = await _persist_reused_verdict(text, hit.result, hit.raw_response, hit.record_id)
+    return VerificationResponse(
+        result=hit.result,
+        record_id=record_id,
+        raw_model_response=hit.raw_response,
+        cached_from=hit.record_id,
+    )
+
+
+async def _index_verified_text(
+    text: str,
+    record_id: UUID,
+    result: VerificationResult,
+    raw_response: Optional[str],
+) -> None:
+    try:
+        await get_semantic_cache().add(text, record_id, result, raw_response)
+    except Exception:
+        logger.exception("Failed to add record %s to the semantic cache", record_id)
+
+
 @app.get("/health", tags=["meta"])
 async def health() -> dict[str, Any]:
     """Simple health endpoint for uptime checks."""
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["meta"], response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of stage latency histograms and event counters."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/storage/videos", tags=["meta"])
+async def video_storage_stats() -> dict[str, Any]:
+    """Report media usage against the byte budget and what the janitor evicted."""
+    return get_eviction_stats()
+
+
 
 @app.post(
     "/verify/text",
@@ -502,7 +1088,18 @@ async def verify_text(
     payload: VerificationRequest,
     verifier: GeminiVerifier = Depends(verifier_dependency),
 ) -> VerificationResponse:
-    logger.debug("Received verification request: %s", payload)
+    logger.debug("Received verification request (%d chars)", len(payload.text))
+    log_payload(logger, "Verification request text", payload.text)
+
+    if PRESCREEN_ENABLED:
+        decision = get_prescreener().screen(payload.text)
+        if decision is not None:
+            return await _respond_prescreened(payload.text, decision, verifier)
+
+    if SEMANTIC_CACHE_ENABLED:
+        reused = await _respond_semantic_hit(payload.text)
+        if reused is not None:
+            return reused
 
     result: Optional[VerificationResult] = None
     raw_response: Optional[str] = None
@@ -515,6 +1112,7 @@ async def verify_text(
             logger.exception("Gemini configuration error on attempt %d", attempt)
             raise HTTPException(status_code=500, detail=str(exc)) from exc
         except GeminiContentBlockedError as exc:
+            GEMINI_BLOCKS.labels("text").inc()
             logger.warning(
                 "Gemini blocked verification request on attempt %d/%d: %s",
                 attempt,
@@ -526,6 +1124,7 @@ async def verify_text(
                 detail="요청하신 컨텐츠는 금지된 컨텐츠로 분류되어 분석할 수 없습니다.",
             ) from exc
         except GeminiVerificationError as exc:
+            GEMINI_RETRIES.labels("text").inc()
             logger.warning(
                 "Gemini verification attempt %d/%d failed: %s",
                 attempt,
@@ -562,6 +1161,7 @@ async def verify_text(
         logger.warning("Verification result was not a VerificationResult instance: %s", result)
         result = VerificationResult.model_validate(result)
 
+    gemini_usage = current_usage()
     try:
         record_id = await insert_verification_record(
             input_text=payload.text,
@@ -570,6 +1170,7 @@ async def verify_text(
             reason=result.reason,
             urls=result.urls,
             raw_response=raw_response,
+            gemini_usage=gemini_usage,
         )
     except Exception as exc:
         logger.exception("Failed to persist verification result")
@@ -584,10 +1185,14 @@ async def verify_text(
         len(result.urls),
         record_id,
     )
+    get_prescreener().remember(payload.text, result, raw_response, record_id)
+    if SEMANTIC_CACHE_ENABLED:
+        _spawn_background(_index_verified_text(payload.text, record_id, result, raw_response))
     return VerificationResponse(
         result=result,
         record_id=record_id,
         raw_model_response=raw_response,
+        gemini_usage=gemini_usage,
     )
 
 
@@ -690,6 +1295,150 @@ async def verify_image(
     return ImageVerificationResponse(result=result)
 
 
+def _http_error_message(exc: HTTPException) -> str:
+    detail = exc.detail
+    if isinstance(detail, dict):
+        return str(detail.get("message") or detail)
+    return str(detail)
+
+
+def _batch_error(image_url: str, status_code: int, message: str) -> ImageBatchItem:
+    return ImageBatchItem(image_url=image_url, status_code=status_code, error=message)
+
+
+def _detection_to_batch_item(image_url: str, det: Dict[str, Any]) -> ImageBatchItem:
+    if not det.get("success", False):
+        return _batch_error(
+            image_url,
+            status.HTTP_400_BAD_REQUEST,
+            det.get("error") or "이미지 판별 중 오류가 발생했습니다.",
+        )
+    return ImageBatchItem(
+        image_url=image_url,
+        status_code=status.HTTP_200_OK,
+        result=ImageVerificationResult(
+            success=True,
+            verdict=det.get("verdict"),
+            confidence=det.get("confidence"),
+            fake_prob=det.get("fake_prob"),
+            real_prob=det.get("real_prob"),
+            error=None,
+            model_name=det.get("model_name") or MODEL_NAME,
+        ),
+    )
+
+
+async def _detect_downloaded(ready: list[Tuple[str, bytes]]) -> list[ImageBatchItem]:
+    try:
+        detections = await run_in_threadpool(detect_deepfake_images, [content for _, content in ready])
+    except Exception:
+        logger.exception("Unexpected error while verifying an image batch")
+        return [
+            _batch_error(url, status.HTTP_500_INTERNAL_SERVER_ERROR, "이미지를 판별하는 중 예기치 못한 오류가 발생했습니다.")
+            for url, _ in ready
+        ]
+    return [_detection_to_batch_item(url, det) for (url, _), det in zip(ready, detections)]
+
+
+@dataclasses.dataclass(frozen=True)
+class _BatchDownload:
+    image_url: str
+    content: Optional[bytes] = None
+    mime_type: Optional[str] = None
+    status_code: int = status.HTTP_200_OK
+    error: Optional[str] = None
+
+
+async def _iter_batch_downloads(image_urls: list[str]) -> AsyncIterator[_BatchDownload]:
+    """
+    Download distinct URLs concurrently, bounded overall and per host, and
+    yield them in completion order. Failures are yielded with the status and
+    message the single-image endpoints would have raised.
+    """
+    overall = asyncio.Semaphore(IMAGE_BATCH_CONCURRENCY)
+    per_host: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(IMAGE_BATCH_PER_HOST))
+
+    async def fetch(image_url: str) -> _BatchDownload:
+        async with overall, per_host[urlparse(image_url).netloc]:
+            try:
+                content, mime_type = await _download_image_bytes(image_url)
+            except HTTPException as exc:
+                return _BatchDownload(image_url, status_code=exc.status_code, error=_http_error_message(exc))
+            except Exception:
+                logger.exception("Unexpected error while downloading image for batch: %s", image_url)
+                return _BatchDownload(
+                    image_url,
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    error="이미지를 내려받는 중 예기치 못한 오류가 발생했습니다.",
+                )
+        return _BatchDownload(image_url, content, mime_type)
+
+    downloads = [asyncio.create_task(fetch(url)) for url in image_urls]
+    try:
+        for finished in asyncio.as_completed(downloads):
+            yield await finished
+    finally:
+        for task in downloads:
+            task.cancel()
+
+
+async def _iter_image_batch(image_urls: list[str]) -> AsyncIterator[ImageBatchItem]:
+    """
+    Score downloads in detector batches as they land, so inference overlaps
+    the slower fetches. Yields one item per distinct URL in completion order.
+    """
+    ready: list[Tuple[str, bytes]] = []
+    async for download in _iter_batch_downloads(image_urls):
+        if download.error is not None:
+            yield _batch_error(download.image_url, download.status_code, download.error)
+            continue
+        ready.append((download.image_url, download.content))
+        if len(ready) >= DEEPFAKE_BATCH_SIZE:
+            for item in await _detect_downloaded(ready):
+                yield item
+            ready = []
+    if ready:
+        for item in await _detect_downloaded(ready):
+            yield item
+
+
+async def _stream_image_batch(items: AsyncIterator[ImageBatchItem]) -> AsyncIterator[bytes]:
+    async for item in items:
+        yield item.model_dump_json().encode("utf-8") + b"\n"
+
+
+@app.post(
+    "/verify/image/batch",
+    response_model=ImageBatchVerificationResponse,
+    tags=["verification"],
+    status_code=status.HTTP_200_OK,
+)
+async def verify_image_batch(
+    payload: ImageBatchVerificationRequest,
+    stream: bool = Query(False, description="true이면 NDJSON으로 이미지별 결과를 완료되는 즉시 전송한다."),
+):
+    """
+    여러 이미지를 한 번에 딥페이크 판별한다. 실패한 이미지는 전체 요청을
+    실패시키지 않고 해당 항목의 error/status_code로 보고한다.
+    """
+    image_urls = [str(url) for url in payload.image_urls]
+    if len(image_urls) > IMAGE_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"한 번에 최대 {IMAGE_BATCH_MAX}개의 이미지만 판별할 수 있습니다.",
+        )
+
+    unique_urls = list(dict.fromkeys(image_urls))
+    logger.debug("Received image batch: %d urls (%d distinct)", len(image_urls), len(unique_urls))
+    items = _iter_image_batch(unique_urls)
+
+    if stream:
+        return StreamingResponse(_stream_image_batch(items), media_type="application/x-ndjson")
+
+    by_url = {item.image_url: item async for item in items}
+    return ImageBatchVerificationResponse(results=[by_url[url] for url in image_urls])
+
+
 @app.post(
     "/verify/image-gemini",
     response_model=GeminiImageVerificationResponse,
@@ -698,6 +1447,7 @@ async def verify_image(
 )
 async def verify_image_with_gemini(
     payload: ImageVerificationRequest,
+    normalize: bool = Query(True, description=NORMALIZE_QUERY_DESCRIPTION),
     verifier: GeminiImageVerifier = Depends(image_verifier_dependency),
 ) -> GeminiImageVerificationResponse:
     """이미지를 Gemini 멀티모달 모델에 전달해 구조화된 판별 결과를 반환한다."""
@@ -716,6 +1466,12 @@ async def verify_image_with_gemini(
             detail="이미지를 내려받는 중 예기치 못한 오류가 발생했습니다.",
         ) from exc
 
+    normalization: Optional[ImageNormalizationSummary] = None
+    if normalize and GEMINI_IMAGE_NORMALIZE:
+        normalized = await run_in_threadpool(normalize_image, image_bytes, mime_type)
+        image_bytes, mime_type = normalized.data, normalized.mime_type
+        normalization = ImageNormalizationSummary(**normalized.summary())
+
     result: Optional[GeminiImageVerdict] = None
     raw_response: Optional[str] = None
 
@@ -731,6 +1487,7 @@ async def verify_image_with_gemini(
             logger.exception("Gemini image configuration error on attempt %d", attempt)
             raise HTTPException(status_code=500, detail=str(exc)) from exc
         except GeminiContentBlockedError as exc:
+            GEMINI_BLOCKS.labels("image").inc()
             logger.warning(
                 "Gemini blocked image verification request on attempt %d/%d: %s",
                 attempt,
@@ -742,6 +1499,7 @@ async def verify_image_with_gemini(
                 detail="요청하신 컨텐츠는 금지된 컨텐츠로 분류되어 분석할 수 없습니다.",
             ) from exc
         except GeminiVerificationError as exc:
+            GEMINI_RETRIES.labels("image").inc()
             logger.warning(
                 "Gemini image verification attempt %d/%d failed: %s",
                 attempt,
@@ -774,7 +1532,130 @@ async def verify_image_with_gemini(
     if raw_response is None:
         logger.warning("Gemini image verification returned no raw response payload")
 
-    return GeminiImageVerificationResponse(result=result, raw_model_response=raw_response)
+    return GeminiImageVerificationResponse(
+        result=result,
+        raw_model_response=raw_response,
+        gemini_usage=current_usage(),
+        image_normalization=normalization,
+    )
+
+
+def _verify_image_batch_with_retries(
+    verifier: GeminiImageVerifier,
+    images: list[Tuple[bytes, Optional[str]]],
+) -> list[GeminiImageBatchResult]:
+    """Run ``verifier.verify_batch``, re-sending failed (not blocked) images up to GEMINI_MAX_ATTEMPTS times."""
+    outcomes = verifier.verify_batch(images)
+    for attempt in range(2, GEMINI_MAX_ATTEMPTS + 1):
+        failed = [
+            index
+            for index, outcome in enumerate(outcomes)
+            if outcome.error is not None and not isinstance(outcome.error, GeminiContentBlockedError)
+        ]
+        if not failed:
+            break
+        GEMINI_RETRIES.labels("image_batch").inc(len(failed))
+        logger.warning(
+            "Gemini image batch attempt %d/%d: retrying %d failed images",
+            attempt,
+            GEMINI_MAX_ATTEMPTS,
+            len(failed),
+        )
+        retried = verifier.verify_batch([images[index] for index in failed])
+        for index, outcome in zip(failed, retried):
+            outcomes[index] = outcome
+    return outcomes
+
+
+def _gemini_batch_item(
+    image_url: str,
+    outcome: GeminiImageBatchResult,
+    normalization: Optional[ImageNormalizationSummary],
+) -> GeminiImageBatchItem:
+    if outcome.error is None:
+        return GeminiImageBatchItem(
+            image_url=image_url,
+            status_code=status.HTTP_200_OK,
+            result=outcome.verdict,
+            raw_model_response=outcome.raw_response,
+            image_normalization=normalization,
+        )
+    if isinstance(outcome.error, GeminiContentBlockedError):
+        GEMINI_BLOCKS.labels("image_batch").inc()
+        return GeminiImageBatchItem(
+            image_url=image_url,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            image_normalization=normalization,
+            error="요청하신 컨텐츠는 금지된 컨텐츠로 분류되어 분석할 수 없습니다.",
+        )
+    logger.warning("Gemini batch verification failed for %s: %s", image_url, outcome.error)
+    return GeminiImageBatchItem(
+        image_url=image_url,
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        image_normalization=normalization,
+        error="Gemini 이미지 판별에 실패했습니다.",
+    )
+
+
+@app.post(
+    "/verify/image-gemini/batch",
+    response_model=GeminiImageBatchVerificationResponse,
+    tags=["verification"],
+    status_code=status.HTTP_200_OK,
+)
+async def verify_image_batch_with_gemini(
+    payload: ImageBatchVerificationRequest,
+    normalize: bool = Query(True, description=NORMALIZE_QUERY_DESCRIPTION),
+    verifier: GeminiImageVerifier = Depends(image_verifier_dependency),
+) -> GeminiImageBatchVerificationResponse:
+    """
+    여러 이미지를 Gemini로 판별한다. 이미지를 몇 장씩 한 요청에 묶어 보내며,
+    묶음 응답이 검증에 실패하면 해당 묶음만 한 장씩 다시 요청한다.
+    """
+    image_urls = [str(url) for url in payload.image_urls]
+    if len(image_urls) > IMAGE_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"한 번에 최대 {IMAGE_BATCH_MAX}개의 이미지만 판별할 수 있습니다.",
+        )
+
+    unique_urls = list(dict.fromkeys(image_urls))
+    logger.debug("Received Gemini image batch: %d urls (%d distinct)", len(image_urls), len(unique_urls))
+
+    by_url: Dict[str, GeminiImageBatchItem] = {}
+    downloaded: list[_BatchDownload] = []
+    async for download in _iter_batch_downloads(unique_urls):
+        if download.error is not None:
+            by_url[download.image_url] = GeminiImageBatchItem(
+                image_url=download.image_url,
+                status_code=download.status_code,
+                error=download.error,
+            )
+        else:
+            downloaded.append(download)
+
+    if downloaded:
+        images = [(download.content, download.mime_type) for download in downloaded]
+        summaries: list[Optional[ImageNormalizationSummary]] = [None] * len(downloaded)
+        if normalize and GEMINI_IMAGE_NORMALIZE:
+            normalized = await run_in_threadpool(lambda: [normalize_image(*image) for image in images])
+            images = [(item.data, item.mime_type) for item in normalized]
+            summaries = [ImageNormalizationSummary(**item.summary()) for item in normalized]
+        try:
+            outcomes = await run_in_threadpool(_verify_image_batch_with_retries, verifier, images)
+        except Exception as exc:  # noqa: BLE001 - want full traceback in logs
+            logger.exception("Unexpected Gemini image batch verification error")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="이미지를 판별하는 중 예기치 못한 오류가 발생했습니다.",
+            ) from exc
+        for download, outcome, summary in zip(downloaded, outcomes, summaries):
+            by_url[download.image_url] = _gemini_batch_item(download.image_url, outcome, summary)
+
+    return GeminiImageBatchVerificationResponse(
+        results=[by_url[url] for url in image_urls],
+        gemini_usage=current_usage(),
+    )
 
 
 @app.post(
@@ -802,12 +1683,15 @@ async def analyze_video(data: VideoRequest) -> VideoResponse:
             detail="이전 영상 분석 기록을 조회하지 못했습니다.",
         ) from exc
 
+    cache_event("video_record", bool(cached_record))
     if cached_record:
         logger.debug("Serving cached video analysis for url=%s", canonical_url)
         return _record_to_video_response(cached_record)
 
+    task_key = f"{canonical_url}#transcript" if data.transcript_only else canonical_url
+
     async with _video_tasks_lock:
-        task = _video_tasks.get(canonical_url)
+        task = _video_tasks.get(task_key)
         created_task = False
 
         if task is None:
@@ -817,14 +1701,17 @@ async def analyze_video(data: VideoRequest) -> VideoResponse:
                     requested_url=data.url,
                     canonical_url=canonical_url,
                     video_id=video_id,
+                    transcript_only=data.transcript_only,
                 )
             )
-            _video_tasks[canonical_url] = task
+            _video_tasks[task_key] = task
 
-            def _cleanup(fut: asyncio.Future, *, key: str = canonical_url) -> None:
+            def _cleanup(fut: asyncio.Future, *, key: str = task_key) -> None:
                 _video_tasks.pop(key, None)
 
             task.add_done_callback(_cleanup)
+        else:
+            SINGLE_FLIGHT_JOINS.labels("video").inc()
 
     try:
         response = await task
@@ -845,3 +1732,218 @@ async def analyze_video(data: VideoRequest) -> VideoResponse:
 
     # Fallback: coerce dict-like result to Pydantic model
     return VideoResponse(**response)
+
+
+def _encode_history_cursor(created_at: datetime, record_id: UUID) -> str:
+    token = f"{created_at.isoformat()}|{record_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(token).decode("ascii").rstrip("=")
+
+
+def _decode_history_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_raw, id_raw = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_raw), UUID(id_raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="유효하지 않은 페이지 커서입니다.",
+        ) from exc
+
+
+def _validate_accuracy_band(min_accuracy: Optional[int], max_accuracy: Optional[int]) -> None:
+    if min_accuracy is not None and max_accuracy is not None and min_accuracy > max_accuracy:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_accuracy는 max_accuracy보다 클 수 없습니다.",
+        )
+
+
+def _verification_row_to_summary(row: Dict[str, Any]) -> VerificationRecordSummary:
+    return VerificationRecordSummary(
+        record_id=row["id"],
+        input_text=row["input_text"],
+        result=VerificationResult(
+            accuracy=row["accuracy"],
+            accuracy_reason=row["accuracy_reason"] or "",
+            reason=row["reason"],
+            urls=row["urls"],
+        ),
+        created_at=row["created_at"],
+    )
+
+
+def _video_row_to_summary(row: Dict[str, Any]) -> VideoAnalysisSummary:
+    return VideoAnalysisSummary(
+        record_id=row["id"],
+        video_url=row["video_url"],
+        video_id=row["video_id"],
+        fft_artifact_score=_format_score(row["fft_score"]),
+        action_pattern_score=_format_score(row["motion_score"]),
+        result=row["ai_result"] or "분석 결과를 생성하지 못했습니다.",
+        duration=row["duration"],
+        fact_accuracy=row["fact_accuracy"],
+        fact_reason=row["fact_reason"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+async def _stream_history_ndjson(rows: AsyncIterator[Any], limit: int) -> AsyncIterator[bytes]:
+    """Forward summaries as NDJSON while later history pages are still being fetched."""
+    count = 0
+    last = None
+    async for item in rows:
+        count += 1
+        last = item
+        yield item.model_dump_json().encode("utf-8") + b"\n"
+
+    next_cursor = None
+    if count == limit and last is not None:
+        next_cursor = _encode_history_cursor(last.created_at, last.record_id)
+    yield json.dumps({"next_cursor": next_cursor}).encode("utf-8") + b"\n"
+
+
+async def _map_rows(rows: AsyncIterator[Dict[str, Any]], mapper) -> AsyncIterator[Any]:
+    async for row in rows:
+        yield mapper(row)
+
+
+@app.get(
+    "/history/text",
+    response_model=VerificationRecordPage,
+    tags=["history"],
+    status_code=status.HTTP_200_OK,
+)
+async def list_verification_history(
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor 값."),
+    min_accuracy: Optional[int] = Query(None, ge=0, le=100),
+    max_accuracy: Optional[int] = Query(None, ge=0, le=100),
+    stream: bool = Query(False, description="true이면 NDJSON으로 행을 조회되는 즉시 전송한다."),
+):
+    limit = min(limit, HISTORY_PAGE_MAX)
+    _validate_accuracy_band(min_accuracy, max_accuracy)
+    summaries = _map_rows(
+        iter_verification_records(
+            limit=limit,
+            before=_decode_history_cursor(cursor),
+            min_accuracy=min_accuracy,
+            max_accuracy=max_accuracy,
+        ),
+        _verification_row_to_summary,
+    )
+
+    if stream:
+        return StreamingResponse(
+            _stream_history_ndjson(summaries, limit),
+            media_type="application/x-ndjson",
+        )
+
+    try:
+        items = [item async for item in summaries]
+    except Exception as exc:
+        logger.exception("Failed to list verification history")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="검증 이력을 조회하지 못했습니다.",
+        ) from exc
+
+    next_cursor = None
+    if len(items) == limit:
+        next_cursor = _encode_history_cursor(items[-1].created_at, items[-1].record_id)
+    return VerificationRecordPage(items=items, next_cursor=next_cursor)
+
+
+@app.get(
+    "/history/video",
+    response_model=VideoAnalysisPage,
+    tags=["history"],
+    status_code=status.HTTP_200_OK,
+)
+async def list_video_history(
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor 값."),
+    min_accuracy: Optional[int] = Query(None, ge=0, le=100, description="팩트체크 정확도 하한."),
+    max_accuracy: Optional[int] = Query(None, ge=0, le=100, description="팩트체크 정확도 상한."),
+    stream: bool = Query(False, description="true이면 NDJSON으로 행을 조회되는 즉시 전송한다."),
+):
+    limit = min(limit, HISTORY_PAGE_MAX)
+    _validate_accuracy_band(min_accuracy, max_accuracy)
+    summaries = _map_rows(
+        iter_video_analysis_records(
+            limit=limit,
+            before=_decode_history_cursor(cursor),
+            min_accuracy=min_accuracy,
+            max_accuracy=max_accuracy,
+        ),
+        _video_row_to_summary,
+    )
+
+    if stream:
+        return StreamingResponse(
+            _stream_history_ndjson(summaries, limit),
+            media_type="application/x-ndjson",
+        )
+
+    try:
+        items = [item async for item in summaries]
+    except Exception as exc:
+        logger.exception("Failed to list video analysis history")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="영상 분석 이력을 조회하지 못했습니다.",
+        ) from exc
+
+    next_cursor = None
+    if len(items) == limit:
+        next_cursor = _encode_history_cursor(items[-1].created_at, items[-1].record_id)
+    return VideoAnalysisPage(items=items, next_cursor=next_cursor)
+
+
+@app.get(
+    "/stats/text",
+    response_model=HistoryStats,
+    tags=["history"],
+    status_code=status.HTTP_200_OK,
+)
+async def verification_stats(
+    since: Optional[datetime] = Query(None, description="이 시각 이후 레코드만 집계."),
+) -> HistoryStats:
+    try:
+        summary = await fetch_verification_stats(since=since)
+    except Exception as exc:
+        logger.exception("Failed to aggregate verification stats")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="검증 통계를 집계하지 못했습니다.",
+        ) from exc
+    return HistoryStats(**summary)
+
+
+@app.get("/stats/prescreen", tags=["history"])
+async def prescreen_stats() -> dict[str, Any]:
+    """Pre-screen hit rate by reason and the false-skip rate measured by audits."""
+    return get_prescreener().stats()
+
+
+@app.get(
+    "/stats/video",
+    response_model=HistoryStats,
+    tags=["history"],
+    status_code=status.HTTP_200_OK,
+)
+async def video_analysis_stats(
+    since: Optional[datetime] = Query(None, description="이 시각 이후 레코드만 집계."),
+) -> HistoryStats:
+    try:
+        summary = await fetch_video_analysis_stats(since=since)
+    except Exception as exc:
+        logger.exception("Failed to aggregate video analysis stats")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="영상 분석 통계를 집계하지 못했습니다.",
+        ) from exc
+    return HistoryStats(**summary)
@@ -0,0 +1,281 @@
+"""
+Minimal Prometheus text-format metrics.
+
+Label children are created once and reused, so recording a sample on the hot
+path is a dict lookup, a lock and a few float additions. ``render_metrics``
+produces the exposition served by ``GET /metrics``.
+"""
+import bisect
+import math
+import time
+from threading import Lock
+from typing import Dict, Iterable, Sequence
+
+# Seconds; spans sub-millisecond DB queries up to multi-minute video downloads.
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple[str, ...], object] = {}
+        self._lock = Lock()
+        self._default = None if self.labelnames else self._new_child()
+        _registry.append(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Return the child for these label values (strings), creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> Iterable[tuple[tuple[str, ...], object]]:
+        if self._default is not None:
+            yield (), self._default
+        with self._lock:
+            children = list(self._children.items())
+        yield from children
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._samples():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def _render_child(self, values: tuple[str, ...], child: _CounterChild) -> list[str]:
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}_total{labels} {_format_value(child.value)}"]
+
+
+class _Timer:
+    __slots__ = ("_child", "_started")
+
+    def __init__(self, child: "_HistogramChild") -> None:
+        self._child = child
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._child.observe(time.perf_counter() - self._started)
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Sequence[float]) -> None:
+        self._lock = Lock()
+        self._upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.upper_bounds = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _render_child(self, values: tuple[str, ...], child: _HistogramChild) -> list[str]:
+        with child._lock:
+            counts = list(child.counts)
+            total, count = child.sum, child.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.upper_bounds + (math.inf,), counts):
+            cumulative += bucket_count
+            le = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    lines: list[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ----- Stage latency histograms -----
+IMAGE_DOWNLOAD_SECONDS = Histogram(
+    "hacktruth_image_download_seconds", "Time to fetch a remote image for verification."
+)
+DEEPFAKE_INFERENCE_SECONDS = Histogram(
+    "hacktruth_deepfake_inference_seconds", "SigLIP deepfake detector preprocessing plus forward pass."
+)
+GEMINI_REQUEST_SECONDS = Histogram(
+    "hacktruth_gemini_request_seconds",
+    "Latency of one Gemini generate_content call.",
+    ("model", "key"),
+)
+YTDLP_DOWNLOAD_SECONDS = Histogram(
+    "hacktruth_ytdlp_download_seconds", "yt-dlp download time per media stream.", ("stream",)
+)
+FRAME_SAMPLING_SECONDS = Histogram(
+    "hacktruth_frame_sampling_seconds", "Decoding one window of sampled video frames."
+)
+FFT_SECONDS = Histogram("hacktruth_fft_seconds", "FFT artifact scoring for one frame window.")
+OPTICAL_FLOW_SECONDS = Histogram(
+    "hacktruth_optical_flow_seconds", "Optical flow scoring for one frame window.", ("mode",)
+)
+WHISPER_SECONDS = Histogram("hacktruth_whisper_seconds", "Whisper transcription of one media file.")
+DB_ACQUIRE_SECONDS = Histogram(
+    "hacktruth_db_acquire_seconds", "Waiting for a pooled PostgreSQL connection.", ("operation",)
+)
+DB_QUERY_SECONDS = Histogram(
+    "hacktruth_db_query_seconds", "Time a PostgreSQL connection is held per operation.", ("operation",)
+)
+SEMANTIC_EMBED_SECONDS = Histogram(
+    "hacktruth_semantic_embed_seconds", "Sentence embedding of texts for the semantic verdict cache."
+)
+IMAGE_NORMALIZE_SECONDS = Histogram(
+    "hacktruth_image_normalize_seconds", "Downscaling and re-encoding an image before a Gemini upload."
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "hacktruth_pipeline_stage_seconds", "Analyzer stage run time in the video pipeline.", ("stage", "cached")
+)
+
+# ----- Event counters -----
+CACHE_EVENTS = Counter(
+    "hacktruth_cache_events", "Cache lookups by cache and outcome (hit/miss).", ("cache", "result")
+)
+GEMINI_RETRIES = Counter(
+    "hacktruth_gemini_retries", "Gemini attempts that failed and were retried or given up.", ("endpoint",)
+)
+GEMINI_BLOCKS = Counter(
+    "hacktruth_gemini_blocks", "Requests refused by Gemini safety filters.", ("endpoint",)
+)
+LOG_RECORDS_DROPPED = Counter(
+    "hacktruth_log_records_dropped", "Log records discarded because the logging queue was full."
+)
+SINGLE_FLIGHT_JOINS = Counter(
+    "hacktruth_single_flight_joins", "Requests that joined an in-flight identical analysis.", ("endpoint",)
+)
+IDEMPOTENCY_REQUESTS = Counter(
+    "hacktruth_idempotency_requests",
+    "Requests carrying an Idempotency-Key by outcome (executed, replayed, joined, in_progress, mismatch).",
+    ("outcome",),
+)
+GEMINI_TOKENS = Counter(
+    "hacktruth_gemini_tokens", "Gemini tokens billed by endpoint and kind.", ("endpoint", "kind")
+)
+GEMINI_THINKING_DEGRADED = Counter(
+    "hacktruth_gemini_thinking_degraded",
+    "Gemini calls sent with a reduced thinking budget because of load or latency.",
+    ("endpoint", "level"),
+)
+PRESCREEN_DECISIONS = Counter(
+    "hacktruth_prescreen_decisions",
+    "Text verification requests by pre-screen outcome (gemini = passed through).",
+    ("decision",),
+)
+PRESCREEN_AUDITS = Counter(
+    "hacktruth_prescreen_audits",
+    "Pre-screened requests re-checked with Gemini, by reason and outcome.",
+    ("reason", "outcome"),
+)
+GEMINI_IMAGE_BATCHES = Counter(
+    "hacktruth_gemini_image_batches",
+    "Multi-image Gemini calls by outcome (packed, fallback to single-image calls, or failed).",
+    ("outcome",),
+)
+GEMINI_IMAGE_BYTES = Counter(
+    "hacktruth_gemini_image_bytes",
+    "Image bytes bound for Gemini before (original) and after (sent) normalization.",
+    ("stage",),
+)
+
+
+def cache_event(cache: str, hit: bool) -> None:
+    CACHE_EVENTS.labels(cache, "hit" if hit else "miss").inc()
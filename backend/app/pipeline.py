@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .db import fetch_stage_result, upsert_stage_result
+from .metrics import PIPELINE_STAGE_SECONDS, cache_event
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One analyzer in a pipeline. ``inputs`` name other stages or seed values
+    passed to ``run_pipeline``; the function receives them as keyword
+    arguments. Stages with ``cache=True`` store their JSON-encoded output per
+    ``version``, so bumping the version re-runs only that analyzer.
+    """
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    version: str = "1"
+    blocking: bool = False
+    cache: bool = False
+    encode: Callable[[Any], Any] = _identity
+    decode: Callable[[Any], Any] = _identity
+
+    async def invoke(self, kwargs: Dict[str, Any]) -> Any:
+        if self.blocking:
+            return await asyncio.to_thread(self.func, **kwargs)
+        return await self.func(**kwargs)
+
+
+class StageRegistry:
+    """Named collection of stages; analyzers register themselves with ``@registry.stage``."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._stages: Dict[str, Stage] = {}
+
+    def register(self, stage: Stage) -> Stage:
+        if stage.name in self._stages:
+            raise ValueError(f"Stage '{stage.name}' is already registered in '{self.name}'")
+        self._stages[stage.name] = stage
+        return stage
+
+    def stage(
+        self,
+        name: str,
+        *,
+        inputs: Iterable[str] = (),
+        version: str = "1",
+        blocking: bool = False,
+        cache: bool = False,
+        encode: Callable[[Any], Any] = _identity,
+        decode: Callable[[Any], Any] = _identity,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.register(
+                Stage(
+                    name=name,
+                    func=func,
+                    inputs=tuple(inputs),
+                    version=version,
+                    blocking=blocking,
+                    cache=cache,
+                    encode=encode,
+                    decode=decode,
+                )
+            )
+            return func
+
+        return decorator
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+
+    def __getitem__(self, name: str) -> Stage:
+        return self._stages[name]
+
+    def names(self) -> list[str]:
+        return list(self._stages)
+
+    def validate(self, targets: Iterable[str], provided: Iterable[str]) -> None:
+        """Raise if a target depends on an unknown name or on itself."""
+        available = set(provided)
+        done: set[str] = set()
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if name in available or name in done:
+                return
+            if name in path:
+                raise ValueError(f"Stage cycle in '{self.name}': {' -> '.join(path + (name,))}")
+            if name not in self._stages:
+                raise KeyError(f"'{name}' is neither a stage in '{self.name}' nor a provided input")
+            for dependency in self._stages[name].inputs:
+                visit(dependency, path + (name,))
+            done.add(name)
+
+        for target in targets:
+            visit(target, ())
+
+
+class StageResultStore:
+    """Persists cacheable stage outputs for one subject (e.g. a video ID)."""
+
+    async def load(self, stage: str, version: str) -> Optional[Any]:
+        return None
+
+    async def save(self, stage: str, version: str, value: Any, seconds: float) -> None:
+        return None
+
+
+class VideoStageStore(StageResultStore):
+    """Stage outputs in ``video_stage_results`` keyed by (video_id, stage, version)."""
+
+    def __init__(self, video_id: Optional[str]) -> None:
+        self.video_id = video_id
+
+    async def load(self, stage: str, version: str) -> Optional[Any]:
+        if not self.video_id:
+            return None
+        return await fetch_stage_result(self.video_id, stage, version)
+
+    async def save(self, stage: str, version: str, value: Any, seconds: float) -> None:
+        if not self.video_id:
+            return
+        await upsert_stage_result(
+            video_id=self.video_id,
+            stage=stage,
+            version=version,
+            result=value,
+            seconds=seconds,
+        )
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    seconds: float
+    cached: bool
+    version: str
+
+
+@dataclass(frozen=True)
+class PipelineRun:
+    results: Dict[str, Any]
+    timings: Dict[str, StageTiming]
+
+
+async def run_pipeline(
+    registry: StageRegistry,
+    targets: Iterable[str],
+    inputs: Dict[str, Any],
+    *,
+    store: Optional[StageResultStore] = None,
+) -> PipelineRun:
+    """
+    Run ``targets`` and whatever they depend on. Each stage starts as soon as
+    its inputs resolve, so independent stages run concurrently. Inputs that
+    are already present (seed values or precomputed results) are never
+    re-run, and a stored result for a cacheable stage short-circuits it before
+    its own dependencies are started. The first failure cancels the rest.
+    """
+    targets = list(targets)
+    registry.validate(targets, inputs)
+
+    results: Dict[str, Any] = dict(inputs)
+    timings: Dict[str, StageTiming] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def resolve(name: str) -> Any:
+        if name in results:
+            return results[name]
+        task = tasks.get(name)
+        if task is None:
+            task = tasks[name] = asyncio.create_task(run_stage(registry[name]))
+        return await task
+
+    async def run_stage(stage: Stage) -> Any:
+        started = time.perf_counter()
+        if stage.cache and store is not None:
+            try:
+                stored = await store.load(stage.name, stage.version)
+            except Exception:
+                logger.exception("Failed to load cached result for stage %s", stage.name)
+                stored = None
+            cache_event("stage_result", stored is not None)
+            if stored is not None:
+                value = stage.decode(stored)
+                seconds = time.perf_counter() - started
+                results[stage.name] = value
+                timings[stage.name] = StageTiming(seconds, True, stage.version)
+                PIPELINE_STAGE_SECONDS.labels(stage.name, "true").observe(seconds)
+                return value
+
+        values = await asyncio.gather(*(resolve(dependency) for dependency in stage.inputs))
+        started = time.perf_counter()
+        with span(f"stage.{stage.name}", **{"stage.version": stage.version}):
+            value = await stage.invoke(dict(zip(stage.inputs, values)))
+        seconds = time.perf_counter() - started
+        results[stage.name] = value
+        timings[stage.name] = StageTiming(seconds, False, stage.version)
+        PIPELINE_STAGE_SECONDS.labels(stage.name, "false").observe(seconds)
+
+        if stage.cache and store is not None:
+            try:
+                await store.save(stage.name, stage.version, stage.encode(value), seconds)
+            except Exception:
+                logger.exception("Failed to store result for stage %s", stage.name)
+        return value
+
+    with span(f"pipeline.{registry.name}", **{"pipeline.targets": ",".join(targets)}):
+        try:
+            await asyncio.gather(*(resolve(target) for target in targets))
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+    logger.debug(
+        "Pipeline %s finished: %s",
+        registry.name,
+        ", ".join(
+            f"{name}={timing.seconds:.3f}s{' (cached)' if timing.cached else ''}"
+            for name, timing in timings.items()
+        ),
+    )
+    return PipelineRun(results=results, timings=timings)
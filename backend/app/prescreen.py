@@ -0,0 +1,279 @@
+"""
+Local pre-screen in front of ``GeminiVerifier.verify`` for ``/verify/text``.
+
+Cheap CPU heuristics answer three kinds of input without a Gemini call:
+
+* ``non_claim`` - no predicate at all: empty, punctuation/emoji only, a
+  single token, or only a few characters. Korean is dense, so anything with
+  two or more words (e.g. "지구는 둥글다") still goes to Gemini. Questions are
+  not skipped either: users often phrase the claim they want checked as one.
+* ``opinion`` - short statements with an explicit first-person marker or an
+  evaluative sentence ending ("최고다", "것 같다") and no factual markers
+  (numbers, dates, attributions). Bare words such as 최고 or 좋아 are not
+  enough; they also occur in factual text ("최고치", "좋아졌다").
+* ``duplicate`` - near-duplicates of a recently verified text, measured as
+  Jaccard similarity of character shingles, reuse that verdict, but only when
+  both carry the same numbers and negations (``claim_anchors``): a paragraph
+  that changes "3.50%로 동결" to "3.25%로 인하" still scores ~0.9.
+
+Laughter and crying runs (ㅋㅋ, ㅎㅎ, ㅠㅠ) are stripped before classifying,
+so "지구는 평평하다 ㅋㅋ" is judged on its claim and bare laughter is a
+non-claim.
+
+A sampled fraction of screened requests is still sent to Gemini in the
+background (``PRESCREEN_AUDIT_RATE``) and compared, which gives the false-skip
+rate reported by ``/stats/prescreen`` next to the hit rate.
+"""
+import os
+import random
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Deque, Dict, Optional
+from uuid import UUID
+
+from .metrics import PRESCREEN_AUDITS, PRESCREEN_DECISIONS
+from .schemas import VerificationResult
+from .text_cache import claim_anchors, normalize_text
+
+PRESCREEN_ENABLED = os.environ.get("PRESCREEN_ENABLED", "true").lower() == "true"
+PRESCREEN_MIN_CHARS = max(0, int(os.environ.get("PRESCREEN_MIN_CHARS", "4")))
+# Opinion detection only applies to short inputs; longer texts usually carry a claim.
+PRESCREEN_OPINION_MAX_CHARS = max(0, int(os.environ.get("PRESCREEN_OPINION_MAX_CHARS", "160")))
+PRESCREEN_SHINGLE_SIZE = max(2, int(os.environ.get("PRESCREEN_SHINGLE_SIZE", "5")))
+PRESCREEN_DUPLICATE_THRESHOLD = min(1.0, max(0.5, float(os.environ.get("PRESCREEN_DUPLICATE_THRESHOLD", "0.9"))))
+PRESCREEN_RECENT_SIZE = max(1, int(os.environ.get("PRESCREEN_RECENT_SIZE", "512")))
+PRESCREEN_AUDIT_RATE = min(1.0, max(0.0, float(os.environ.get("PRESCREEN_AUDIT_RATE", "0.05"))))
+# An audited duplicate counts as a false skip when accuracies differ by more than this.
+PRESCREEN_AUDIT_TOLERANCE = max(0, int(os.environ.get("PRESCREEN_AUDIT_TOLERANCE", "15")))
+
+_WORD_RE = re.compile(r"\w+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_ACCURACY_RE = re.compile(r"^\s*(\d{1,3})")
+_FACT_MARKERS_RE = re.compile(
+    r"\d|%|according to|reported|announced|said|에 따르면|발표|밝혔|보도|통계|조사|기록",
+    re.IGNORECASE,
+)
+# Korean markers are anchored to a first-person subject or to the sentence
+# ending; bare 최고/좋아 also appear in factual text ("최고치", "좋아졌다").
+_OPINION_MARKERS_RE = re.compile(
+    r"\b(i think|i feel|i believe|in my opinion|imo|i love|i hate|i like)\b"
+    r"|(?:^|\s)(나는|난|내가|저는|제가)\s.*(생각|느낌|좋아|싫어)"
+    r"|(?:^|\s)(내|제) 생각(에|엔|으로는)"
+    r"|것 같(다|아|아요|네|습니다)[.!?~\s]*$"
+    r"|(최고|최악|대박|짱|별로)(다|야|이다|예요|이에요|임|네)?[.!?~\s]*$"
+    r"|(좋아|싫어)(해|해요|요)?[.!?~\s]*$",
+    re.IGNORECASE,
+)
+# normalize_text applies NFKC, which maps compatibility jamo (ㅋ U+314B) to
+# conjoining jamo (ᄏ U+110F), so the pattern is built from the NFKC forms.
+_LAUGHTER_RE = re.compile(
+    "[{}]{{2,}}".format(re.escape(unicodedata.normalize("NFKC", "ㅋㅎㅠㅜ")))
+)
+
+
+@dataclass(frozen=True)
+class PrescreenDecision:
+    reason: str
+    result: VerificationResult
+    raw_response: Optional[str] = None
+    source_record_id: Optional[UUID] = None
+    similarity: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class _RecentVerdict:
+    shingles: frozenset
+    length: int
+    anchors: frozenset
+    result: VerificationResult
+    raw_response: Optional[str]
+    record_id: Optional[UUID]
+
+
+def screen_form(text: str) -> str:
+    """``normalize_text`` without laughter/crying runs, which carry no claim."""
+    return _WHITESPACE_RE.sub(" ", _LAUGHTER_RE.sub(" ", normalize_text(text))).strip()
+
+
+def shingles(normalized: str, size: int = PRESCREEN_SHINGLE_SIZE) -> frozenset:
+    """Character n-grams of whitespace-free text; robust to Korean spacing variants."""
+    compact = normalized.replace(" ", "")
+    if len(compact) <= size:
+        return frozenset((compact,)) if compact else frozenset()
+    return frozenset(compact[i:i + size] for i in range(len(compact) - size + 1))
+
+
+def jaccard(left: frozenset, right: frozenset) -> float:
+    if not left or not right:
+        return 0.0
+    intersection = len(left & right)
+    return intersection / (len(left) + len(right) - intersection)
+
+
+def accuracy_percent(value: Optional[str]) -> Optional[int]:
+    match = _ACCURACY_RE.match(value or "")
+    return min(100, int(match.group(1))) if match else None
+
+
+def _skip_result(reason: str, explanation: str) -> VerificationResult:
+    return VerificationResult(
+        accuracy="0%",
+        accuracy_reason=explanation,
+        reason=reason,
+        urls=[],
+    )
+
+
+class Prescreener:
+    """Heuristic first tier of the text cascade plus its hit/false-skip bookkeeping."""
+
+    def __init__(
+        self,
+        *,
+        recent_size: int = PRESCREEN_RECENT_SIZE,
+        duplicate_threshold: float = PRESCREEN_DUPLICATE_THRESHOLD,
+        audit_rate: float = PRESCREEN_AUDIT_RATE,
+    ) -> None:
+        self._recent: Deque[_RecentVerdict] = deque(maxlen=recent_size)
+        self._duplicate_threshold = duplicate_threshold
+        self._audit_rate = audit_rate
+        self._lock = Lock()
+        self._requests = 0
+        self._screened: Dict[str, int] = {}
+        self._audited: Dict[str, int] = {}
+        self._false_skips: Dict[str, int] = {}
+
+    def screen(self, text: str) -> Optional[PrescreenDecision]:
+        """Return a local verdict, or None when the text should go to Gemini."""
+        normalized = screen_form(text)
+        decision = self._classify(normalized)
+        with self._lock:
+            self._requests += 1
+            if decision is not None:
+                self._screened[decision.reason] = self._screened.get(decision.reason, 0) + 1
+        PRESCREEN_DECISIONS.labels(decision.reason if decision else "gemini").inc()
+        return decision
+
+    def _classify(self, normalized: str) -> Optional[PrescreenDecision]:
+        words = _WORD_RE.findall(normalized)
+        if len(words) < 2 or len("".join(words)) < PRESCREEN_MIN_CHARS:
+            return PrescreenDecision(
+                "non_claim",
+                _skip_result(
+                    "입력이 너무 짧아 검증할 수 있는 사실 주장을 찾을 수 없습니다.",
+                    "검증 가능한 사실 주장이 없어 0%로 판정했습니다.",
+                ),
+            )
+
+        if (
+            len(normalized) <= PRESCREEN_OPINION_MAX_CHARS
+            and _OPINION_MARKERS_RE.search(normalized)
+            and not _FACT_MARKERS_RE.search(normalized)
+        ):
+            return PrescreenDecision(
+                "opinion",
+                _skip_result(
+                    "개인적인 의견이나 감상으로 보여 사실 여부를 검증할 수 없습니다.",
+                    "의견·평가 표현만 있고 검증 가능한 사실 주장이 없어 0%로 판정했습니다.",
+                ),
+            )
+
+        return self._find_duplicate(normalized)
+
+    def _find_duplicate(self, normalized: str) -> Optional[PrescreenDecision]:
+        candidate = shingles(normalized)
+        if not candidate:
+            return None
+        anchors = claim_anchors(normalized)
+        size = len(candidate)
+        with self._lock:
+            recent = list(self._recent)
+        best: Optional[_RecentVerdict] = None
+        best_score = 0.0
+        for entry in reversed(recent):
+            # Jaccard can't reach the threshold when the set sizes differ too much.
+            if min(size, entry.length) < self._duplicate_threshold * max(size, entry.length):
+                continue
+            # A changed number or negation flips the claim however similar the rest is.
+            if entry.anchors != anchors:
+                continue
+            score = jaccard(candidate, entry.shingles)
+            if score > best_score:
+                best, best_score = entry, score
+        if best is None or best_score < self._duplicate_threshold:
+            return None
+        return PrescreenDecision(
+            "duplicate",
+            best.result,
+            raw_response=best.raw_response,
+            source_record_id=best.record_id,
+            similarity=round(best_score, 4),
+        )
+
+    def remember(
+        self,
+        text: str,
+        result: VerificationResult,
+        raw_response: Optional[str],
+        record_id: Optional[UUID],
+    ) -> None:
+        """Add a Gemini-verified text to the near-duplicate window."""
+        normalized = screen_form(text)
+        grams = shingles(normalized)
+        if not grams:
+            return
+        entry = _RecentVerdict(grams, len(grams), claim_anchors(normalized), result, raw_response, record_id)
+        with self._lock:
+            self._recent.append(entry)
+
+    def should_audit(self) -> bool:
+        return self._audit_rate > 0 and random.random() < self._audit_rate
+
+    def record_audit(self, decision: PrescreenDecision, gemini_result: VerificationResult) -> bool:
+        """Compare an audited skip with Gemini's verdict; returns True for a false skip."""
+        local = accuracy_percent(decision.result.accuracy)
+        remote = accuracy_percent(gemini_result.accuracy)
+        if decision.reason == "duplicate":
+            false_skip = local is None or remote is None or abs(local - remote) > PRESCREEN_AUDIT_TOLERANCE
+        else:
+            # Gemini scores claim-free text as 0% without sources.
+            false_skip = bool(remote) or bool(gemini_result.urls)
+        with self._lock:
+            self._audited[decision.reason] = self._audited.get(decision.reason, 0) + 1
+            if false_skip:
+                self._false_skips[decision.reason] = self._false_skips.get(decision.reason, 0) + 1
+        PRESCREEN_AUDITS.labels(decision.reason, "false_skip" if false_skip else "agree").inc()
+        return false_skip
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self._requests
+            screened = dict(self._screened)
+            audited = dict(self._audited)
+            false_skips = dict(self._false_skips)
+        total_screened = sum(screened.values())
+        total_audited = sum(audited.values())
+        total_false = sum(false_skips.values())
+        return {
+            "enabled": PRESCREEN_ENABLED,
+            "requests": requests,
+            "screened": total_screened,
+            "hit_rate": round(total_screened / requests, 4) if requests else 0.0,
+            "by_reason": screened,
+            "audited": total_audited,
+            "false_skips": total_false,
+            "false_skip_rate": round(total_false / total_audited, 4) if total_audited else None,
+            "false_skips_by_reason": false_skips,
+            "audit_rate": self._audit_rate,
+            "recent_window": len(self._recent),
+        }
+
+
+_prescreener = Prescreener()
+
+
+def get_prescreener() -> Prescreener:
+    return _prescreener
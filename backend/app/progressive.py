@@ -0,0 +1,287 @@
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Optional
+
+import numpy as np
+
+from .check_video import (
+    AUDIO_STREAM_PLAN,
+    VIDEO_STREAM_PLAN,
+    FrameAnalysis,
+    FrameScoreAccumulator,
+    MediaStreamPlan,
+    TranscriptionResult,
+    VideoDownloadResult,
+    canonicalize_youtube_url,
+    download_executor,
+    download_stream,
+    fetch_video_info,
+    find_cached_media,
+    plan_frame_windows,
+    resolve_cookie_path,
+    select_stream_format,
+    transcribe_audio_samples,
+)
+from .tracing import submit_with_context
+from .video_decoder import FFMPEG_BINARY, VIDEO_DECODE_THREADS
+
+logger = logging.getLogger(__name__)
+
+VIDEO_PROGRESSIVE_PIPELINE = (
+    os.environ.get("VIDEO_PROGRESSIVE_PIPELINE", "true").lower() == "true"
+)
+_POLL_INTERVAL = 0.05
+_READ_CHUNK = 1 << 16
+_WHISPER_SAMPLE_RATE = 16000
+_STREAMABLE_PROTOCOLS = {"http", "https"}
+
+_consumer_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="progressive")
+
+
+@dataclass(frozen=True)
+class ProgressiveAnalysis:
+    download: VideoDownloadResult
+    frames: Optional[FrameAnalysis]
+    transcription: Optional[TranscriptionResult]
+
+
+def progressive_pipeline_available() -> bool:
+    return VIDEO_PROGRESSIVE_PIPELINE and shutil.which(FFMPEG_BINARY) is not None
+
+
+def _pump_growing_file(final_path: Path, download: Future, sink: IO[bytes]) -> None:
+    """
+    Copy a file that yt-dlp is still writing (``<name>.part``) into ``sink``,
+    following it until the download finishes. The open descriptor survives
+    yt-dlp's rename of the ``.part`` file to its final name.
+    """
+    partial_path = Path(f"{final_path}.part")
+    handle = None
+    try:
+        while handle is None:
+            for candidate in (partial_path, final_path):
+                try:
+                    handle = open(candidate, "rb")
+                    break
+                except FileNotFoundError:
+                    continue
+            if handle is None:
+                if download.done():
+                    return
+                time.sleep(_POLL_INTERVAL)
+
+        while True:
+            chunk = handle.read(_READ_CHUNK)
+            if chunk:
+                sink.write(chunk)
+                continue
+            if download.done():
+                # Drain anything written between the last read and completion.
+                rest = handle.read()
+                if rest:
+                    sink.write(rest)
+                return
+            time.sleep(_POLL_INTERVAL)
+    except (BrokenPipeError, ValueError):
+        # The consumer stopped early (e.g. frame scores converged).
+        pass
+    finally:
+        if handle is not None:
+            handle.close()
+        try:
+            sink.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+
+def _spawn_ffmpeg(args: list[str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [FFMPEG_BINARY, "-v", "error", "-threads", str(VIDEO_DECODE_THREADS), "-i", "pipe:0", *args],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _select_expression(windows: list[list[int]]) -> str:
+    terms = []
+    for window in windows:
+        start, end = window[0], window[-1]
+        stride = window[1] - window[0] if len(window) > 1 else 1
+        terms.append(f"between(n\\,{start}\\,{end})*not(mod(n-{start}\\,{stride}))")
+    return "+".join(terms)
+
+
+def _consume_video(
+    selected: dict[str, Any],
+    final_path: Path,
+    download: Future,
+    duration: Optional[float],
+    sample_rate: int,
+) -> Optional[FrameAnalysis]:
+    width = int(selected.get("width") or 0)
+    height = int(selected.get("height") or 0)
+    fps = float(selected.get("fps") or 0.0)
+    if not (width and height and fps and duration):
+        logger.debug("Stream metadata incomplete; skipping progressive frame sampling")
+        return None
+
+    # Timeline order: frames arrive in file order while the download grows.
+    windows = sorted(plan_frame_windows(int(duration * fps), sample_rate), key=lambda w: w[0])
+    if not windows:
+        return None
+
+    process = _spawn_ffmpeg(
+        [
+            "-an",
+            "-vf", f"select='{_select_expression(windows)}',scale={width}:{height},format=gray",
+            "-vsync", "0",
+            "-f", "rawvideo",
+            "-pix_fmt", "gray",
+            "pipe:1",
+        ]
+    )
+    pump = threading.Thread(
+        target=_pump_growing_file,
+        args=(final_path, download, process.stdin),
+        daemon=True,
+    )
+    pump.start()
+
+    frame_size = width * height
+    accumulator = FrameScoreAccumulator(source_width=width, early_exit=len(windows) > 1)
+    try:
+        for window in windows:
+            buffer = process.stdout.read(frame_size * len(window))
+            available = len(buffer) // frame_size
+            if not available:
+                break
+            block = np.frombuffer(buffer, dtype=np.uint8, count=available * frame_size)
+            block = block.reshape(available, height, width)
+            if accumulator.add_window([block[i] for i in range(available)]):
+                break
+            if available < len(window):
+                break
+    finally:
+        process.stdout.close()
+        process.kill()
+        process.wait()
+        pump.join()
+
+    return accumulator.result() if accumulator.frames_analyzed else None
+
+
+def _consume_audio(final_path: Path, download: Future) -> Optional[TranscriptionResult]:
+    process = _spawn_ffmpeg(
+        ["-vn", "-ac", "1", "-ar", str(_WHISPER_SAMPLE_RATE), "-f", "s16le", "pipe:1"]
+    )
+    pump = threading.Thread(
+        target=_pump_growing_file,
+        args=(final_path, download, process.stdin),
+        daemon=True,
+    )
+    pump.start()
+    pcm = process.stdout.read()
+    process.wait()
+    pump.join()
+
+    if process.returncode != 0 or not pcm:
+        return None
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    return transcribe_audio_samples(samples)
+
+
+def _guard(consumer: Callable[..., Any], *args: Any) -> Any:
+    try:
+        return consumer(*args)
+    except Exception:  # noqa: BLE001 - fall back to the file-based path
+        logger.exception("Progressive %s consumer failed; falling back to file analysis", consumer.__name__)
+        return None
+
+
+def run_progressive_analysis(
+    url: str,
+    cookies_path: str,
+    sample_rate: int,
+) -> Optional[ProgressiveAnalysis]:
+    """
+    Download the video and audio streams while ffmpeg consumes the growing
+    files, so frame scoring and audio decoding overlap the network transfer.
+
+    Returns None when nothing needs downloading or a stream cannot be read
+    progressively (non-HTTP protocols, merged formats); the caller then uses
+    the regular download-then-analyse path. Either result may be None if a
+    consumer fails, in which case the caller analyses the finished file.
+    """
+    normalized_url, parsed_video_id = canonicalize_youtube_url(url)
+    target_url = normalized_url or url
+    cookie_file = resolve_cookie_path(cookies_path)
+    plans: list[MediaStreamPlan] = [VIDEO_STREAM_PLAN, AUDIO_STREAM_PLAN]
+
+    def _fully_cached(candidate_id: str) -> bool:
+        return all(find_cached_media(candidate_id, plan) is not None for plan in plans)
+
+    if parsed_video_id and _fully_cached(parsed_video_id):
+        return None
+
+    info = fetch_video_info(target_url, parsed_video_id, cookie_file)
+    video_id = info.get("id") or parsed_video_id
+    if not video_id or _fully_cached(video_id):
+        return None
+
+    selections: dict[str, tuple[dict[str, Any], Path]] = {}
+    for plan in plans:
+        if find_cached_media(video_id, plan) is not None:
+            continue
+        selected, final_path = select_stream_format(info, plan, cookie_file)
+        if selected.get("requested_formats") or selected.get("protocol") not in _STREAMABLE_PROTOCOLS:
+            logger.debug("Format for %s stream is not progressively readable", plan.kind)
+            return None
+        selections[plan.kind] = (selected, final_path)
+
+    downloads: dict[str, Future] = {
+        plan.kind: submit_with_context(download_executor, download_stream, info, video_id, plan, cookie_file)
+        for plan in plans
+        if plan.kind in selections
+    }
+
+    consumers: dict[str, Future] = {}
+    if "video" in selections:
+        selected, final_path = selections["video"]
+        consumers["video"] = submit_with_context(
+            _consumer_executor,
+            _guard, _consume_video, selected, final_path, downloads["video"], info.get("duration"), sample_rate
+        )
+    if "audio" in selections:
+        _, final_path = selections["audio"]
+        consumers["audio"] = submit_with_context(
+            _consumer_executor,
+            _guard, _consume_audio, final_path, downloads["audio"]
+        )
+
+    # Surface download failures to the caller exactly like download_youtube_video.
+    paths = {kind: future.result() for kind, future in downloads.items()}
+    for plan in plans:
+        if plan.kind not in paths:
+            paths[plan.kind] = find_cached_media(video_id, plan)
+
+    return ProgressiveAnalysis(
+        download=VideoDownloadResult(
+            original_url=url,
+            url=normalized_url or url,
+            path=paths.get("video"),
+            video_id=video_id,
+            title=info.get("title"),
+            duration=info.get("duration"),
+            audio_path=paths.get("audio"),
+        ),
+        frames=consumers["video"].result() if "video" in consumers else None,
+        transcription=consumers["audio"].result() if "audio" in consumers else None,
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -29,6 +29,25 @@ class VerificationResult(BaseModel):
     )
 
 
+class GeminiUsageSummary(BaseModel):
+    """Gemini token usage summed over every call made for one request."""
+    calls: int = Field(..., description="Gemini generate_content 호출 횟수.")
+    prompt_tokens: int = Field(default=0, description="입력 프롬프트 토큰 수.")
+    cached_tokens: int = Field(default=0, description="입력 중 컨텍스트 캐시에서 읽은 토큰 수 (prompt_tokens에 포함).")
+    candidates_tokens: int = Field(default=0, description="응답 생성 토큰 수.")
+    thoughts_tokens: int = Field(default=0, description="thinking(추론) 토큰 수.")
+    tool_use_prompt_tokens: int = Field(default=0, description="검색 등 도구 결과로 추가된 입력 토큰 수.")
+    total_tokens: int = Field(default=0, description="전체 토큰 수.")
+    thinking_budgets: List[Optional[int]] = Field(
+        default_factory=list,
+        description="호출에 적용된 thinking budget 값들 (-1은 동적, null은 모델 기본값).",
+    )
+    cost_usd: Optional[float] = Field(
+        default=None,
+        description="설정된 토큰 단가로 추정한 비용(USD). 단가 미설정 시 null.",
+    )
+
+
 class VerificationResponse(BaseModel):
     """HTTP response returned to the frontend."""
     result: VerificationResult
@@ -40,6 +59,18 @@ class VerificationResponse(BaseModel):
         default=None,
         description="Raw JSON string returned by model, preserved for debugging.",
     )
+    gemini_usage: Optional[GeminiUsageSummary] = Field(
+        default=None,
+        description="Gemini token usage for this request.",
+    )
+    prescreen: Optional[str] = Field(
+        default=None,
+        description="Local pre-screen that answered without Gemini (non_claim, opinion, duplicate); null when Gemini verified.",
+    )
+    cached_from: Optional[UUID] = Field(
+        default=None,
+        description="record_id of the earlier verification whose verdict was reused for a near-duplicate text.",
+    )
 
 
 class VerificationRecordDetail(BaseModel):
@@ -93,6 +124,32 @@ class ImageVerificationResponse(BaseModel):
     result: ImageVerificationResult
 
 
+class ImageBatchVerificationRequest(BaseModel):
+    """여러 이미지 URL을 한 번에 판별하는 요청."""
+
+    image_urls: List[HttpUrl] = Field(
+        ...,
+        min_length=1,
+        description="확인할 이미지 절대 URL 목록. 중복 URL은 한 번만 내려받아 판별한다.",
+    )
+
+
+class ImageBatchItem(BaseModel):
+    """배치 요청 안의 이미지 한 건의 결과. 실패한 이미지는 error와 status_code를 채운다."""
+
+    image_url: str = Field(..., description="요청에 포함된 이미지 URL.")
+    status_code: int = Field(..., description="단건 요청이었다면 반환됐을 HTTP 상태 코드.")
+    result: Optional[ImageVerificationResult] = None
+    error: Optional[str] = Field(default=None, description="실패 사유 (한국어).")
+
+
+class ImageBatchVerificationResponse(BaseModel):
+    results: List[ImageBatchItem] = Field(
+        default_factory=list,
+        description="요청한 URL 순서대로 정렬된 결과.",
+    )
+
+
 class GeminiImageVerdict(BaseModel):
     fake: str = Field(
         ...,
@@ -104,31 +161,102 @@ class GeminiImageVerdict(BaseModel):
     )
 
 
+class ImageNormalizationSummary(BaseModel):
+    """Gemini 업로드 전 이미지 축소·재인코딩 결과."""
+    applied: bool = Field(..., description="재인코딩한 이미지를 보냈는지 여부. false면 원본을 그대로 보냈다.")
+    original_bytes: int = Field(..., description="내려받은 원본 이미지 크기(바이트).")
+    sent_bytes: int = Field(..., description="Gemini로 보낸 이미지 크기(바이트).")
+    original_size: Optional[List[int]] = Field(default=None, description="원본 [가로, 세로] 픽셀.")
+    sent_size: Optional[List[int]] = Field(default=None, description="보낸 이미지 [가로, 세로] 픽셀.")
+    duration_ms: float = Field(..., description="축소·재인코딩에 걸린 시간(ms).")
+
+
 class GeminiImageVerificationResponse(BaseModel):
     result: GeminiImageVerdict
     raw_model_response: Optional[str] = Field(
         default=None,
         description="Gemini가 반환한 원본 JSON 문자열 (디버깅용).",
     )
+    gemini_usage: Optional[GeminiUsageSummary] = Field(
+        default=None,
+        description="이 요청에서 사용한 Gemini 토큰 집계.",
+    )
+    image_normalization: Optional[ImageNormalizationSummary] = Field(
+        default=None,
+        description="업로드 전 이미지 축소 결과. normalize=false로 요청하면 null.",
+    )
+
+
+class GeminiImageBatchItem(BaseModel):
+    """Gemini 배치 판별 요청 안의 이미지 한 건의 결과."""
+
+    image_url: str = Field(..., description="요청에 포함된 이미지 URL.")
+    status_code: int = Field(..., description="단건 요청이었다면 반환됐을 HTTP 상태 코드.")
+    result: Optional[GeminiImageVerdict] = None
+    raw_model_response: Optional[str] = Field(
+        default=None,
+        description="이 이미지에 대한 Gemini 판정 JSON 문자열 (디버깅용).",
+    )
+    image_normalization: Optional[ImageNormalizationSummary] = None
+    error: Optional[str] = Field(default=None, description="실패 사유 (한국어).")
+
+
+class GeminiImageBatchVerificationResponse(BaseModel):
+    results: List[GeminiImageBatchItem] = Field(
+        default_factory=list,
+        description="요청한 URL 순서대로 정렬된 결과.",
+    )
+    gemini_usage: Optional[GeminiUsageSummary] = Field(
+        default=None,
+        description="이 요청에서 사용한 Gemini 토큰 집계 (모든 이미지 합계).",
+    )
 
 # 내보낼 심볼 명시(실수 방지)
 __all__ = [
     "VerificationRequest",
     "VerificationResult",
     "VerificationResponse",
+    "GeminiUsageSummary",
     "VerificationRecordDetail",
     "ImageVerificationRequest",
     "ImageVerificationResult",
     "ImageVerificationResponse",
+    "ImageBatchVerificationRequest",
+    "ImageBatchItem",
+    "ImageBatchVerificationResponse",
     "GeminiImageVerdict",
+    "ImageNormalizationSummary",
     "GeminiImageVerificationResponse",
+    "GeminiImageBatchItem",
+    "GeminiImageBatchVerificationResponse",
     "VideoRequest",
+    "VideoFactCheckSegment",
     "VideoFactCheckResult",
     "VideoResponse",
+    "VerificationRecordSummary",
+    "VerificationRecordPage",
+    "VideoAnalysisSummary",
+    "VideoAnalysisPage",
+    "HistoryStats",
 ]
 
 class VideoRequest(BaseModel):
     url: str
+    transcript_only: bool = Field(
+        default=False,
+        description="true이면 오디오 스트림만 받아 전사/팩트체크만 수행하고 프레임 분석은 생략한다.",
+    )
+
+
+class VideoFactCheckSegment(BaseModel):
+    """Verdict for one time-aligned transcript chunk."""
+    start: float = Field(..., description="구간 시작 시각(초)")
+    end: float = Field(..., description="구간 종료 시각(초)")
+    accuracy: str = Field(..., description="구간 팩트체크 정확도 퍼센트 문자열")
+    accuracy_reason: str = Field(default="", description="정확도 산출 이유(한국어)")
+    reason: str = Field(default="", description="구간 팩트체크 결과 요약(한국어)")
+    urls: List[str] = Field(default_factory=list, description="참고한 출처 URL 목록")
+    cached: bool = Field(default=False, description="동일한 구간 텍스트의 캐시된 판정을 재사용했는지 여부")
 
 
 class VideoFactCheckResult(BaseModel):
@@ -136,6 +264,10 @@ class VideoFactCheckResult(BaseModel):
     accuracy_reason: str = Field(..., description="정확도 산출 이유(한국어)")
     reason: str = Field(..., description="팩트체크 결과 요약(한국어)")
     urls: List[str] = Field(default_factory=list, description="참고한 출처 URL 목록")
+    segments: List[VideoFactCheckSegment] = Field(
+        default_factory=list,
+        description="긴 영상의 자막 구간별 팩트체크 결과. 구간이 하나뿐이면 비어 있음.",
+    )
 
 
 class VideoResponse(BaseModel):
@@ -170,3 +302,64 @@ class VideoResponse(BaseModel):
         default=None,
         description="영상 길이(초 단위)."
     )
+    stage_timings: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="분석 단계별 소요 시간(초). 캐시된 단계는 조회 시간만 포함."
+    )
+    gemini_usage: Optional[GeminiUsageSummary] = Field(
+        default=None,
+        description="이 분석에서 사용한 Gemini 토큰 집계. 캐시 응답에서는 null."
+    )
+
+
+# ===== 이력/통계 조회용 =====
+class VerificationRecordSummary(BaseModel):
+    """Row returned by the verification history listing."""
+    record_id: UUID = Field(..., description="Primary key of the persisted verification record.")
+    input_text: str = Field(..., description="Original text that was verified.")
+    result: VerificationResult
+    created_at: datetime = Field(..., description="Timestamp when the record was stored.")
+
+
+class VerificationRecordPage(BaseModel):
+    items: List[VerificationRecordSummary] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="다음 페이지 조회에 사용할 keyset 커서. 마지막 페이지이면 null.",
+    )
+
+
+class VideoAnalysisSummary(BaseModel):
+    """Row returned by the video analysis history listing."""
+    record_id: UUID = Field(..., description="저장된 비디오 분석 레코드의 식별자.")
+    video_url: str
+    video_id: Optional[str] = None
+    fft_artifact_score: str
+    action_pattern_score: str
+    result: str
+    duration: Optional[float] = None
+    fact_accuracy: Optional[str] = None
+    fact_reason: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class VideoAnalysisPage(BaseModel):
+    items: List[VideoAnalysisSummary] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="다음 페이지 조회에 사용할 keyset 커서. 마지막 페이지이면 null.",
+    )
+
+
+class HistoryStats(BaseModel):
+    total: int = Field(..., description="조건에 해당하는 전체 레코드 수.")
+    by_accuracy_band: Dict[str, int] = Field(
+        default_factory=dict,
+        description="정확도 구간(20% 단위)별 레코드 수. 파싱 불가 값은 'unknown'.",
+    )
+    by_ai_result: Optional[Dict[str, int]] = Field(
+        default=None,
+        description="영상 AI 판정 결과별 레코드 수 (영상 통계에서만 제공).",
+    )
+    latest_created_at: Optional[datetime] = None
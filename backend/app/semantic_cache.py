@@ -0,0 +1,251 @@
+"""
+Semantic near-duplicate cache for text fact-checks.
+
+Republished news rarely matches byte-for-byte, so exact-hash caching misses
+most repeats. Texts are embedded with a small multilingual sentence model
+(mean-pooled, L2-normalised) and kept in a fixed-size NumPy matrix. A lookup is
+one matrix-vector product, which stays sub-millisecond at the default
+capacity, so no separate ANN library is needed. The nearest neighbour's verdict
+is reused when its cosine similarity clears ``SEMANTIC_CACHE_THRESHOLD`` and
+both texts carry the same numbers (amounts, rates, dates) and negations:
+embeddings barely move between "3.50%로 동결" and "3.25%로 인하", or between
+"approved" and "not approved", although the claims have opposite verdicts.
+
+The index is warmed from the newest Gemini-verified ``verification_records``
+at startup (reused verdicts are skipped so near-duplicates cannot chain) and
+each new Gemini verdict is appended as it is stored; verdicts stored while
+warming are buffered and added once the index is installed. When the matrix
+is full the oldest row is overwritten.
+"""
+import asyncio
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Deque, Optional, Sequence
+from uuid import UUID
+
+import numpy as np
+
+from .db import fetch_recent_verification_records
+from .metrics import SEMANTIC_EMBED_SECONDS, cache_event
+from .schemas import VerificationResult
+from .text_cache import claim_anchors
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE_ENABLED = os.environ.get("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+SEMANTIC_CACHE_MODEL = os.environ.get(
+    "SEMANTIC_CACHE_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+)
+SEMANTIC_CACHE_THRESHOLD = min(1.0, max(0.5, float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.93"))))
+SEMANTIC_CACHE_SIZE = max(1, int(os.environ.get("SEMANTIC_CACHE_SIZE", "20000")))
+SEMANTIC_CACHE_MAX_TOKENS = max(16, int(os.environ.get("SEMANTIC_CACHE_MAX_TOKENS", "256")))
+SEMANTIC_CACHE_BATCH = max(1, int(os.environ.get("SEMANTIC_CACHE_BATCH", "64")))
+# Neighbours above the threshold checked for matching anchors before giving up.
+SEMANTIC_CACHE_CANDIDATES = max(1, int(os.environ.get("SEMANTIC_CACHE_CANDIDATES", "5")))
+
+
+@dataclass(frozen=True)
+class _IndexedVerdict:
+    record_id: UUID
+    result: VerificationResult
+    raw_response: Optional[str]
+    anchors: frozenset
+
+
+@dataclass(frozen=True)
+class SemanticHit:
+    record_id: UUID
+    similarity: float
+    result: VerificationResult
+    raw_response: Optional[str]
+
+
+class SentenceEmbedder:
+    """Mean-pooled transformer sentence embeddings, loaded on first use."""
+
+    def __init__(self, model_name: str = SEMANTIC_CACHE_MODEL) -> None:
+        self.model_name = model_name
+        self._tokenizer = None
+        self._model = None
+        self._lock = Lock()
+
+    def load(self) -> None:
+        with self._lock:
+            if self._model is not None:
+                return
+            from transformers import AutoModel, AutoTokenizer
+
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            model = AutoModel.from_pretrained(self.model_name)
+            model.eval()
+            self._model = model
+            logger.info("Loaded sentence embedding model %s", self.model_name)
+
+    @property
+    def dimension(self) -> int:
+        self.load()
+        return int(self._model.config.hidden_size)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an ``(n, dim)`` float32 matrix of unit-length embeddings."""
+        import torch
+
+        self.load()
+        with SEMANTIC_EMBED_SECONDS.time():
+            encoded = self._tokenizer(
+                list(texts),
+                padding=True,
+                truncation=True,
+                max_length=SEMANTIC_CACHE_MAX_TOKENS,
+                return_tensors="pt",
+            )
+            with torch.no_grad():
+                hidden = self._model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+        return pooled.numpy().astype(np.float32, copy=False)
+
+
+class EmbeddingIndex:
+    """Fixed-capacity ring of unit vectors with exact inner-product search."""
+
+    def __init__(self, dimension: int, capacity: int = SEMANTIC_CACHE_SIZE) -> None:
+        self._vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self._entries: list[Optional[_IndexedVerdict]] = [None] * capacity
+        self._capacity = capacity
+        self._count = 0
+        self._next = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, vectors: np.ndarray, entries: Sequence[_IndexedVerdict]) -> None:
+        with self._lock:
+            for vector, entry in zip(vectors, entries):
+                self._vectors[self._next] = vector
+                self._entries[self._next] = entry
+                self._next = (self._next + 1) % self._capacity
+                self._count = min(self._count + 1, self._capacity)
+
+    def nearest(
+        self, vector: np.ndarray, *, threshold: float, limit: int
+    ) -> list[tuple[float, _IndexedVerdict]]:
+        """Up to ``limit`` entries scoring at least ``threshold``, best first."""
+        with self._lock:
+            if not self._count:
+                return []
+            scores = self._vectors[:self._count] @ vector
+            if limit < self._count:
+                top = np.argpartition(scores, -limit)[-limit:]
+            else:
+                top = np.arange(self._count)
+            ranked = top[np.argsort(scores[top])[::-1]]
+            return [(float(scores[i]), self._entries[i]) for i in ranked if scores[i] >= threshold]
+
+
+class SemanticVerdictCache:
+    """Reuse a verdict for texts whose embedding is close to an already verified one."""
+
+    def __init__(self, *, threshold: float = SEMANTIC_CACHE_THRESHOLD) -> None:
+        self._embedder = SentenceEmbedder()
+        self._threshold = threshold
+        self._index: Optional[EmbeddingIndex] = None
+        self._failed = False
+        # Verdicts stored while warm() runs; not in its DB snapshot.
+        self._pending: Deque[tuple[str, _IndexedVerdict]] = deque(maxlen=SEMANTIC_CACHE_SIZE)
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    async def warm(self, limit: int = SEMANTIC_CACHE_SIZE) -> None:
+        """Load the model and index the newest verified records, oldest first."""
+        if self._index is not None or self._failed:
+            return
+        try:
+            dimension = await asyncio.to_thread(lambda: self._embedder.dimension)
+        except Exception:
+            self._failed = True
+            self._pending.clear()
+            logger.exception("Semantic cache disabled: could not load %s", self._embedder.model_name)
+            return
+
+        index = EmbeddingIndex(dimension, SEMANTIC_CACHE_SIZE)
+        try:
+            records = await fetch_recent_verification_records(limit)
+        except Exception:
+            logger.exception("Failed to load verification records for the semantic cache")
+            records = []
+        records.reverse()
+        for start in range(0, len(records), SEMANTIC_CACHE_BATCH):
+            batch = records[start:start + SEMANTIC_CACHE_BATCH]
+            vectors = await asyncio.to_thread(self._embedder.embed, [r["input_text"] for r in batch])
+            index.add(vectors, [_entry_from_record(r) for r in batch])
+
+        # Drain verdicts added meanwhile; the index is installed right after the
+        # buffer is seen empty, with no await in between, so none are lost.
+        indexed = {record["id"] for record in records}
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(len(self._pending), SEMANTIC_CACHE_BATCH))]
+            batch = [(text, entry) for text, entry in batch if entry.record_id not in indexed]
+            if batch:
+                vectors = await asyncio.to_thread(self._embedder.embed, [text for text, _ in batch])
+                index.add(vectors, [entry for _, entry in batch])
+        self._index = index
+        logger.info("Semantic cache ready with %d records", len(index))
+
+    async def lookup(self, text: str) -> Optional[SemanticHit]:
+        """Nearest verified neighbour above the threshold with matching anchors; None while warming."""
+        if self._index is None:
+            return None
+        vector = (await asyncio.to_thread(self._embedder.embed, [text]))[0]
+        anchors = claim_anchors(text)
+        candidates = self._index.nearest(vector, threshold=self._threshold, limit=SEMANTIC_CACHE_CANDIDATES)
+        match = next(((score, entry) for score, entry in candidates if entry.anchors == anchors), None)
+        if candidates and match is None:
+            logger.debug("Semantic neighbour rejected: numbers or negation differ")
+        cache_event("semantic_verdict", match is not None)
+        if match is None:
+            return None
+        similarity, entry = match
+        return SemanticHit(entry.record_id, round(similarity, 4), entry.result, entry.raw_response)
+
+    async def add(
+        self,
+        text: str,
+        record_id: UUID,
+        result: VerificationResult,
+        raw_response: Optional[str],
+    ) -> None:
+        """Index a newly stored verdict so later near-duplicates can reuse it."""
+        entry = _IndexedVerdict(record_id, result, raw_response, claim_anchors(text))
+        if self._index is None:
+            if not self._failed:
+                self._pending.append((text, entry))
+            return
+        vectors = await asyncio.to_thread(self._embedder.embed, [text])
+        self._index.add(vectors, [entry])
+
+
+def _entry_from_record(record: dict[str, Any]) -> _IndexedVerdict:
+    result = VerificationResult(
+        accuracy=record["accuracy"],
+        accuracy_reason=record.get("accuracy_reason") or "",
+        reason=record["reason"],
+        urls=record.get("urls") or [],
+    )
+    return _IndexedVerdict(
+        record["id"], result, record.get("raw_model_response"), claim_anchors(record["input_text"])
+    )
+
+
+_semantic_cache = SemanticVerdictCache()
+
+
+def get_semantic_cache() -> SemanticVerdictCache:
+    return _semantic_cache
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+from .metrics import cache_event
+from .schemas import VerificationResult
+
+TEXT_CACHE_TTL = max(0.0, float(os.environ.get("TEXT_CACHE_TTL", "3600")))
+TEXT_CACHE_SIZE = max(1, int(os.environ.get("TEXT_CACHE_SIZE", "1024")))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Claim anchors: numbers and negations whose difference flips a verdict.
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+_NEGATION_RE = re.compile(
+    r"\b(?:not|no|never|none|neither|nor|without|cannot)\b|n't"
+    r"|않|못|없|아니|아닌|(?:^|\s)안\s"
+)
+
+CachedVerification = Tuple[VerificationResult, Optional[str]]
+
+
+def normalize_text(text: str) -> str:
+    """NFKC, case-folded, whitespace-collapsed form used as the cache identity."""
+    normalized = unicodedata.normalize("NFKC", text or "")
+    return _WHITESPACE_RE.sub(" ", normalized).strip().casefold()
+
+
+def claim_anchors(text: str) -> frozenset:
+    """Numbers and negation markers that must match for two texts to share a verdict."""
+    normalized = normalize_text(text)
+    numbers = set()
+    for raw in _NUMBER_RE.findall(normalized):
+        number = raw.replace(",", "")
+        if "." in number:
+            number = number.rstrip("0").rstrip(".")
+        numbers.add(number.lstrip("0") or "0")
+    # Only the number of negations matters: "not" and "n't", or 않 and 못, read alike.
+    negations = len(_NEGATION_RE.findall(normalized))
+    return frozenset(numbers | ({f"neg:{negations}"} if negations else set()))
+
+
+def text_cache_key(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class TextVerificationCache:
+    """In-process LRU of Gemini verdicts keyed by the SHA-256 of the normalized text."""
+
+    def __init__(self, *, ttl: float = TEXT_CACHE_TTL, max_size: int = TEXT_CACHE_SIZE) -> None:
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, CachedVerification]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str) -> Optional[CachedVerification]:
+        key = text_cache_key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self._ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                cache_event("text_verdict", False)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        cache_event("text_verdict", True)
+        return entry[1]
+
+    def put(self, text: str, result: VerificationResult, raw_response: Optional[str]) -> None:
+        if self._ttl <= 0:
+            return
+        key = text_cache_key(text)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), (result, raw_response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+_text_cache = TextVerificationCache()
+
+
+def get_text_cache() -> TextVerificationCache:
+    return _text_cache
@@ -0,0 +1,169 @@
+"""
+Optional OpenTelemetry tracing.
+
+Enabled with ``TRACING_ENABLED=true`` when ``opentelemetry-sdk`` is installed;
+otherwise every helper here is a cheap no-op. Finished spans are written as
+JSON lines to ``TRACE_FILE`` so slow requests can be broken down per stage
+without running a collector.
+
+OpenTelemetry keeps the active span in a ``contextvars`` context. Event-loop
+tasks, ``asyncio.to_thread`` and ``run_in_threadpool`` copy that context
+automatically; plain ``ThreadPoolExecutor.submit`` does not, so work handed
+to the long-lived executors goes through ``submit_with_context``.
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+except ImportError:  # pragma: no cover - tracing is optional
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "false").lower() == "true"
+TRACE_FILE = Path(os.environ.get("TRACE_FILE", str(BASE_DIR / "traces" / "spans.jsonl")))
+TRACE_SAMPLE_RATIO = min(1.0, max(0.0, float(os.environ.get("TRACE_SAMPLE_RATIO", "1.0"))))
+TRACE_SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "hacktruth-backend")
+
+_provider = None
+_tracer = None
+
+
+if trace is not None:
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """Append one JSON object per finished span to a local file."""
+
+        def __init__(self, path: Path) -> None:
+            self._path = path
+            self._lock = threading.Lock()
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        @staticmethod
+        def _encode(span: "ReadableSpan") -> dict[str, Any]:
+            context = span.get_span_context()
+            parent = span.parent
+            start, end = span.start_time or 0, span.end_time or 0
+            return {
+                "trace_id": format(context.trace_id, "032x"),
+                "span_id": format(context.span_id, "016x"),
+                "parent_id": format(parent.span_id, "016x") if parent else None,
+                "name": span.name,
+                "kind": span.kind.name,
+                "start": start / 1e9,
+                "duration_ms": round((end - start) / 1e6, 3),
+                "status": span.status.status_code.name,
+                "attributes": dict(span.attributes or {}),
+                "events": [
+                    {"name": event.name, "attributes": dict(event.attributes or {})}
+                    for event in span.events
+                ],
+            }
+
+        def export(self, spans: Sequence["ReadableSpan"]) -> "SpanExportResult":
+            lines = "".join(
+                json.dumps(self._encode(span), ensure_ascii=False, default=str) + "\n"
+                for span in spans
+            )
+            try:
+                with self._lock, open(self._path, "a", encoding="utf-8") as handle:
+                    handle.write(lines)
+            except OSError:
+                logger.exception("Failed to write spans to %s", self._path)
+                return SpanExportResult.FAILURE
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+
+def init_tracing() -> bool:
+    """Install the tracer provider once; returns whether spans are being recorded."""
+    global _provider, _tracer
+    if _tracer is not None:
+        return True
+    if not TRACING_ENABLED:
+        return False
+    if trace is None:
+        logger.warning("TRACING_ENABLED is set but opentelemetry-sdk is not installed; tracing disabled")
+        return False
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": TRACE_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(TRACE_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(TRACE_FILE)))
+    trace.set_tracer_provider(_provider)
+    _tracer = trace.get_tracer("app")
+    logger.info("Tracing enabled; writing spans to %s (sample ratio %.2f)", TRACE_FILE, TRACE_SAMPLE_RATIO)
+    return True
+
+
+def shutdown_tracing() -> None:
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
+
+
+def tracing_active() -> bool:
+    return _tracer is not None
+
+
+def _clean(attributes: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Any]]:
+    """Start a child span of the current context; yields None when tracing is off."""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=_clean(attributes)) as current:
+        yield current
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """Attach attributes to the current span, skipping None values."""
+    if _tracer is None:
+        return
+    current = trace.get_current_span()
+    if current.is_recording():
+        current.set_attributes(_clean(attributes))
+
+
+def record_usage(usage: Any) -> None:
+    """Copy Gemini ``usage_metadata`` token counts onto the current span."""
+    if _tracer is None or usage is None:
+        return
+    set_span_attributes(
+        **{
+            "gemini.tokens.prompt": getattr(usage, "prompt_token_count", None),
+            "gemini.tokens.cached": getattr(usage, "cached_content_token_count", None),
+            "gemini.tokens.candidates": getattr(usage, "candidates_token_count", None),
+            "gemini.tokens.thoughts": getattr(usage, "thoughts_token_count", None),
+            "gemini.tokens.tool_use_prompt": getattr(usage, "tool_use_prompt_token_count", None),
+            "gemini.tokens.total": getattr(usage, "total_token_count", None),
+        }
+    )
+
+
+def submit_with_context(executor: Executor, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """``executor.submit`` that runs ``fn`` inside a copy of the caller's context."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -0,0 +1,184 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from .schemas import VerificationResult
+
+# A chunk closes once it spans this many seconds or characters, whichever first.
+FACT_CHUNK_SECONDS = max(10.0, float(os.environ.get("FACT_CHUNK_SECONDS", "180")))
+FACT_CHUNK_MAX_CHARS = max(200, int(os.environ.get("FACT_CHUNK_MAX_CHARS", "2000")))
+# Trailing chunks shorter than this are folded into the previous one.
+FACT_CHUNK_MIN_CHARS = max(0, int(os.environ.get("FACT_CHUNK_MIN_CHARS", "200")))
+
+_SRT_TIME_RE = re.compile(
+    r"(\d+):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{3})"
+)
+_ACCURACY_RE = re.compile(r"^\s*(\d{1,3})")
+
+
+@dataclass(frozen=True)
+class TranscriptSegment:
+    start: float
+    end: float
+    text: str
+
+
+@dataclass(frozen=True)
+class TranscriptChunk:
+    index: int
+    start: float
+    end: float
+    text: str
+
+    @property
+    def label(self) -> str:
+        return f"{format_timestamp(self.start)}-{format_timestamp(self.end)}"
+
+
+def format_timestamp(seconds: float) -> str:
+    total = max(0, int(seconds))
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours:d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def _srt_seconds(hours: str, minutes: str, seconds: str, millis: str) -> float:
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000.0
+
+
+def parse_srt(srt: Optional[str]) -> list[TranscriptSegment]:
+    """Parse the SRT produced by ``transcribe_video_audio`` back into timed segments."""
+    segments: list[TranscriptSegment] = []
+    for block in re.split(r"\n\s*\n", (srt or "").strip()):
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+        for position, line in enumerate(lines):
+            match = _SRT_TIME_RE.search(line)
+            if not match:
+                continue
+            text = " ".join(lines[position + 1:]).strip()
+            if text:
+                segments.append(
+                    TranscriptSegment(
+                        start=_srt_seconds(*match.groups()[:4]),
+                        end=_srt_seconds(*match.groups()[4:]),
+                        text=text,
+                    )
+                )
+            break
+    return segments
+
+
+def chunk_transcript(
+    segments: Sequence[TranscriptSegment],
+    *,
+    max_seconds: float = FACT_CHUNK_SECONDS,
+    max_chars: int = FACT_CHUNK_MAX_CHARS,
+    min_chars: int = FACT_CHUNK_MIN_CHARS,
+) -> list[TranscriptChunk]:
+    """Group consecutive segments into time-aligned chunks on segment boundaries."""
+    groups: list[list[TranscriptSegment]] = []
+    current: list[TranscriptSegment] = []
+    current_chars = 0
+
+    for segment in segments:
+        if current and (
+            segment.end - current[0].start > max_seconds
+            or current_chars + len(segment.text) + 1 > max_chars
+        ):
+            groups.append(current)
+            current, current_chars = [], 0
+        current.append(segment)
+        current_chars += len(segment.text) + 1
+    if current:
+        if groups and current_chars < min_chars:
+            groups[-1].extend(current)
+        else:
+            groups.append(current)
+
+    return [
+        TranscriptChunk(
+            index=index,
+            start=group[0].start,
+            end=group[-1].end,
+            text=" ".join(segment.text for segment in group),
+        )
+        for index, group in enumerate(groups)
+    ]
+
+
+def _accuracy_percent(value: str) -> Optional[int]:
+    match = _ACCURACY_RE.match(value or "")
+    return min(100, int(match.group(1))) if match else None
+
+
+def merge_chunk_verdicts(
+    chunks: Sequence[TranscriptChunk],
+    verdicts: Sequence[Optional[VerificationResult]],
+    cached: Sequence[bool],
+) -> tuple[Optional[VerificationResult], list[dict[str, Any]]]:
+    """
+    Combine per-chunk verdicts into one video-level result plus timestamped
+    segment entries. Accuracy is the duration-weighted mean over chunks that
+    made a checkable claim; the prompt scores claim-free text as 0% with no
+    sources, so those chunks only count when nothing else was checkable.
+    """
+    segments: list[dict[str, Any]] = []
+    scored: list[tuple[TranscriptChunk, VerificationResult, int]] = []
+    for chunk, verdict, from_cache in zip(chunks, verdicts, cached):
+        if verdict is None:
+            continue
+        segments.append(
+            {
+                "start": chunk.start,
+                "end": chunk.end,
+                "accuracy": verdict.accuracy,
+                "accuracy_reason": verdict.accuracy_reason,
+                "reason": verdict.reason,
+                "urls": list(verdict.urls or []),
+                "cached": from_cache,
+            }
+        )
+        percent = _accuracy_percent(verdict.accuracy)
+        if percent is not None:
+            scored.append((chunk, verdict, percent))
+
+    if not segments:
+        return None, []
+
+    claims = [item for item in scored if item[2] > 0 or item[1].urls] or scored
+    if claims:
+        weights = [max(chunk.end - chunk.start, 1.0) for chunk, _, _ in claims]
+        accuracy = round(sum(w * p for w, (_, _, p) in zip(weights, claims)) / sum(weights))
+        weakest_chunk, weakest, weakest_pct = min(claims, key=lambda item: item[2])
+        accuracy_reason = (
+            f"{len(chunks)}개 구간 중 {len(claims)}개 구간의 주장을 검증해 길이 가중 평균을 냈습니다. "
+            f"가장 낮은 구간은 {weakest_chunk.label} ({weakest_pct}%)입니다: {weakest.accuracy_reason}"
+        )
+    else:
+        accuracy = 0
+        accuracy_reason = "구간별 정확도를 해석할 수 없습니다."
+
+    reason = "\n".join(
+        f"[{format_timestamp(entry['start'])}-{format_timestamp(entry['end'])}] "
+        f"{entry['accuracy']}: {entry['reason']}"
+        for entry in segments
+    )
+
+    urls: list[str] = []
+    for entry in segments:
+        for url in entry["urls"]:
+            if url not in urls:
+                urls.append(url)
+
+    return (
+        VerificationResult(
+            accuracy=f"{accuracy}%",
+            accuracy_reason=accuracy_reason,
+            reason=reason,
+            urls=urls,
+        ),
+        segments,
+    )
@@ -0,0 +1,297 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VIDEO_DECODE_BACKEND = os.environ.get("VIDEO_DECODE_BACKEND", "opencv").lower()
+# 0 lets the decoder pick (usually one thread per core).
+VIDEO_DECODE_THREADS = max(0, int(os.environ.get("VIDEO_DECODE_THREADS", "0")))
+# 0 keeps the native width. FFT thresholds were tuned on native-resolution
+# frames, so only lower this if the FFT score is recalibrated as well.
+VIDEO_DECODE_WIDTH = max(0, int(os.environ.get("VIDEO_DECODE_WIDTH", "0")))
+FFMPEG_BINARY = os.environ.get("FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = os.environ.get("FFPROBE_BINARY", "ffprobe")
+
+
+@dataclass(frozen=True)
+class VideoProbe:
+    width: int
+    height: int
+    fps: float
+    total_frames: int
+
+
+def _output_size(probe: VideoProbe, width: Optional[int]) -> tuple[int, int]:
+    if not width or probe.width <= width:
+        return probe.width, probe.height
+    # Even height keeps ffmpeg's scaler and most pixel formats happy.
+    height = max(2, int(round(probe.height * width / probe.width / 2)) * 2)
+    return width, height
+
+
+class FrameDecoder(ABC):
+    """Decode selected frame indices of one file as grayscale uint8 arrays."""
+
+    backend = "base"
+
+    def __init__(self, path: str, width: Optional[int]) -> None:
+        self.path = path
+        self.probe = self._probe()
+        self.output_width, self.output_height = _output_size(self.probe, width)
+
+    @abstractmethod
+    def _probe(self) -> VideoProbe:
+        """Read width, height, fps and frame count; called once from ``__init__``."""
+
+    @abstractmethod
+    def read(self, indices: Sequence[int]) -> list[np.ndarray]:
+        """Decode the frames at ``indices`` as grayscale arrays at the output size."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "FrameDecoder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class OpenCVFrameDecoder(FrameDecoder):
+    """Original cv2.VideoCapture path: seek per index, convert BGR to gray in Python."""
+
+    backend = "opencv"
+
+    def __init__(self, path: str, width: Optional[int]) -> None:
+        self._cap = cv2.VideoCapture(path)
+        super().__init__(path, width)
+
+    def _probe(self) -> VideoProbe:
+        return VideoProbe(
+            width=int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(self._cap.get(cv2.CAP_PROP_FPS) or 0.0),
+            total_frames=int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        )
+
+    def read(self, indices: Sequence[int]) -> list[np.ndarray]:
+        frames = []
+        for index in indices:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            ret, frame = self._cap.read()
+            if not ret:
+                continue
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if gray.shape[1] != self.output_width:
+                gray = cv2.resize(
+                    gray,
+                    (self.output_width, self.output_height),
+                    interpolation=cv2.INTER_AREA,
+                )
+            frames.append(gray)
+        return frames
+
+    def close(self) -> None:
+        self._cap.release()
+
+
+def _uniform_stride(indices: Sequence[int]) -> Optional[int]:
+    if len(indices) < 2:
+        return 1
+    stride = indices[1] - indices[0]
+    if stride <= 0:
+        return None
+    for prev, curr in zip(indices, indices[1:]):
+        if curr - prev != stride:
+            return None
+    return stride
+
+
+class FFmpegFrameDecoder(FrameDecoder):
+    """
+    ffmpeg subprocess pipe. Each read seeks to the first index, lets the
+    ``select`` filter drop every frame off the stride before scaling and pixel
+    conversion, and has ffmpeg emit gray8 at the output size. Frames are
+    returned as views over the single buffer read from the pipe.
+    """
+
+    backend = "ffmpeg"
+
+    def _probe(self) -> VideoProbe:
+        completed = subprocess.run(
+            [
+                FFPROBE_BINARY,
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "stream=width,height,avg_frame_rate,nb_frames:format=duration",
+                "-of", "json",
+                self.path,
+            ],
+            capture_output=True,
+            check=True,
+        )
+        payload = json.loads(completed.stdout or b"{}")
+        stream = (payload.get("streams") or [{}])[0]
+        num, _, den = str(stream.get("avg_frame_rate") or "0/1").partition("/")
+        fps = float(num) / float(den or 1) if float(den or 1) else 0.0
+        total_frames = int(stream.get("nb_frames") or 0)
+        if not total_frames:
+            duration = float((payload.get("format") or {}).get("duration") or 0.0)
+            total_frames = int(duration * fps)
+        return VideoProbe(
+            width=int(stream.get("width") or 0),
+            height=int(stream.get("height") or 0),
+            fps=fps,
+            total_frames=total_frames,
+        )
+
+    def read(self, indices: Sequence[int]) -> list[np.ndarray]:
+        if not indices:
+            return []
+        stride = _uniform_stride(indices)
+        if stride is None:
+            frames: list[np.ndarray] = []
+            for index in indices:
+                frames.extend(self._read_run(index, 1, 1))
+            return frames
+        return self._read_run(indices[0], stride, len(indices))
+
+    def _read_run(self, start: int, stride: int, count: int) -> list[np.ndarray]:
+        fps = self.probe.fps or 30.0
+        width, height = self.output_width, self.output_height
+        filters = [f"select='not(mod(n\\,{stride}))'"]
+        if width != self.probe.width:
+            filters.append(f"scale={width}:{height}:flags=area")
+        filters.append("format=gray")
+
+        command = [
+            FFMPEG_BINARY,
+            "-v", "error",
+            "-threads", str(VIDEO_DECODE_THREADS),
+            "-ss", f"{start / fps:.6f}",
+            "-i", self.path,
+            "-an",
+            "-vf", ",".join(filters),
+            "-vsync", "0",
+            "-frames:v", str(count),
+            "-f", "rawvideo",
+            "-pix_fmt", "gray",
+            "pipe:1",
+        ]
+        completed = subprocess.run(command, capture_output=True)
+        if completed.returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg frame decode failed: {completed.stderr.decode(errors='replace').strip()}"
+            )
+
+        frame_size = width * height
+        available = len(completed.stdout) // frame_size
+        if not available:
+            return []
+        block = np.frombuffer(completed.stdout, dtype=np.uint8, count=available * frame_size)
+        block = block.reshape(available, height, width)
+        return [block[i] for i in range(available)]
+
+
+class PyAVFrameDecoder(FrameDecoder):
+    """PyAV with threaded decoding; gray frames are views over the reformatted plane."""
+
+    backend = "pyav"
+
+    def __init__(self, path: str, width: Optional[int]) -> None:
+        import av
+
+        self._container = av.open(path)
+        self._stream = self._container.streams.video[0]
+        self._stream.thread_type = "AUTO"
+        if VIDEO_DECODE_THREADS:
+            self._stream.codec_context.thread_count = VIDEO_DECODE_THREADS
+        super().__init__(path, width)
+
+    def _probe(self) -> VideoProbe:
+        stream = self._stream
+        fps = float(stream.average_rate or stream.guessed_rate or 0.0)
+        total_frames = int(stream.frames or 0)
+        if not total_frames and stream.duration and stream.time_base:
+            total_frames = int(float(stream.duration * stream.time_base) * fps)
+        return VideoProbe(
+            width=int(stream.codec_context.width),
+            height=int(stream.codec_context.height),
+            fps=fps,
+            total_frames=total_frames,
+        )
+
+    def read(self, indices: Sequence[int]) -> list[np.ndarray]:
+        if not indices:
+            return []
+        fps = self.probe.fps or 30.0
+        time_base = self._stream.time_base
+        targets = sorted(indices)
+        self._container.seek(int(targets[0] / fps / time_base), stream=self._stream, backward=True)
+
+        frames: list[np.ndarray] = []
+        pending = iter(targets)
+        target = next(pending)
+        for frame in self._container.decode(self._stream):
+            if frame.pts is None:
+                continue
+            index = int(round(float(frame.pts * time_base) * fps))
+            if index < target:
+                continue
+            gray = frame.reformat(
+                width=self.output_width,
+                height=self.output_height,
+                format="gray",
+            )
+            plane = gray.planes[0]
+            view = np.frombuffer(plane, dtype=np.uint8).reshape(-1, plane.line_size)
+            frames.append(view[: self.output_height, : self.output_width])
+            target = next(pending, None)
+            if target is None:
+                break
+        return frames
+
+    def close(self) -> None:
+        self._container.close()
+
+
+_DECODERS = {
+    "opencv": OpenCVFrameDecoder,
+    "ffmpeg": FFmpegFrameDecoder,
+    "pyav": PyAVFrameDecoder,
+}
+
+
+def open_frame_decoder(
+    path: str,
+    *,
+    backend: Optional[str] = None,
+    width: Optional[int] = None,
+) -> FrameDecoder:
+    """Open a decoder for ``path`` using the configured backend, falling back to OpenCV."""
+    name = (backend or VIDEO_DECODE_BACKEND).lower()
+    target_width = VIDEO_DECODE_WIDTH if width is None else width
+    decoder_cls = _DECODERS.get(name)
+    if decoder_cls is None:
+        logger.warning("Unknown VIDEO_DECODE_BACKEND '%s'; using opencv", name)
+        decoder_cls = OpenCVFrameDecoder
+    if decoder_cls is FFmpegFrameDecoder and not (shutil.which(FFMPEG_BINARY) and shutil.which(FFPROBE_BINARY)):
+        logger.warning("ffmpeg/ffprobe not found; falling back to the opencv decode backend")
+        decoder_cls = OpenCVFrameDecoder
+
+    try:
+        return decoder_cls(path, target_width)
+    except Exception as exc:  # noqa: BLE001 - any backend failure falls back to OpenCV
+        if decoder_cls is OpenCVFrameDecoder:
+            raise
+        logger.warning("%s decode backend unavailable (%s); using opencv", decoder_cls.backend, exc)
+        return OpenCVFrameDecoder(path, target_width)
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Deque, Dict, Iterator, Optional
+from uuid import UUID
+
+from .check_video import VIDEOS_DIR, video_shard_dir
+from .db import clear_video_paths, fetch_video_paths, update_video_path
+
+logger = logging.getLogger(__name__)
+
+VIDEO_STORAGE_BUDGET_BYTES = max(
+    0, int(float(os.environ.get("VIDEO_STORAGE_BUDGET_MB", "10240")) * 1024 * 1024)
+)
+VIDEO_JANITOR_INTERVAL = max(10.0, float(os.environ.get("VIDEO_JANITOR_INTERVAL", "300")))
+# Files touched more recently than this are never evicted; protects in-flight
+# downloads and analyses running in other worker processes.
+VIDEO_JANITOR_MIN_AGE = max(0.0, float(os.environ.get("VIDEO_JANITOR_MIN_AGE", "600")))
+VIDEO_DELETE_AFTER_ANALYSIS = (
+    os.environ.get("VIDEO_DELETE_AFTER_ANALYSIS", "false").lower() == "true"
+)
+VIDEO_RECONCILE_BATCH = max(1, int(os.environ.get("VIDEO_RECONCILE_BATCH", "500")))
+
+_PARTIAL_SUFFIXES = {".part", ".ytdl", ".temp"}
+
+
+@dataclass(frozen=True)
+class MediaFile:
+    path: Path
+    size: int
+    accessed_at: float
+
+
+@dataclass
+class EvictionStats:
+    runs: int = 0
+    evicted_files: int = 0
+    evicted_bytes: int = 0
+    deleted_after_analysis: int = 0
+    db_rows_cleared: int = 0
+    db_rows_relinked: int = 0
+    last_run_at: Optional[float] = None
+    last_usage_bytes: int = 0
+    recent: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=50))
+
+
+_stats = EvictionStats()
+_stats_lock = Lock()
+_pinned: Dict[str, int] = {}
+_pinned_lock = Lock()
+_reconcile_after: Optional[UUID] = None
+
+
+@contextmanager
+def pin_media(*paths: Optional[str]) -> Iterator[None]:
+    """Protect media files from eviction while an analysis is reading them."""
+    keys = [str(Path(p).resolve()) for p in paths if p]
+    with _pinned_lock:
+        for key in keys:
+            _pinned[key] = _pinned.get(key, 0) + 1
+    try:
+        yield
+    finally:
+        with _pinned_lock:
+            for key in keys:
+                remaining = _pinned.get(key, 0) - 1
+                if remaining > 0:
+                    _pinned[key] = remaining
+                else:
+                    _pinned.pop(key, None)
+
+
+def _is_pinned(path: Path) -> bool:
+    with _pinned_lock:
+        return str(path.resolve()) in _pinned
+
+
+def scan_media(root: Path = VIDEOS_DIR) -> list[MediaFile]:
+    """List media files under the videos directory, including legacy flat files."""
+    entries: list[MediaFile] = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = Path(dirpath) / name
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append(
+                MediaFile(
+                    path=path,
+                    size=stat.st_size,
+                    accessed_at=max(stat.st_atime, stat.st_mtime),
+                )
+            )
+    return entries
+
+
+def _remove_file(entry: MediaFile, reason: str) -> bool:
+    try:
+        entry.path.unlink()
+    except FileNotFoundError:
+        return False
+    except OSError as exc:
+        logger.warning("Failed to remove media file %s: %s", entry.path, exc)
+        return False
+
+    with _stats_lock:
+        _stats.evicted_files += 1
+        _stats.evicted_bytes += entry.size
+        _stats.recent.append(
+            {
+                "path": str(entry.path),
+                "bytes": entry.size,
+                "reason": reason,
+                "removed_at": time.time(),
+            }
+        )
+    logger.info("Evicted media file %s (%d bytes, reason=%s)", entry.path, entry.size, reason)
+    return True
+
+
+def enforce_budget(budget_bytes: int = VIDEO_STORAGE_BUDGET_BYTES) -> list[str]:
+    """Evict least-recently-accessed files until total usage fits the byte budget."""
+    entries = scan_media()
+    usage = sum(entry.size for entry in entries)
+    now = time.time()
+    removed: list[str] = []
+
+    if budget_bytes > 0 and usage > budget_bytes:
+        for entry in sorted(entries, key=lambda item: item.accessed_at):
+            if usage <= budget_bytes:
+                break
+            if now - entry.accessed_at < VIDEO_JANITOR_MIN_AGE or _is_pinned(entry.path):
+                continue
+            if _remove_file(entry, "budget"):
+                usage -= entry.size
+                removed.append(str(entry.path))
+
+    # Abandoned partial downloads are dead weight regardless of the budget.
+    for entry in entries:
+        if entry.path.suffix.lower() in _PARTIAL_SUFFIXES and str(entry.path) not in removed:
+            if now - entry.accessed_at >= VIDEO_JANITOR_MIN_AGE and _remove_file(entry, "stale_partial"):
+                usage -= entry.size
+                removed.append(str(entry.path))
+
+    for dirpath in {Path(path).parent for path in removed}:
+        if dirpath != VIDEOS_DIR:
+            try:
+                dirpath.rmdir()
+            except OSError:
+                pass
+
+    with _stats_lock:
+        _stats.last_usage_bytes = max(0, usage)
+    return removed
+
+
+async def reconcile_video_paths() -> tuple[int, int]:
+    """Detach DB rows whose media file is gone, relinking legacy paths that were sharded."""
+    global _reconcile_after
+    rows = await fetch_video_paths(after_id=_reconcile_after, limit=VIDEO_RECONCILE_BATCH)
+    # Walk the table in id order across runs so every row is eventually checked.
+    _reconcile_after = rows[-1]["id"] if len(rows) == VIDEO_RECONCILE_BATCH else None
+    missing: list[str] = []
+    relinked = 0
+
+    for row in rows:
+        stored = Path(row["video_path"])
+        if stored.exists():
+            continue
+        video_id = row["video_id"]
+        if video_id:
+            sharded = video_shard_dir(video_id) / stored.name
+            if sharded.exists():
+                await update_video_path(str(stored), str(sharded))
+                relinked += 1
+                continue
+        missing.append(str(stored))
+
+    cleared = await clear_video_paths(missing) if missing else 0
+    return cleared, relinked
+
+
+async def release_analyzed_media(*paths: Optional[str]) -> None:
+    """Delete media once its analysis is persisted, if configured to do so."""
+    if not VIDEO_DELETE_AFTER_ANALYSIS:
+        return
+
+    removed: list[str] = []
+    for raw in paths:
+        if not raw:
+            continue
+        path = Path(raw)
+        if _is_pinned(path):
+            continue
+        try:
+            size = path.stat().st_size
+        except OSError:
+            continue
+        if _remove_file(MediaFile(path=path, size=size, accessed_at=time.time()), "analysis_persisted"):
+            removed.append(str(path))
+
+    if not removed:
+        return
+    with _stats_lock:
+        _stats.deleted_after_analysis += len(removed)
+    try:
+        cleared = await clear_video_paths(removed)
+    except Exception:
+        logger.exception("Failed to detach deleted media from video analysis records")
+        return
+    with _stats_lock:
+        _stats.db_rows_cleared += cleared
+
+
+async def run_janitor_once() -> list[str]:
+    removed = await asyncio.to_thread(enforce_budget)
+    cleared = relinked = 0
+    try:
+        if removed:
+            cleared += await clear_video_paths(removed)
+        extra_cleared, relinked = await reconcile_video_paths()
+        cleared += extra_cleared
+    except Exception:
+        logger.exception("Failed to reconcile video_path columns after eviction")
+
+    with _stats_lock:
+        _stats.runs += 1
+        _stats.last_run_at = time.time()
+        _stats.db_rows_cleared += cleared
+        _stats.db_rows_relinked += relinked
+    return removed
+
+
+async def janitor_loop(interval: float = VIDEO_JANITOR_INTERVAL) -> None:
+    """Background task that periodically enforces the storage budget."""
+    logger.info(
+        "Video storage janitor started (budget=%d bytes, interval=%.0fs)",
+        VIDEO_STORAGE_BUDGET_BYTES,
+        interval,
+    )
+    while True:
+        try:
+            await run_janitor_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Video storage janitor run failed")
+        await asyncio.sleep(interval)
+
+
+def get_eviction_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        return {
+            "budget_bytes": VIDEO_STORAGE_BUDGET_BYTES,
+            "usage_bytes": _stats.last_usage_bytes,
+            "runs": _stats.runs,
+            "last_run_at": _stats.last_run_at,
+            "evicted_files": _stats.evicted_files,
+            "evicted_bytes": _stats.evicted_bytes,
+            "deleted_after_analysis": _stats.deleted_after_analysis,
+            "db_rows_cleared": _stats.db_rows_cleared,
+            "db_rows_relinked": _stats.db_rows_relinked,
+            "recent": list(_stats.recent),
+        }
@@ -0,0 +1,134 @@
+"""
+Parity check and throughput benchmark for the deepfake detector backends.
+
+Runs the eager fp32 model and a candidate backend (``int8`` or ``onnx``) on the
+same preprocessed images, reports the largest ``fake_prob``/``real_prob``
+difference in percentage points plus verdict agreement, then times each
+backend in images per second per intra-op thread.
+
+    cd backend
+    python -m benchmarks.deepfake_backends --backend int8 --threads 4 --images ./samples
+    python -m benchmarks.deepfake_backends --backend onnx --images ./samples --check
+
+Without ``--images`` a set of random synthetic images is used, which is
+enough for timing and a rough parity signal. ``--check`` skips the timing and
+only runs the parity gate.
+
+The exit status is the parity test: 1 when the largest probability
+difference exceeds ``--tolerance`` percentage points or verdict agreement
+falls below ``--min-agreement``, 2 when the ONNX backend cannot be built
+(instead of silently comparing eager with itself).
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+def _load_images(folder: Optional[Path], count: int, seed: int) -> list[Image.Image]:
+    if folder is not None:
+        paths = sorted(p for p in folder.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        if not paths:
+            sys.exit(f"No images found in {folder}")
+        return [Image.open(path).convert("RGB") for path in paths[:count]]
+    rng = np.random.default_rng(seed)
+    return [
+        Image.fromarray(rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8), "RGB")
+        for _ in range(count)
+    ]
+
+
+def _probs(logits_fn, pixel_values):
+    import torch
+
+    return torch.nn.functional.softmax(logits_fn(pixel_values), dim=1).numpy() * 100.0
+
+
+def _throughput(logits_fn, pixel_values, batch_size: int, repeats: int) -> float:
+    batches = [pixel_values[i:i + batch_size] for i in range(0, len(pixel_values), batch_size)]
+    logits_fn(batches[0])  # warm-up (graph optimisation, allocator)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for batch in batches:
+            logits_fn(batch)
+    return repeats * len(pixel_values) / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["int8", "onnx"], default="int8")
+    parser.add_argument("--threads", type=int, default=1, help="Intra-op threads (DEEPFAKE_NUM_THREADS).")
+    parser.add_argument("--images", type=Path, default=None, help="Folder of sample images.")
+    parser.add_argument("--count", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=2.0, help="Max allowed difference in percentage points.")
+    parser.add_argument(
+        "--min-agreement", type=float, default=1.0, help="Min fraction of images with the same verdict as eager."
+    )
+    parser.add_argument("--check", action="store_true", help="Parity gate only; skip the throughput timing.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Read by the detector module at import time.
+    os.environ["DEEPFAKE_NUM_THREADS"] = str(args.threads)
+    os.environ["DEEPFAKE_BACKEND"] = "eager"
+    from app.detectors import deepfake_detector as detector
+
+    images = _load_images(args.images, args.count, args.seed)
+    pixel_values = detector._processor(images=images, return_tensors="pt")["pixel_values"]
+
+    eager = detector.load_backend("eager")
+    if args.backend == "onnx":
+        # load_backend() would quietly fall back to eager and compare fp32 with itself.
+        try:
+            candidate = detector._onnx_logits(detector.DEEPFAKE_ONNX_PATH)
+        except Exception as exc:  # noqa: BLE001
+            print(f"FAIL: onnx backend unavailable: {exc}")
+            return 2
+    else:
+        candidate = detector.load_backend(args.backend)
+
+    reference = _probs(eager, pixel_values)
+    measured = _probs(candidate, pixel_values)
+    max_diff = float(np.abs(reference - measured).max())
+    agreement = float((reference.argmax(axis=1) == measured.argmax(axis=1)).mean())
+    worst = int(np.abs(reference - measured).max(axis=1).argmax())
+
+    print(f"images: {len(images)} ({'synthetic' if args.images is None else args.images})")
+    print(f"threads: {args.threads}  batch size: {args.batch_size}")
+    print(
+        f"parity vs eager: max |Δprob| = {max_diff:.3f} pp (image {worst}), "
+        f"verdict agreement = {agreement:.1%}"
+    )
+
+    if not args.check:
+        eager_ips = _throughput(eager, pixel_values, args.batch_size, args.repeats)
+        candidate_ips = _throughput(candidate, pixel_values, args.batch_size, args.repeats)
+        print(f"eager:          {eager_ips:8.2f} img/s  {eager_ips / args.threads:8.2f} img/s/core")
+        print(
+            f"{args.backend + ':':<15} {candidate_ips:8.2f} img/s  {candidate_ips / args.threads:8.2f} img/s/core"
+            f"  ({candidate_ips / eager_ips:.2f}x)"
+        )
+
+    failures = []
+    if max_diff > args.tolerance:
+        failures.append(f"max |Δprob| {max_diff:.3f} pp > {args.tolerance} pp")
+    if agreement < args.min_agreement:
+        failures.append(f"verdict agreement {agreement:.1%} < {args.min_agreement:.1%}")
+    if failures:
+        print(f"FAIL ({args.backend} vs eager): " + "; ".join(failures))
+        return 1
+    print(f"PASS ({args.backend} vs eager): within {args.tolerance} pp, agreement {agreement:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
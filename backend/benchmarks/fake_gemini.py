@@ -0,0 +1,270 @@
+"""
+Offline stand-in for the Gemini REST API, for load tests without quota.
+
+Serves the endpoints the backend uses (``models/*:generateContent``,
+``models/*:countTokens`` and ``cachedContents``) with schema-shaped JSON answers, plus synthetic JPEGs at
+``/images/<n>.jpg`` so the image endpoints can fetch something locally.
+Latency, server errors, 429s and blocked prompts are injected at
+configurable rates.
+
+    cd backend
+    python -m benchmarks.fake_gemini --port 8090 --latency lognormal --median 1.2 --rate-429 0.02
+    GEMINI_BASE_URL=http://127.0.0.1:8090 GEMINI_API_KEY=fake uvicorn app.main:app
+
+The real google-genai client talks to this server, so request building and
+response parsing stay in the measured path. Uses only the standard library.
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+import numpy as np
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class FakeBehaviour:
+    latency: str = "lognormal"  # fixed | uniform | lognormal
+    median: float = 1.0
+    spread: float = 0.5  # uniform: ± seconds; lognormal: sigma
+    error_rate: float = 0.0
+    rate_429: float = 0.0
+    block_rate: float = 0.0
+    prompt_tokens: int = 900
+    output_tokens: int = 180
+    thoughts_tokens: int = 400
+
+    def delay(self, rng: random.Random) -> float:
+        if self.latency == "fixed":
+            return self.median
+        if self.latency == "uniform":
+            return max(0.0, rng.uniform(self.median - self.spread, self.median + self.spread))
+        return rng.lognormvariate(np.log(max(self.median, 1e-3)), self.spread)
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts: dict[str, int] = {}
+
+    def bump(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+
+def _text_verdict(rng: random.Random) -> dict[str, Any]:
+    return {
+        "accuracy": f"{rng.randrange(0, 101, 5)}%",
+        "accuracy_reason": "부하 테스트용 가짜 응답입니다.",
+        "reason": "오프라인 Gemini 대역 서버가 생성한 판정입니다.",
+        "urls": ["https://example.com/source"],
+    }
+
+
+def _image_verdict(rng: random.Random) -> dict[str, Any]:
+    return {"fake": f"{rng.randrange(0, 101, 5)}%", "reason": "부하 테스트용 가짜 이미지 판정입니다."}
+
+
+def _answer_for(body: dict[str, Any], rng: random.Random) -> str:
+    """Shape the answer after the request's response schema."""
+    config = body.get("generationConfig") or {}
+    schema = config.get("responseSchema") or config.get("responseJsonSchema") or {}
+    parts = [part for content in body.get("contents") or [] for part in content.get("parts") or []]
+    images = sum(1 for part in parts if "inlineData" in part or "inline_data" in part)
+    if str(schema.get("type", "")).lower() == "array":
+        return json.dumps(
+            [{"index": number, **_image_verdict(rng)} for number in range(1, max(images, 1) + 1)],
+            ensure_ascii=False,
+        )
+    if "fake" in (schema.get("properties") or {}) or images:
+        return json.dumps(_image_verdict(rng), ensure_ascii=False)
+    return json.dumps(_text_verdict(rng), ensure_ascii=False)
+
+
+def _synthetic_jpeg(seed: int, width: int = 1600, height: int = 1200) -> bytes:
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([(x / 7 + seed) % 256, (y / 5) % 256, ((x + y) / 9) % 256], axis=-1)
+    noisy = np.clip(base + rng.normal(0, 8, size=base.shape), 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(noisy, "RGB").save(buffer, "JPEG", quality=88)
+    return buffer.getvalue()
+
+
+def make_handler(behaviour: FakeBehaviour, stats: _Stats, image_count: int):
+    images = [_synthetic_jpeg(seed) for seed in range(image_count)]
+    local = threading.local()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_args: Any) -> None:  # keep stdout for the summary
+            return
+
+        @property
+        def rng(self) -> random.Random:
+            if not hasattr(local, "rng"):
+                local.rng = random.Random()
+            return local.rng
+
+        def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self) -> dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            return json.loads(raw or b"{}")
+
+        def _error(self, status: int, reason: str, message: str) -> None:
+            stats.bump(f"http_{status}")
+            self._send_json(status, {"error": {"code": status, "message": message, "status": reason}})
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.startswith("/images/"):
+                try:
+                    index = int(self.path.rsplit("/", 1)[-1].split(".")[0]) % len(images)
+                except ValueError:
+                    self._error(404, "NOT_FOUND", "unknown image")
+                    return
+                body = images[index]
+                stats.bump("image")
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if self.path == "/stats":
+                self._send_json(200, dict(stats.counts))
+                return
+            self._error(404, "NOT_FOUND", f"no route for {self.path}")
+
+        def do_PATCH(self) -> None:  # noqa: N802
+            body = self._read_json()
+            stats.bump("cache_update")
+            name = self.path.split("/", 2)[-1].split("?")[0]
+            self._send_json(200, self._cache_payload(name, body.get("ttl")))
+
+        def do_POST(self) -> None:  # noqa: N802
+            path = self.path.split("?")[0]
+            body = self._read_json()
+            if path.endswith("/cachedContents"):
+                stats.bump("cache_create")
+                self._send_json(200, self._cache_payload(f"cachedContents/{uuid.uuid4().hex[:12]}", body.get("ttl")))
+                return
+            if path.endswith(":countTokens"):
+                # Rough count (about four characters per token) of every text part.
+                texts = [
+                    part.get("text", "")
+                    for content in body.get("contents", [])
+                    for part in content.get("parts", [])
+                ]
+                stats.bump("count_tokens")
+                self._send_json(200, {"totalTokens": sum(len(text) for text in texts) // 4})
+                return
+            if not path.endswith(":generateContent"):
+                self._error(404, "NOT_FOUND", f"no route for {path}")
+                return
+
+            time.sleep(behaviour.delay(self.rng))
+            roll = self.rng.random()
+            if roll < behaviour.rate_429:
+                self._error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (fake quota).")
+                return
+            if roll < behaviour.rate_429 + behaviour.error_rate:
+                self._error(500, "INTERNAL", "Fake internal error.")
+                return
+
+            cached = int(behaviour.prompt_tokens * 0.8) if body.get("cachedContent") else 0
+            usage = {
+                "promptTokenCount": behaviour.prompt_tokens,
+                "cachedContentTokenCount": cached,
+                "candidatesTokenCount": behaviour.output_tokens,
+                "thoughtsTokenCount": behaviour.thoughts_tokens,
+                "totalTokenCount": behaviour.prompt_tokens + behaviour.output_tokens + behaviour.thoughts_tokens,
+            }
+            if roll < behaviour.rate_429 + behaviour.error_rate + behaviour.block_rate:
+                stats.bump("blocked")
+                self._send_json(200, {"promptFeedback": {"blockReason": "PROHIBITED_CONTENT"}, "usageMetadata": usage})
+                return
+
+            stats.bump("generate")
+            self._send_json(
+                200,
+                {
+                    "candidates": [
+                        {
+                            "content": {"role": "model", "parts": [{"text": _answer_for(body, self.rng)}]},
+                            "finishReason": "STOP",
+                            "index": 0,
+                        }
+                    ],
+                    "usageMetadata": usage,
+                    "modelVersion": "fake-gemini",
+                },
+            )
+
+        @staticmethod
+        def _cache_payload(name: str, ttl: Optional[str]) -> dict[str, Any]:
+            seconds = float((ttl or "3600s").rstrip("s"))
+            expires = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+            return {"name": name, "model": "models/fake-gemini", "expireTime": expires.isoformat()}
+
+    return Handler
+
+
+def serve(host: str, port: int, behaviour: FakeBehaviour, image_count: int = 16) -> ThreadingHTTPServer:
+    """Build the server; call ``serve_forever()`` (or run it in a thread) to start it."""
+    server = ThreadingHTTPServer((host, port), make_handler(behaviour, _Stats(), image_count))
+    server.daemon_threads = True
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--median", type=float, default=1.0, help="Median (or fixed) latency in seconds.")
+    parser.add_argument("--spread", type=float, default=0.5, help="uniform: ± seconds; lognormal: sigma.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered with HTTP 500.")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction answered with HTTP 429.")
+    parser.add_argument("--block-rate", type=float, default=0.0, help="Fraction answered as blocked content.")
+    parser.add_argument("--images", type=int, default=16, help="Synthetic JPEGs served at /images/<n>.jpg.")
+    args = parser.parse_args()
+
+    behaviour = FakeBehaviour(
+        latency=args.latency,
+        median=args.median,
+        spread=args.spread,
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        block_rate=args.block_rate,
+    )
+    server = serve(args.host, args.port, behaviour, args.images)
+    print(f"fake Gemini listening on http://{args.host}:{args.port} ({behaviour})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Parity, latency and memory benchmark for the detector's image preprocessing.
+
+Compares the Hugging Face processor path (full-resolution decode, RGB convert,
+``AutoImageProcessor``) with the fast path (JPEG ``draft`` decode, one PIL
+resize, NumPy normalisation into a reused buffer) on a synthetic 12MP JPEG or
+on your own images.
+
+    cd backend
+    python -m benchmarks.image_preprocess --repeats 10
+    python -m benchmarks.image_preprocess --images ./samples --check
+
+Peak memory is measured as ``ru_maxrss`` growth in a fresh subprocess per path,
+because PIL's decode buffers are invisible to ``tracemalloc``. ``--check``
+skips those runs and only evaluates parity.
+
+The parity gate runs before any timing. The exit status is 1 when the largest
+normalised pixel difference exceeds ``--pixel-tolerance``, the largest
+``fake_prob`` difference exceeds ``--prob-tolerance`` percentage points, or
+any image changes verdict between the two paths.
+"""
+import argparse
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+def synthetic_jpeg(width: int = 4000, height: int = 3000, quality: int = 90) -> bytes:
+    """Smooth gradients plus noise, so JPEG sizes resemble a real photo."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([(x / 16) % 256, (y / 12) % 256, ((x + y) / 20) % 256], axis=-1)
+    noisy = base + rng.normal(0, 6, size=base.shape)
+    buffer = io.BytesIO()
+    Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8), "RGB").save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def _load_payloads(folder: Optional[Path]) -> list[bytes]:
+    if folder is None:
+        return [synthetic_jpeg()]
+    paths = sorted(p for p in folder.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not paths:
+        sys.exit(f"No images found in {folder}")
+    return [path.read_bytes() for path in paths]
+
+
+def _preprocess(detector, payload: bytes, fast: bool):
+    image = Image.open(io.BytesIO(payload))
+    if fast:
+        detector.draft_image(image)
+    rgb = image.convert("RGB") if image.mode != "RGB" else image
+    try:
+        if fast:
+            return detector.fast_pixel_values(rgb).clone()
+        return detector.hf_pixel_values(rgb)
+    finally:
+        if rgb is not image:
+            rgb.close()
+        image.close()
+
+
+def _measure_child(path_name: str, folder: Optional[Path], repeats: int) -> None:
+    """Subprocess entry point: time one path and report its peak RSS growth."""
+    from app.detectors import deepfake_detector as detector
+
+    payloads = _load_payloads(folder)
+    # Baseline after the model is loaded; the warm-up call already counts toward the peak.
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    _preprocess(detector, payloads[0], path_name == "fast")
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for payload in payloads:
+            _preprocess(detector, payload, path_name == "fast")
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        json.dumps(
+            {
+                "ms_per_image": elapsed * 1000 / (repeats * len(payloads)),
+                "peak_rss_growth_mb": (peak - baseline) / 1024,
+            }
+        )
+    )
+
+
+def _run_child(path_name: str, folder: Optional[Path], repeats: int) -> dict:
+    command = [sys.executable, "-m", "benchmarks.image_preprocess", "--child", path_name, "--repeats", str(repeats)]
+    if folder is not None:
+        command += ["--images", str(folder)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=Path, default=None, help="Folder of sample images (default: synthetic 12MP JPEG).")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--pixel-tolerance", type=float, default=0.1, help="Max |Δ| of normalised pixel values.")
+    parser.add_argument("--prob-tolerance", type=float, default=2.0, help="Max |Δprob| in percentage points.")
+    parser.add_argument("--check", action="store_true", help="Parity gate only; skip the timing subprocesses.")
+    parser.add_argument("--child", choices=["hf", "fast"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _measure_child(args.child, args.images, args.repeats)
+        return 0
+
+    from app.detectors import deepfake_detector as detector
+
+    payloads = _load_payloads(args.images)
+    reference = [_preprocess(detector, payload, fast=False) for payload in payloads]
+    candidate = [_preprocess(detector, payload, fast=True) for payload in payloads]
+    pixel_diff = max(float((r - c).abs().max()) for r, c in zip(reference, candidate))
+    pixel_mean = float(np.mean([float((r - c).abs().mean()) for r, c in zip(reference, candidate)]))
+    print(f"images: {len(payloads)} ({'synthetic 4000x3000 JPEG' if args.images is None else args.images})")
+    print(f"pixel parity: max |Δ| = {pixel_diff:.4f}, mean |Δ| = {pixel_mean:.5f}")
+
+    import torch
+
+    logits = detector.load_backend("eager")
+    reference_probs = np.concatenate(
+        [torch.nn.functional.softmax(logits(r), dim=1).numpy() * 100.0 for r in reference]
+    )
+    candidate_probs = np.concatenate(
+        [torch.nn.functional.softmax(logits(c), dim=1).numpy() * 100.0 for c in candidate]
+    )
+    prob_diff = float(np.abs(reference_probs - candidate_probs).max())
+    flips = int((reference_probs.argmax(axis=1) != candidate_probs.argmax(axis=1)).sum())
+    print(f"score parity: max |Δprob| = {prob_diff:.3f} pp, verdict flips = {flips}/{len(payloads)}")
+
+    failures = []
+    if pixel_diff > args.pixel_tolerance:
+        failures.append(f"max pixel |Δ| {pixel_diff:.4f} > {args.pixel_tolerance}")
+    if prob_diff > args.prob_tolerance:
+        failures.append(f"max |Δprob| {prob_diff:.3f} pp > {args.prob_tolerance} pp")
+    if flips:
+        failures.append(f"{flips} verdict flip(s)")
+    if failures:
+        print("FAIL (fast vs hf): " + "; ".join(failures))
+        return 1
+    print(f"PASS (fast vs hf): within {args.pixel_tolerance} pixel / {args.prob_tolerance} pp, no verdict flips")
+
+    if not args.check:
+        results = {name: _run_child(name, args.images, args.repeats) for name in ("hf", "fast")}
+        for name, result in results.items():
+            print(f"{name:>4}: {result['ms_per_image']:8.2f} ms/image  peak RSS +{result['peak_rss_growth_mb']:.1f} MB")
+        print(f"speed-up: {results['hf']['ms_per_image'] / results['fast']['ms_per_image']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Asyncio load generator for the verification endpoints.
+
+Drives ``/verify/text``, ``/verify/image-gemini`` and ``/verify/video`` with a
+weighted mix and reports throughput, status codes and latency percentiles per
+endpoint. Pair it with ``benchmarks.fake_gemini`` to load-test without quota:
+
+    cd backend
+    python -m benchmarks.fake_gemini --port 8090 &
+    GEMINI_BASE_URL=http://127.0.0.1:8090 GEMINI_API_KEY=fake SEMANTIC_CACHE_ENABLED=false \\
+        uvicorn app.main:app --port 8000 &
+    python -m benchmarks.loadgen --mix text=7,image=3 --concurrency 32 --duration 60 --json load.json
+
+Closed loop by default: ``--concurrency`` workers each send the next request
+when the previous one finishes. With ``--rate`` arrivals are Poisson at that
+many requests/s, ``--concurrency`` caps requests in flight, and latency is
+measured from the scheduled send time so queueing is not hidden.
+
+Texts differ in numbers and names, which keeps them apart for the pre-screen
+duplicate check but not for the semantic cache: the generated sentences share
+one template and embed almost identically, so disable it as above when the
+Gemini path is what is being measured. Either way, every 2xx text answer is
+classified by where it came from (``gemini``, ``semantic`` or
+``prescreen:<reason>``) and the report shows that breakdown, so cached
+answers cannot silently inflate throughput. Pass ``--repeat-text`` to measure
+the cached path on purpose.
+
+``/verify/video`` downloads from YouTube, so it needs ``--video-url`` and is
+only offline once those URLs are cached in the database.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+import numpy as np
+
+_SUBJECTS = ["정부", "서울시", "한국은행", "교육부", "보건복지부", "국회", "기상청", "통계청", "환경부", "경찰청"]
+_ACTIONS = [
+    "올해 예산을 {n}% 늘리겠다고 발표했다",
+    "{year}년부터 새 제도를 시행한다고 밝혔다",
+    "지난달 관련 사고가 {n}건 발생했다고 보도했다",
+    "{n}만 명에게 지원금을 지급한다고 밝혔다",
+    "기준금리를 {r}%로 동결했다고 발표했다",
+]
+_PLACES = ["부산", "대구", "광주", "대전", "인천", "제주", "강원", "전북", "경남", "충북"]
+
+
+def make_text(rng: random.Random) -> str:
+    action = rng.choice(_ACTIONS).format(
+        n=rng.randint(2, 95), year=rng.randint(2019, 2027), r=f"{rng.uniform(1, 4):.2f}"
+    )
+    return (
+        f"{rng.choice(_PLACES)} 지역 언론에 따르면 {rng.choice(_SUBJECTS)}은(는) {action}. "
+        f"관계자는 {rng.randint(1, 12)}월 {rng.randint(1, 28)}일 브리핑에서 이 내용을 확인했다."
+    )
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    ok_latencies: list[float] = field(default_factory=list)
+    statuses: dict[str, int] = field(default_factory=dict)
+    sources: dict[str, int] = field(default_factory=dict)
+
+    def record(self, status: str, seconds: float, source: Optional[str] = None) -> None:
+        self.latencies.append(seconds)
+        if status.startswith("2"):
+            self.ok_latencies.append(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if source is not None:
+            self.sources[source] = self.sources.get(source, 0) + 1
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        def percentiles(values: list[float]) -> dict[str, Optional[float]]:
+            if not values:
+                return {"p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None, "mean_ms": None}
+            array = np.asarray(values) * 1000
+            p50, p90, p99 = np.percentile(array, [50, 90, 99])
+            return {
+                "p50_ms": round(float(p50), 1),
+                "p90_ms": round(float(p90), 1),
+                "p99_ms": round(float(p99), 1),
+                "max_ms": round(float(array.max()), 1),
+                "mean_ms": round(float(array.mean()), 1),
+            }
+
+        total = len(self.latencies)
+        ok = len(self.ok_latencies)
+        summary = {
+            "requests": total,
+            "ok": ok,
+            "error_rate": round(1 - ok / total, 4) if total else None,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+            "ok_throughput_rps": round(ok / elapsed, 2) if elapsed else None,
+            "statuses": dict(sorted(self.statuses.items())),
+            "latency": percentiles(self.latencies),
+            "ok_latency": percentiles(self.ok_latencies),
+        }
+        if self.sources:
+            answered = sum(self.sources.values())
+            summary["sources"] = dict(sorted(self.sources.items()))
+            summary["gemini_share"] = round(self.sources.get("gemini", 0) / answered, 4)
+        return summary
+
+
+def _text_source(response: httpx.Response) -> str:
+    """Which tier answered a /verify/text request: gemini, semantic or prescreen:<reason>."""
+    try:
+        payload = response.json()
+    except ValueError:
+        return "unparsed"
+    if payload.get("prescreen"):
+        return f"prescreen:{payload['prescreen']}"
+    if payload.get("cached_from"):
+        return "semantic"
+    return "gemini"
+
+
+class LoadGenerator:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.mix = self._parse_mix(args.mix)
+        if "video" in self.mix and not args.video_url:
+            sys.exit("--mix includes video but no --video-url was given")
+        self.stats: dict[str, EndpointStats] = {name: EndpointStats() for name in self.mix}
+        self.fixed_text = make_text(self.rng)
+
+    @staticmethod
+    def _parse_mix(spec: str) -> dict[str, float]:
+        mix: dict[str, float] = {}
+        for item in spec.split(","):
+            name, _, weight = item.partition("=")
+            name = name.strip()
+            if name not in ("text", "image", "video"):
+                sys.exit(f"Unknown endpoint in --mix: {name}")
+            mix[name] = float(weight or 1)
+        return mix
+
+    def _request(self, name: str) -> tuple[str, dict[str, Any], dict[str, Any]]:
+        if name == "text":
+            text = self.fixed_text if self.args.repeat_text else make_text(self.rng)
+            return "/verify/text", {"text": text}, {}
+        if name == "image":
+            index = self.rng.randrange(self.args.image_count)
+            # The query string keeps URLs distinct without defeating the extension check.
+            url = f"{self.args.image_base.rstrip('/')}/{index}.jpg?r={uuid.uuid4().hex[:8]}"
+            params = {} if self.args.normalize else {"normalize": "false"}
+            return "/verify/image-gemini", {"image_url": url}, params
+        return "/verify/video", {"url": self.rng.choice(self.args.video_url)}, {}
+
+    async def _send(self, client: httpx.AsyncClient, name: str, scheduled: float) -> None:
+        path, body, params = self._request(name)
+        source: Optional[str] = None
+        try:
+            response = await client.post(path, json=body, params=params)
+            status = str(response.status_code)
+            if name == "text" and response.is_success:
+                source = _text_source(response)
+        except httpx.TimeoutException:
+            status = "timeout"
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        self.stats[name].record(status, time.perf_counter() - scheduled, source)
+
+    def _pick(self) -> str:
+        names = list(self.mix)
+        return self.rng.choices(names, weights=[self.mix[n] for n in names])[0]
+
+    async def run(self) -> float:
+        limits = httpx.Limits(max_connections=self.args.concurrency, max_keepalive_connections=self.args.concurrency)
+        timeout = httpx.Timeout(self.args.timeout)
+        started = time.perf_counter()
+        deadline = started + self.args.duration
+        budget = self.args.requests or float("inf")
+        sent = 0
+
+        async with httpx.AsyncClient(base_url=self.args.base_url, limits=limits, timeout=timeout) as client:
+            if self.args.rate:
+                in_flight = asyncio.Semaphore(self.args.concurrency)
+                tasks: list[asyncio.Task] = []
+
+                async def scheduled_send(name: str, at: float) -> None:
+                    async with in_flight:
+                        await self._send(client, name, at)
+
+                next_at = started
+                while next_at < deadline and sent < budget:
+                    delay = next_at - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    tasks.append(asyncio.create_task(scheduled_send(self._pick(), next_at)))
+                    sent += 1
+                    next_at += self.rng.expovariate(self.args.rate)
+                await asyncio.gather(*tasks)
+            else:
+
+                async def worker() -> None:
+                    nonlocal sent
+                    while time.perf_counter() < deadline and sent < budget:
+                        sent += 1
+                        await self._send(client, self._pick(), time.perf_counter())
+
+                await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+        return time.perf_counter() - started
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"elapsed {report['elapsed_s']:.1f}s  mode={report['mode']}  concurrency={report['concurrency']}")
+    header = f"{'endpoint':<8} {'reqs':>6} {'ok':>6} {'rps':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  statuses"
+    print(header)
+    for name, summary in report["endpoints"].items():
+        latency = summary["latency"]
+        cells = [latency[key] for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")]
+        formatted = " ".join(f"{cell:>8.0f}" if cell is not None else f"{'-':>8}" for cell in cells)
+        print(
+            f"{name:<8} {summary['requests']:>6} {summary['ok']:>6} {summary['throughput_rps'] or 0:>7.2f} "
+            f"{formatted}  {summary['statuses']}"
+        )
+        if "sources" in summary:
+            print(f"{'':<8} answered by {summary['sources']} (gemini share {summary['gemini_share']:.1%})")
+    print("latencies in ms, measured from the scheduled send time")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--mix", default="text=7,image=3", help="Weighted endpoints: text, image, video.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Workers (closed loop) or max in flight (--rate).")
+    parser.add_argument("--rate", type=float, default=None, help="Open loop: Poisson arrivals per second.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load.")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests.")
+    parser.add_argument("--timeout", type=float, default=180.0)
+    parser.add_argument("--image-base", default="http://127.0.0.1:8090/images", help="Served by fake_gemini.")
+    parser.add_argument("--image-count", type=int, default=16)
+    parser.add_argument("--no-normalize", dest="normalize", action="store_false", help="Send normalize=false.")
+    parser.add_argument("--video-url", action="append", default=[], help="Repeatable; required for video.")
+    parser.add_argument("--repeat-text", action="store_true", help="Send one text repeatedly (cache path).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the report to this file.")
+    args = parser.parse_args()
+
+    generator = LoadGenerator(args)
+    elapsed = asyncio.run(generator.run())
+    report = {
+        "elapsed_s": round(elapsed, 3),
+        "mode": f"open ({args.rate}/s)" if args.rate else "closed",
+        "concurrency": args.concurrency,
+        "mix": generator.mix,
+        "endpoints": {name: stats.summary(elapsed) for name, stats in generator.stats.items()},
+    }
+    _print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
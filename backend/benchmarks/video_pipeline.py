@@ -0,0 +1,399 @@
+"""
+Reproducible, offline benchmark of the video analysis stages in check_video.
+
+Generates seeded synthetic clips (textured panning background, moving
+shapes, sensor noise) at several resolutions and lengths, with a
+speech-like audio track, then times each stage and records its peak RSS
+growth in a fresh subprocess:
+
+* ``sample_frames``        - legacy fixed-stride grayscale sampling
+* ``analyze_fft``          - FFT artifact score over the sampled frames
+* ``analyze_motion``       - optical-flow score over the sampled frames
+* ``analyze_video_frames`` - the budgeted, windowed path the API uses
+* ``whisper_load``         - faster-whisper model load (once per run)
+* ``transcribe``           - ``transcribe_video_audio`` on the clip
+
+    cd backend
+    python -m benchmarks.video_pipeline --resolutions 360,720 --durations 15,60 --out before.json
+    # ...change check_video.py...
+    python -m benchmarks.video_pipeline --resolutions 360,720 --durations 15,60 --out after.json --baseline before.json
+    python -m benchmarks.video_pipeline --compare before.json after.json
+
+Clips are encoded with PyAV (H.264 + AAC, the libraries faster-whisper
+already depends on) or, without it, OpenCV plus a separate WAV file, and are
+cached in ``--media-dir``. Nothing is downloaded: children run with
+``HF_HUB_OFFLINE=1``, so the Whisper model must already be in the local
+Hugging Face cache (or skip it with ``--stages``). The synthetic audio has
+speech-like pitch, formants and syllable rhythm so VAD and decoding do real
+work, but its transcript is meaningless; pass ``--speech`` to loop a real
+recording instead. Use ``--env KEY=VALUE`` to benchmark a knob such as
+``VIDEO_MOTION_MODE=sparse``.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+STAGES = ("sample_frames", "analyze_fft", "analyze_motion", "analyze_video_frames", "whisper_load", "transcribe")
+AUDIO_RATE = 16000
+FPS = 30
+# Vowel formants (F1, F2, F3) in Hz.
+_VOWELS = ((800, 1200, 2500), (300, 2300, 3000), (350, 800, 2300), (450, 1900, 2600), (500, 900, 2400))
+_ENV_PREFIXES = ("VIDEO_", "WHISPER_", "OMP_", "OPENCV_")
+
+
+# -----------------------------
+# Synthetic media
+# -----------------------------
+def synthetic_speech(duration: float, seed: int = 0, rate: int = AUDIO_RATE) -> np.ndarray:
+    """Float32 mono signal with voiced syllables, consonant bursts and word/sentence pauses."""
+    rng = np.random.default_rng(seed)
+    total = int(duration * rate)
+    out = np.zeros(total, dtype=np.float32)
+    position = int(0.3 * rate)
+    words = 0
+    while position < total:
+        for _ in range(rng.integers(1, 4)):
+            length = int(rng.uniform(0.12, 0.28) * rate)
+            if position + length >= total:
+                break
+            t = np.arange(length) / rate
+            f0 = rng.uniform(100, 210) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(1, 3) * t))
+            phase = 2 * np.pi * np.cumsum(f0) / rate
+            formants = _VOWELS[rng.integers(len(_VOWELS))]
+            voiced = np.zeros(length)
+            for harmonic in range(1, int(4000 / f0.min())):
+                frequency = harmonic * f0
+                gain = sum(1.0 / (1.0 + ((frequency - formant) / 90.0) ** 2) for formant in formants)
+                voiced += gain * np.sin(harmonic * phase) / harmonic
+            voiced *= np.hanning(length)
+            burst = int(0.03 * rate)
+            voiced[:burst] += rng.normal(0, 0.15, burst) * np.linspace(1, 0, burst)
+            out[position:position + length] += voiced.astype(np.float32)
+            position += length + int(rng.uniform(0.01, 0.05) * rate)
+        words += 1
+        position += int((0.6 if words % 8 == 0 else rng.uniform(0.08, 0.2)) * rate)
+    peak = float(np.abs(out).max()) or 1.0
+    return (0.6 * out / peak).astype(np.float32)
+
+
+def load_speech(path: Path, duration: float) -> np.ndarray:
+    """Decode a recording to 16 kHz mono float32 with PyAV and loop it to ``duration``."""
+    import av
+
+    chunks = []
+    with av.open(str(path)) as container:
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=AUDIO_RATE)
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+    samples = np.concatenate(chunks).astype(np.float32)
+    repeats = int(np.ceil(duration * AUDIO_RATE / len(samples)))
+    return np.tile(samples, repeats)[: int(duration * AUDIO_RATE)]
+
+
+class SceneRenderer:
+    """Panning noise texture with a few moving shapes; deterministic per seed."""
+
+    def __init__(self, width: int, height: int, seed: int = 0) -> None:
+        import cv2
+
+        self._cv2 = cv2
+        self.width, self.height = width, height
+        rng = np.random.default_rng(seed)
+        texture = rng.integers(0, 256, size=(height // 4 + 1, width // 2 + 1, 3), dtype=np.uint8)
+        texture = cv2.resize(texture, (width * 2, height + 4), interpolation=cv2.INTER_CUBIC)
+        self._texture = cv2.GaussianBlur(texture, (0, 0), 1.5)
+        self._shapes = [
+            (rng.uniform(0.1, 0.9), rng.uniform(0.1, 0.9), rng.uniform(0.2, 1.2), rng.uniform(0, 6.28),
+             tuple(int(c) for c in rng.integers(0, 256, 3)), rng.uniform(0.03, 0.1))
+            for _ in range(6)
+        ]
+        self._noise = rng.integers(-6, 7, size=(4, height, width, 1), dtype=np.int16)
+
+    def frame(self, index: int) -> np.ndarray:
+        cv2 = self._cv2
+        t = index / FPS
+        offset = int((t * 40) % self.width)
+        image = self._texture[2:self.height + 2, offset:offset + self.width].copy()
+        for x, y, speed, phase, color, size in self._shapes:
+            cx = int(self.width * (x + 0.25 * np.sin(speed * t + phase)))
+            cy = int(self.height * (y + 0.2 * np.cos(0.7 * speed * t + phase)))
+            cv2.circle(image, (cx, cy), int(size * self.height), color, -1, lineType=cv2.LINE_AA)
+        noisy = image.astype(np.int16) + self._noise[index % len(self._noise)]
+        return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def _write_wav(path: Path, samples: np.ndarray) -> None:
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(AUDIO_RATE)
+        handle.writeframes((np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes())
+
+
+def _encode_pyav(path: Path, renderer: SceneRenderer, frames: int, audio: np.ndarray) -> None:
+    import av
+
+    with av.open(str(path), "w") as container:
+        video = container.add_stream("libx264", rate=FPS)
+        video.width, video.height, video.pix_fmt = renderer.width, renderer.height, "yuv420p"
+        # Typical upload settings: 2s GOP, so seeks cost what they do on real clips.
+        video.options = {"preset": "veryfast", "crf": "23", "g": str(2 * FPS)}
+        sound = container.add_stream("aac", rate=AUDIO_RATE)
+        sound.layout = "mono"
+        for index in range(frames):
+            frame = av.VideoFrame.from_ndarray(renderer.frame(index), format="bgr24")
+            for packet in video.encode(frame):
+                container.mux(packet)
+        for packet in video.encode():
+            container.mux(packet)
+        chunk = 1024
+        for start in range(0, len(audio), chunk):
+            block = audio[start:start + chunk].reshape(1, -1)
+            frame = av.AudioFrame.from_ndarray(np.ascontiguousarray(block), format="flt", layout="mono")
+            frame.sample_rate = AUDIO_RATE
+            frame.pts = start
+            for packet in sound.encode(frame):
+                container.mux(packet)
+        for packet in sound.encode():
+            container.mux(packet)
+
+
+def _encode_opencv(path: Path, renderer: SceneRenderer, frames: int) -> None:
+    import cv2
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), FPS, (renderer.width, renderer.height))
+    try:
+        for index in range(frames):
+            writer.write(renderer.frame(index))
+    finally:
+        writer.release()
+
+
+def ensure_media(media_dir: Path, height: int, duration: int, seed: int, speech: Optional[Path]) -> dict[str, str]:
+    """Create (or reuse) the clip for one case; returns the video and audio paths."""
+    width = int(round(height * 16 / 9 / 2)) * 2
+    tag = f"{height}p-{duration}s-seed{seed}" + (f"-{speech.stem}" if speech else "")
+    media_dir.mkdir(parents=True, exist_ok=True)
+    video_path, wav_path = media_dir / f"{tag}.mp4", media_dir / f"{tag}.wav"
+    if video_path.exists():
+        return {"video": str(video_path), "audio": str(wav_path if wav_path.exists() else video_path)}
+
+    audio = load_speech(speech, duration) if speech else synthetic_speech(duration, seed)
+    renderer = SceneRenderer(width, height, seed)
+    started = time.perf_counter()
+    partial = video_path.with_suffix(".part.mp4")
+    try:
+        import av  # noqa: F401 - probe only
+
+        _encode_pyav(partial, renderer, duration * FPS, audio)
+        audio_path = video_path
+    except ImportError:
+        _encode_opencv(partial, renderer, duration * FPS)
+        _write_wav(wav_path, audio)
+        audio_path = wav_path
+    partial.rename(video_path)
+    print(f"  generated {video_path.name} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return {"video": str(video_path), "audio": str(audio_path)}
+
+
+# -----------------------------
+# Stage runner (child process)
+# -----------------------------
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _run_child(stage: str, video: str, audio: str, repeats: int) -> dict[str, Any]:
+    from app import check_video
+
+    frames = None
+    if stage in ("analyze_fft", "analyze_motion"):
+        frames = check_video.sample_frames(video)
+    if stage == "transcribe":
+        check_video._get_whisper_model()
+    if stage == "whisper_load":
+        repeats = 1
+
+    actions = {
+        "sample_frames": lambda: {"frames": len(check_video.sample_frames(video))},
+        "analyze_fft": lambda: {"score": check_video.analyze_fft(frames), "frames": len(frames)},
+        "analyze_motion": lambda: {"score": check_video.analyze_motion(frames), "frames": len(frames)},
+        "analyze_video_frames": lambda: _frame_detail(check_video.analyze_video_frames(video)),
+        "whisper_load": lambda: {"model": check_video._get_whisper_model().__class__.__name__},
+        "transcribe": lambda: _transcript_detail(check_video.transcribe_video_audio(audio)),
+    }
+    baseline = _rss_mb()
+    seconds, detail = [], {}
+    for _ in range(repeats):
+        started = time.perf_counter()
+        detail = actions[stage]()
+        seconds.append(time.perf_counter() - started)
+    return {"seconds": seconds, "peak_rss_growth_mb": round(_rss_mb() - baseline, 1), "detail": detail}
+
+
+def _frame_detail(analysis) -> dict[str, Any]:
+    return {
+        "fft_score": analysis.fft_score,
+        "motion_score": analysis.motion_score,
+        "frames": analysis.frames_analyzed,
+        "windows": analysis.windows_analyzed,
+        "converged": analysis.converged,
+    }
+
+
+def _transcript_detail(result) -> dict[str, Any]:
+    return {"chars": len(result.text), "audio_seconds": result.duration}
+
+
+def _spawn(stage: str, media: dict[str, str], repeats: int, env: dict[str, str]) -> dict[str, Any]:
+    command = [
+        sys.executable, "-m", "benchmarks.video_pipeline", "--child", stage,
+        "--video", media["video"], "--audio", media["audio"], "--repeats", str(repeats),
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, env=env)
+    if completed.returncode != 0:
+        tail = (completed.stderr or completed.stdout).strip().splitlines()[-1:] or ["no output"]
+        return {"error": tail[0]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+# -----------------------------
+# Reporting
+# -----------------------------
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata(env: dict[str, str], seed: int) -> dict[str, Any]:
+    import cv2
+
+    return {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "seed": seed,
+        "env": {key: value for key, value in sorted(env.items()) if key.startswith(_ENV_PREFIXES)},
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> int:
+    """Print per-stage median deltas; returns the number of regressions beyond ``threshold``."""
+    def index(report: dict[str, Any]) -> dict[tuple[str, str], dict[str, Any]]:
+        return {(row["case"], row["stage"]): row for row in report["results"] if "median_s" in row}
+
+    before, after = index(baseline), index(current)
+    print(f"baseline {baseline['meta'].get('commit')} -> current {current['meta'].get('commit')}")
+    print(f"{'case':<14} {'stage':<22} {'before':>9} {'after':>9} {'delta':>8} {'rss Δ MB':>9}")
+    regressions = 0
+    for key in sorted(set(before) & set(after)):
+        old, new = before[key], after[key]
+        delta = (new["median_s"] - old["median_s"]) / old["median_s"] if old["median_s"] else 0.0
+        # Ignore sub-5ms noise on tiny stages.
+        flagged = delta > threshold and new["median_s"] - old["median_s"] > 0.005
+        regressions += flagged
+        rss = new["peak_rss_growth_mb"] - old["peak_rss_growth_mb"]
+        print(
+            f"{key[0]:<14} {key[1]:<22} {old['median_s']:>8.3f}s {new['median_s']:>8.3f}s "
+            f"{delta:>+7.1%} {rss:>+9.1f}{'  REGRESSION' if flagged else ''}"
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resolutions", default="360,720,1080", help="Frame heights, comma separated.")
+    parser.add_argument("--durations", default="15,60", help="Clip lengths in seconds, comma separated.")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Subset of: {', '.join(STAGES)}.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage; the median is reported.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--speech", type=Path, default=None, help="Loop this recording instead of synthetic audio.")
+    parser.add_argument("--media-dir", type=Path, default=Path(tempfile.gettempdir()) / "hacktruth-video-bench")
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE passed to stage processes.")
+    parser.add_argument("--out", type=Path, default=None, help="Write results JSON here.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare against an earlier results JSON.")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASELINE", "CURRENT"), help="Only compare two files.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown counted as a regression.")
+    parser.add_argument("--child", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--video", help=argparse.SUPPRESS)
+    parser.add_argument("--audio", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_run_child(args.child, args.video, args.audio, args.repeats)))
+        return 0
+
+    if args.compare:
+        baseline, current = (json.loads(path.read_text(encoding="utf-8")) for path in args.compare)
+        return 1 if compare(baseline, current, args.threshold) else 0
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        sys.exit(f"Unknown stages: {', '.join(sorted(unknown))}")
+    env = {**os.environ, "HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1"}
+    env.update(item.split("=", 1) for item in args.env)
+
+    results: list[dict[str, Any]] = []
+    whisper_loaded = False
+    for height in (int(value) for value in args.resolutions.split(",")):
+        for duration in (int(value) for value in args.durations.split(",")):
+            case = f"{height}p/{duration}s"
+            media = ensure_media(args.media_dir, height, duration, args.seed, args.speech)
+            for stage in stages:
+                if stage == "whisper_load" and whisper_loaded:
+                    continue
+                outcome = _spawn(stage, media, args.repeats, env)
+                row: dict[str, Any] = {"case": "-" if stage == "whisper_load" else case, "stage": stage}
+                if "error" in outcome:
+                    row["error"] = outcome["error"]
+                    print(f"{row['case']:<14} {stage:<22} failed: {outcome['error']}")
+                else:
+                    whisper_loaded = whisper_loaded or stage == "whisper_load"
+                    row.update(
+                        median_s=round(statistics.median(outcome["seconds"]), 4),
+                        min_s=round(min(outcome["seconds"]), 4),
+                        runs=len(outcome["seconds"]),
+                        peak_rss_growth_mb=outcome["peak_rss_growth_mb"],
+                        detail=outcome["detail"],
+                    )
+                    print(
+                        f"{row['case']:<14} {stage:<22} {row['median_s']:>8.3f}s "
+                        f"(min {row['min_s']:.3f}s)  peak RSS +{row['peak_rss_growth_mb']:.1f} MB"
+                    )
+                results.append(row)
+
+    report = {"meta": _metadata(env, args.seed), "results": results}
+    if args.out:
+        args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"wrote {args.out}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        return 1 if compare(baseline, report, args.threshold) else 0
+    return 1 if any("error" in row for row in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())